@@ -1,24 +1,135 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.models import User
 from app.api.deps import get_current_admin
-from app.schemas.admin import ResetPasswordResponse
-from app.core.security import get_password_hash
-import secrets
-import string
+from app.core.cache import Principal, principal_cache
+from app.core.revocation import revocation_list
+from app.core.query_stats import query_metrics
+from app.core.account_batch import generate_temp_password, reset_passwords, select_user_ids, set_active
+from app.core.player_import import import_players
+from app.schemas.admin import (
+    AccountSelection,
+    BatchAccountResponse,
+    BatchResetPasswordResponse,
+    PlayerImportResponse,
+    ResetPasswordResponse,
+)
+from app.core.security import bulk_hasher, get_password_hash_async, password_hasher
+import csv
+import io
 
 router = APIRouter()
 
 
-def generate_temp_password() -> str:
-    """Generate a random temporary password."""
-    alphabet = string.ascii_letters + string.digits + "!@#$%^&*()"
-    return "".join(secrets.choice(alphabet) for _ in range(16))
+@router.post("/accounts/batch/reset-password", response_model=BatchResetPasswordResponse)
+async def batch_reset_password(
+    selection: AccountSelection,
+    download: bool = Query(False),
+    db: Session = Depends(get_db),
+    admin: Principal = Depends(get_current_admin),
+):
+    """
+    This function resets the password of every selected account (the admin's own is never selected).
+
+    param : selection - The criteria of the accounts.
+    param : download - If True, return the passwords as a CSV file.
+    param : db - The session of database.
+    param : admin - The client (admin).
+    return : Return the temporary passwords, and the ids of the accounts left unchanged by a failed chunk.
+    """
+    user_ids = await run_in_threadpool(select_user_ids, db, exclude_id=admin.id, **selection_criteria(selection))
+    report = await run_in_threadpool(reset_passwords, db, user_ids)
+
+    if download:
+        headers = {"Content-Disposition": 'attachment; filename="temporary_passwords.csv"'}
+        if report.failed_user_ids:
+            headers["X-Failed-User-Ids"] = ",".join(str(user_id) for user_id in report.failed_user_ids)
+        return StreamingResponse(temporary_passwords_csv(report.accounts), media_type="text/csv", headers=headers)
+
+    return BatchResetPasswordResponse(
+        count=len(report.accounts),
+        accounts=report.accounts,
+        failed_user_ids=report.failed_user_ids,
+        warning="Ces mots de passe ne seront affichés qu'une seule fois",
+    )
+
+
+
+@router.post("/accounts/batch/deactivate", response_model=BatchAccountResponse)
+async def batch_deactivate(
+    selection: AccountSelection,
+    db: Session = Depends(get_db),
+    admin: Principal = Depends(get_current_admin),
+):
+    """
+    This function deactivates every selected account and revokes its tokens (the admin's own is never selected).
+
+    param : selection - The criteria of the accounts.
+    param : db - The session of database.
+    param : admin - The client (admin).
+    return : Return the accounts deactivated.
+    """
+    user_ids = await run_in_threadpool(select_user_ids, db, exclude_id=admin.id, **selection_criteria(selection))
+    changed = await run_in_threadpool(set_active, db, user_ids, False)
+    return BatchAccountResponse(count=len(changed), user_ids=changed)
+
+
+
+@router.post("/accounts/batch/reactivate", response_model=BatchAccountResponse)
+async def batch_reactivate(
+    selection: AccountSelection,
+    db: Session = Depends(get_db),
+    admin: Principal = Depends(get_current_admin),
+):
+    """
+    This function reactivates every selected account.
+
+    param : selection - The criteria of the accounts.
+    param : db - The session of database.
+    param : admin - The client (admin).
+    return : Return the accounts reactivated.
+    """
+    user_ids = await run_in_threadpool(select_user_ids, db, exclude_id=admin.id, **selection_criteria(selection))
+    changed = await run_in_threadpool(set_active, db, user_ids, True)
+    return BatchAccountResponse(count=len(changed), user_ids=changed)
+
+
+
+def selection_criteria(selection: AccountSelection) -> dict:
+    return {
+        "user_ids": selection.user_ids,
+        "company": selection.company,
+        "role": selection.role.value if selection.role is not None else None,
+        "inactive_since": selection.inactive_since,
+    }
+
+
+
+def temporary_passwords_csv(accounts):
+    """
+    This function streams the temporary passwords as CSV, one line at a time.
+
+    param : accounts - The temporary passwords.
+    return : Yield the lines.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["user_id", "email", "temporary_password"])
+    for account in accounts:
+        writer.writerow([account.user_id, account.email, account.temporary_password])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
 
 
 @router.post("/accounts/{user_id}/reset-password", response_model=ResetPasswordResponse)
-def reset_password(
+async def reset_password(
     user_id: int,
     db: Session = Depends(get_db),
     _: object = Depends(get_current_admin),
@@ -32,7 +143,7 @@ def reset_password(
     return : Return temporary password.
     """
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await run_in_threadpool(db.query(User).filter(User.id == user_id).first)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -40,11 +151,68 @@ def reset_password(
         )
 
     temp_password = generate_temp_password()
-    user.password_hash = get_password_hash(temp_password)
-    db.commit()
+    user.password_hash = await get_password_hash_async(temp_password)
+    await run_in_threadpool(revocation_list.revoke_user, db, user)
+    await run_in_threadpool(db.commit)
 
     return ResetPasswordResponse(
         message="Mot de passe réinitialisé",
         temporary_password=temp_password,
         warning="Ce mot de passe ne sera affiché qu'une seule fois"
     )
+
+
+
+@router.post("/players/import", response_model=PlayerImportResponse)
+async def import_players_file(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None),
+    db: Session = Depends(get_db),
+    _: object = Depends(get_current_admin),
+):
+    """
+    This function creates players in bulk from a CSV or NDJSON file.
+
+    param : file - The file, one player per row (same fields as a player creation).
+    param : format - "csv" or "ndjson", guessed from the file name if absent.
+    param : db - The session of database.
+    param : _ - The client (admin).
+    return : Return the number of players created and the rows refused.
+    """
+    fmt = format or ("ndjson" if (file.filename or "").lower().endswith((".ndjson", ".jsonl")) else "csv")
+
+    # Le fichier est lu ligne par ligne, jamais chargé entièrement en mémoire
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await run_in_threadpool(import_players, db, lines, fmt)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8"
+        )
+    finally:
+        lines.detach()
+
+    return PlayerImportResponse(
+        created=report.created,
+        failed=len(report.errors),
+        errors=report.errors,
+    )
+
+
+
+@router.get("/metrics")
+def metrics(_: object = Depends(get_current_admin)):
+    """
+    This function returns the runtime counters of the API.
+
+    param : _ - The client (admin).
+    return : Return the counters.
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "bulk_hasher": bulk_hasher.stats(),
+        "revocation_list": revocation_list.stats(),
+        "queries": query_metrics.stats(),
+    }
@@ -2,91 +2,96 @@
 # FICHIER : backend/app/api/auth.py
 # ============================================
 
-from datetime import datetime, timedelta
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.models import User, LoginAttempt
-from app.schemas.auth import LoginRequest, TokenResponse, UserResponse, ChangePasswordRequest
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.models.models import User, RefreshToken
+from app.schemas.auth import LoginRequest, TokenResponse, UserResponse, ChangePasswordRequest, RefreshRequest
+from app.core.cache import Principal
+from app.core.config import settings
+from app.core.login_attempts import login_attempts
+from app.core.revocation import revocation_list
+from app.core.security import (
+    verify_password_async,
+    get_password_hash_async,
+    needs_rehash,
+    create_access_token,
+    create_refresh_token,
+    hash_refresh_token,
+)
 from app.api.deps import get_current_user
 
 router = APIRouter()
 
-MAX_ATTEMPTS = 5
-LOCKOUT_MINUTES = 30
+MAX_ATTEMPTS = settings.login_max_attempts
+LOCKOUT_MINUTES = settings.login_lockout_minutes
 
-def check_and_update_attempts(db: Session, email: str, success: bool = False):
-    """Vérifie et met à jour les tentatives de connexion"""
-    attempt : LoginAttempt = db.query(LoginAttempt).filter(LoginAttempt.email == email).first()
+def check_lockout(email: str):
+    """Refuse la connexion si le compte est bloqué (une lecture de login_attempts au plus)"""
+    locked_until = login_attempts.locked_until(email)
 
-    if attempt is None:
-        attempt = LoginAttempt(
-            email=email,
-            attempts_count=0,
-            locked_until=func.now(),
-            last_attempt=func.now()
-        )
-        db.add(attempt)
-
-    now = datetime.now()
-
-    # Vérifier si le compte est bloqué
-    if attempt.attempts_count >= MAX_ATTEMPTS and attempt.locked_until > now:
-        minutes_remaining = int((attempt.locked_until - now).total_seconds() / 60)
+    if locked_until is not None:
+        minutes_remaining = int((locked_until - time.time()) / 60)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail={
                 "message": "Compte bloqué",
-                "locked_until": attempt.locked_until.isoformat(),
+                "locked_until": datetime.fromtimestamp(locked_until).isoformat(),
                 "minutes_remaining": minutes_remaining
             }
         )
 
-    if success:
-        # Réinitialiser les tentatives en cas de succès
-        attempt.attempts_count = 0
-        attempt.locked_until = None
-    else:
-        # Incrémenter les tentatives
-        attempt.attempts_count += 1
-        attempt.last_attempt = now
-        
-        if attempt.attempts_count >= MAX_ATTEMPTS:
-            attempt.locked_until = now + timedelta(minutes=LOCKOUT_MINUTES)
-            db.commit()
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail={
-                    "message": "Compte bloqué après 5 tentatives échouées",
-                    "locked_until": attempt.locked_until.isoformat(),
-                    "minutes_remaining": LOCKOUT_MINUTES
-                }
-            )
+def record_failed_attempt(email: str):
+    """Enregistre un échec de connexion et lève l'erreur correspondante"""
+    attempt = login_attempts.record_failure(email)
 
-    db.commit()
-
-    if not success:
-        attempts_remaining = MAX_ATTEMPTS - attempt.attempts_count
+    if attempt.locked_until is not None:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
+            status_code=status.HTTP_403_FORBIDDEN,
             detail={
-                "message": "Email ou mot de passe incorrect",
-                "attempts_remaining": attempts_remaining
+                "message": f"Compte bloqué après {MAX_ATTEMPTS} tentatives échouées",
+                "locked_until": datetime.fromtimestamp(attempt.locked_until).isoformat(),
+                "minutes_remaining": LOCKOUT_MINUTES
             }
         )
 
+    attempts_remaining = MAX_ATTEMPTS - len(attempt.failures)
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail={
+            "message": "Email ou mot de passe incorrect",
+            "attempts_remaining": attempts_remaining
+        }
+    )
+
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: LoginRequest, db: Session = Depends(get_db)):
+async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     """Authentifie un utilisateur et retourne un token JWT"""
 
+    # Un compte bloqué n'a pas besoin du hachage ni de la table users
+    # (les compteurs peuvent être en base : hors de la boucle d'événements)
+    await run_in_threadpool(check_lockout, credentials.email)
+
     # Récupérer l'utilisateur
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await run_in_threadpool(db.query(User).filter(User.email == credentials.email).first)
+
+    # Vérifier les credentials (bcrypt tourne dans le pool de hachage)
+    if not user or not await verify_password_async(credentials.password, user.password_hash):
+        await run_in_threadpool(record_failed_attempt, credentials.email)
+
+    # Le mot de passe en clair n'est connu qu'ici : re-hacher si les paramètres ont changé
+    new_hash = None
+    if user.is_active and needs_rehash(user.password_hash):
+        new_hash = await get_password_hash_async(credentials.password)
 
-    # Vérifier les credentials
-    if not user or not verify_password(credentials.password, user.password_hash):
-        check_and_update_attempts(db, credentials.email, success=False)
+    return await run_in_threadpool(complete_login, db, user, credentials.email, new_hash)
+
+def complete_login(db: Session, user: User, email: str, new_hash: str | None = None) -> TokenResponse:
+    """Termine la connexion d'un utilisateur dont le mot de passe est vérifié"""
 
     if not user.is_active:
         raise HTTPException(
@@ -94,54 +99,153 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
             detail="Compte désactivé"
         )
 
-    # Réinitialiser les tentatives en cas de succès
-    check_and_update_attempts(db, credentials.email, success=True)
+    if new_hash is not None:
+        user.password_hash = new_hash
+    user.last_login_at = datetime.now(timezone.utc)
+
+    # Réinitialiser les tentatives en cas de succès (ligne de login_attempts ou état du worker)
+    login_attempts.record_success(email)
+
+    refresh_token = issue_refresh_token(db, user)
+    db.commit()
 
-    # Créer le token
+    return build_token_response(user, refresh_token)
+
+def build_token_response(user: User, refresh_token: str) -> TokenResponse:
+    """Crée le token d'accès d'un utilisateur et la réponse associée"""
+
+    # Les claims suffisent à autoriser en mode stateless
     access_token = create_access_token(
         data={
             "sub": str(user.id),
             "email": user.email,
-            "role": user.role
+            "role": user.role,
+            "player_id": user.player.id if user.player is not None else None,
+            "ver": user.token_version or 0
         }
     )
 
     return TokenResponse(
         access_token=access_token,
         token_type="bearer",
-        user=UserResponse.model_validate(user)
+        user=UserResponse.model_validate(user),
+        refresh_token=refresh_token,
+        expires_in=settings.access_token_expire_minutes * 60
     )
 
+def issue_refresh_token(db: Session, user: User, family_id: str | None = None) -> str:
+    """Crée un refresh token (seul son hash est stocké), sans commit"""
+
+    now = datetime.now(timezone.utc)
+    token, token_hash = create_refresh_token()
+    db.add(RefreshToken(
+        user=user,
+        token_hash=token_hash,
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=now + timedelta(days=settings.refresh_token_expire_days)
+    ))
+
+    # Nettoyer les refresh tokens expirés de l'utilisateur
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user.id,
+        RefreshToken.expires_at < now
+    ).delete(synchronize_session=False)
+
+    return token
+
+def as_utc(value: datetime) -> datetime:
+    """SQLite renvoie des dates naïves : elles sont stockées en UTC"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
 @router.post("/change-password")
-def change_password(
+async def change_password(
     request: ChangePasswordRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Change le mot de passe de l'utilisateur connecté"""
 
+    user = await run_in_threadpool(db.get, User, current_user.id)
+
     # Vérifier le mot de passe actuel
-    if not verify_password(request.current_password, current_user.password_hash):
+    if not await verify_password_async(request.current_password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Mot de passe actuel incorrect"
         )
 
     # Vérifier que le nouveau mot de passe est différent
-    if verify_password(request.new_password, current_user.password_hash):
+    if await verify_password_async(request.new_password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Le nouveau mot de passe doit être différent de l'ancien"
         )
 
     # Mettre à jour le mot de passe
-    current_user.password_hash = get_password_hash(request.new_password)
-    current_user.must_change_password = False
-    db.commit()
+    user.password_hash = await get_password_hash_async(request.new_password)
+    user.must_change_password = False
+    await run_in_threadpool(revocation_list.revoke_user, db, user)
+    await run_in_threadpool(db.commit)
 
     return {"message": "Mot de passe modifié avec succès"}
 
+@router.post("/refresh", response_model=TokenResponse)
+def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
+    """Échange un refresh token contre un nouveau couple de tokens (rotation)"""
+
+    now = datetime.now(timezone.utc)
+    stored = db.query(RefreshToken).filter(
+        RefreshToken.token_hash == hash_refresh_token(request.refresh_token)
+    ).first()
+
+    if stored is None or as_utc(stored.expires_at) <= now:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token invalide ou expiré"
+        )
+
+    if stored.revoked_at is not None:
+        # Un token déjà utilisé a fuité : révoquer toute la famille
+        db.query(RefreshToken).filter(
+            RefreshToken.family_id == stored.family_id,
+            RefreshToken.revoked_at.is_(None)
+        ).update({RefreshToken.revoked_at: now})
+        db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token déjà utilisé"
+        )
+
+    user = stored.user
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Compte désactivé"
+        )
+
+    stored.revoked_at = now
+    refresh_token = issue_refresh_token(db, user, stored.family_id)
+    db.commit()
+
+    return build_token_response(user, refresh_token)
+
 @router.post("/logout")
-def logout(current_user: User = Depends(get_current_user)):
-    """Déconnecte l'utilisateur (côté client, suppression du token)"""
+def logout(
+    request: RefreshRequest | None = None,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Déconnecte l'utilisateur en révoquant son token (et son refresh token)"""
+
+    if current_user.token_id is not None:
+        revocation_list.revoke_token(db, current_user.id, current_user.token_id)
+
+    if request is not None:
+        db.query(RefreshToken).filter(
+            RefreshToken.token_hash == hash_refresh_token(request.refresh_token),
+            RefreshToken.user_id == current_user.id
+        ).update({RefreshToken.revoked_at: datetime.now(timezone.utc)})
+
+    db.commit()
+
     return {"message": "Déconnexion réussie"}
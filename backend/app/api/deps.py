@@ -4,20 +4,43 @@
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models.statements import PRINCIPAL_BY_USER_ID
+from app.core.cache import Principal, principal_cache
+from app.core.config import settings
+from app.core.revocation import revocation_list
 from app.core.security import decode_token
 
 security = HTTPBearer()
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Récupère l'utilisateur actuel depuis le token JWT"""
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Récupère l'utilisateur actuel depuis le token JWT, sans occuper un thread du pool"""
     
     token = credentials.credentials
+    # Lecture incrémentale des révocations des autres workers, au plus toutes les refresh_seconds
+    if revocation_list.is_stale():
+        await db.run_sync(revocation_list.refresh)
+
+    # Un token déjà vérifié évite le décodage JWT et la requête SQL
+    principal = principal_cache.get(token)
+    if principal is None:
+        principal = await load_principal(token, db)
+
+    if revocation_list.is_revoked(principal):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token révoqué"
+        )
+
+    return check_active(principal)
+
+async def load_principal(token: str, db: AsyncSession) -> Principal:
+    """Vérifie un token absent du cache et en construit le principal"""
+
     payload = decode_token(token)
     
     if payload is None:
@@ -32,23 +55,49 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token invalide"
         )
-    
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None:
+
+    # En mode stateless, les claims suffisent : aucune requête sur users
+    if settings.auth_mode == "stateless" and "ver" in payload and "role" in payload:
+        principal = Principal.from_claims(payload)
+        principal_cache.set(token, principal, payload.get("exp"))
+        return principal
+
+    row = (await db.execute(PRINCIPAL_BY_USER_ID, {"user_id": int(user_id)})).first()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Utilisateur introuvable"
         )
-    
-    if not user.is_active:
+
+    principal = Principal(
+        id=row[0],
+        role=row[1],
+        is_active=bool(row[2]),
+        player_id=row[3],
+        token_id=payload.get("jti"),
+        token_version=payload.get("ver", row[4]),
+    )
+    if principal.token_version < row[4]:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token révoqué"
+        )
+
+    principal_cache.set(token, principal, payload.get("exp"))
+    return principal
+
+def check_active(principal: Principal) -> Principal:
+    """Vérifie que le compte de l'utilisateur est actif"""
+
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Compte désactivé"
         )
-    
-    return user
 
-def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    return principal
+
+async def get_current_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
     """Vérifie que l'utilisateur actuel est administrateur"""
     
     if current_user.role != "ADMINISTRATEUR":
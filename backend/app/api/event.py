@@ -1,60 +1,92 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from datetime import date
 
-from app.database import get_db
+from app.database import get_async_db, get_read_db
 from app.api.deps import get_current_user, get_current_admin
-from app.models.models import Event, Match, Player, Team
-from app.schemas.event import EventRequest, EventResponse, EventsListResponse, MatchMini
+from app.api.pagination import PageParams, fetch_page
+from app.api.sparse import FieldsParams, columns
+from app.core.participants import refresh_participants
+from app.core.standings import apply_contributions, match_contributions
+from app.models.loaders import EVENT_COMPACT, EVENT_FIELDS, EVENT_OPTIONS
+from app.models.models import Event, Match, Team
+from app.models.statements import EVENT_IDS_BY_USER_ID
+from app.schemas.event import EventFieldsResponse, EventRequest, EventResponse, EventsFieldsListResponse, EventsListResponse, MatchMini
 
 router = APIRouter()
 
 
-@router.get("", response_model=EventsListResponse)
-def list_events(
+async def load_event(db: AsyncSession, event_id: int) -> Event | None:
+    """
+    This function loads an event with its matches.
+
+    param : db - The session of database.
+    param : event_id - The event's id.
+    return : Return the event, or None.
+    """
+    return await db.scalar(
+        select(Event)
+        .options(*EVENT_OPTIONS)
+        .where(Event.id == event_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+@router.get("", response_model=EventsListResponse | EventsFieldsListResponse, response_model_exclude_unset=True)
+async def list_events(
     start_date: date | None = Query(None),
     end_date: date | None = Query(None),
     mine: bool | None = Query(None),
-    db: Session = Depends(get_db), 
+    page: PageParams = Depends(),
+    fields: FieldsParams = Depends(),
+    db: AsyncSession = Depends(get_read_db), 
     user: str = Depends(get_current_user)):
     """
-    This function gets all the events.
+    This function gets the events, a page at a time.
 
     param : start_date - When to start to get the date.
     param : end_date - When to stope to get the date.
     param : mine - Show only my event.
+    param : page - The pagination parameters.
+    param : fields - The fields asked, every field by default.
     param : db - The database.
     param : user - The client.
-    return : Return all the events.
+    return : Return the page of events.
     """
-    events = db.query(Event)
+    events = select(Event).options(*EVENT_OPTIONS)
+    params = {}
 
     if start_date is not None:
-        events = events.filter(Event.event_date >= start_date)
+        events = events.where(Event.event_date >= start_date)
 
     if end_date is not None:
-        events = events.filter(Event.event_date <= end_date)
+        events = events.where(Event.event_date <= end_date)
 
     if mine:
-        player = db.query(Player).filter(Player.user_id == user.id).first()
-
-        query = query.join(Event.matches).join(
-            Team,
-            (Team.id == Match.team1_id) | (Team.id == Match.team2_id)
-        ).filter(
-            (Team.player1_id == player.id) |
-            (Team.player2_id == player.id)
-        ).distinct()
+        # Événements du joueur par l'index de match_participants, sans doublons ni jointure des équipes
+        events = events.where(Event.id.in_(EVENT_IDS_BY_USER_ID))
+        params["user_id"] = user.id
+
+    names = fields.names(EVENT_FIELDS, EVENT_COMPACT)
+    if names is not None:
+        # Colonnes demandées seulement : pas de matchs
+        events = await fetch_page(db, events.with_only_columns(*columns(EVENT_FIELDS, names)), Event.id, page, params, rows=True)
+        return EventsFieldsListResponse(
+            events=[EventFieldsResponse(**row._mapping) for row in events.items],
+            total=events.total,
+            next_after=events.next_after,
+        )
 
-    events = events.all()
+    events = await fetch_page(db, events, Event.id, page, params)
 
-    return EventsListResponse(events=events, total=len(events))
+    return EventsListResponse(events=events.items, total=events.total, next_after=events.next_after)
 
 
 
 @router.get("/{event_id}", response_model=EventResponse)
-def get_event(event_id: int, db: Session = Depends(get_db), _: str = Depends(get_current_user)):
+async def get_event(event_id: int, db: AsyncSession = Depends(get_read_db), _: str = Depends(get_current_user)):
     """
     This function gets a specific event.
 
@@ -63,7 +95,7 @@ def get_event(event_id: int, db: Session = Depends(get_db), _: str = Depends(get
     param : _ - The client.
     return : Return the event.
     """
-    event = db.get(Event, event_id)
+    event = await load_event(db, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return EventResponse.model_validate(event)
@@ -71,7 +103,7 @@ def get_event(event_id: int, db: Session = Depends(get_db), _: str = Depends(get
 
 
 @router.post("", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
-def create_event(data: EventRequest, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def create_event(data: EventRequest, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function creates a event.
 
@@ -111,24 +143,28 @@ def create_event(data: EventRequest, db: Session = Depends(get_db), _: str = Dep
 
     db.add(event)
 
+    matches = []
     for match in data.matches:
-        team1 = db.get(Team, match.team1_id)
-        team2 = db.get(Team, match.team2_id)
+        team1 = await db.get(Team, match.team1_id)
+        team2 = await db.get(Team, match.team2_id)
 
         if team1 is None or team2 is None:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="One team not found")
 
-        db.add(Match(
+        matches.append(Match(
                 court_number=match.court_number,
                 team1=team1,
                 team2=team2,
                 event=event
             )
         )
+        db.add(matches[-1])
 
-    db.commit()
-    db.refresh(event)
+    await db.flush()
+    await refresh_participants(db, [match.id for match in matches])
+    await db.commit()
+    event = await load_event(db, event.id)
     return EventResponse(
         id=event.id,
         event_date=event.event_date,
@@ -139,7 +175,7 @@ def create_event(data: EventRequest, db: Session = Depends(get_db), _: str = Dep
 
 
 @router.put("/{event_id}", response_model=EventResponse)
-def update_event(event_id: int, data: EventRequest, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def update_event(event_id: int, data: EventRequest, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function updates a event.
     
@@ -173,33 +209,44 @@ def update_event(event_id: int, data: EventRequest, db: Session = Depends(get_db
         team_set.add(match.team1_id)
         team_set.add(match.team2_id)
         
-    event = db.get(Event, event_id)
+    event = await db.get(Event, event_id, options=EVENT_OPTIONS)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
     event.event_date = data.event_date
     event.event_time = data.event_time
 
+    # Les matchs sont recréés à venir : les matchs terminés sortent du classement
+    removed = []
     for match in event.matches:
-        db.delete(match)
+        removed += await match_contributions(db, match)
+        await db.delete(match)
 
+    # Participants des matchs supprimés effacés en cascade, ceux des nouveaux recopiés
+    matches = []
     for match in data.matches:
-        team1 = db.get(Team, match.team1_id)
-        team2 = db.get(Team, match.team2_id)
+        team1 = await db.get(Team, match.team1_id)
+        team2 = await db.get(Team, match.team2_id)
 
         if team1 is None or team2 is None:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="One team not found")
 
-        db.add(Match(
+        matches.append(Match(
                 court_number=match.court_number,
                 team1=team1,
                 team2=team2,
                 event=event
             )
         )
-
-    db.commit()
+        db.add(matches[-1])
+
+    await db.flush()
+    if removed:
+        await apply_contributions(db, removed, [])
+    await refresh_participants(db, [match.id for match in matches])
+    await db.commit()
+    event = await load_event(db, event.id)
     return EventResponse(
         id=event.id,
         event_date=event.event_date,
@@ -210,7 +257,7 @@ def update_event(event_id: int, data: EventRequest, db: Session = Depends(get_db
 
 
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_event(event_id: int, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def delete_event(event_id: int, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function remove a event.
 
@@ -219,7 +266,7 @@ def delete_event(event_id: int, db: Session = Depends(get_db), _: str = Depends(
     param : _ - The client.
     return : Return no content
     """
-    event = db.get(Event, event_id)
+    event = await db.get(Event, event_id, options=EVENT_OPTIONS)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -227,5 +274,5 @@ def delete_event(event_id: int, db: Session = Depends(get_db), _: str = Depends(
         if match.status != "A_VENIR":
             raise HTTPException(status_code=400, detail="Match over or cancel")
 
-    db.delete(event)
-    db.commit()
\ No newline at end of file
+    await db.delete(event)
+    await db.commit()
\ No newline at end of file
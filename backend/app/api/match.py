@@ -1,63 +1,91 @@
 from datetime import date, time, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import get_async_db, get_read_db
 from app.api.deps import get_current_user, get_current_admin
-from app.models.models import Event, Match, Player, Team
-from app.schemas.match import MatchRequest, MatchResponse, MatchStatus, MatchesListResponse
+from app.api.pagination import PageParams, fetch_page
+from app.api.sparse import FieldsParams, columns
+from app.core.participants import refresh_participants
+from app.core.standings import apply_contributions, match_contributions
+from app.models.loaders import MATCH_COMPACT, MATCH_EVENT, MATCH_FIELDS, MATCH_OPTIONS
+from app.models.models import Event, Match, Team
+from app.models.statements import MATCH_IDS_BY_USER_ID
+from app.schemas.match import MatchFieldsResponse, MatchRequest, MatchResponse, MatchStatus, MatchesFieldsListResponse, MatchesListResponse
 
 router = APIRouter()
 
 
-@router.get("", response_model=MatchesListResponse)
-def list_matches(upcoming : bool | None = Query(None), team_id : int | None = Query(None), status : MatchStatus | None = Query(None), my_matches : bool | None = Query(None), db: Session = Depends(get_db), user: str = Depends(get_current_user)):
+async def load_match(db: AsyncSession, match_id: int) -> Match | None:
     """
-    This function gets all the matchs.
+    This function loads a match with everything MatchResponse reads.
+
+    param : db - The session of database.
+    param : match_id - The match's id.
+    return : Return the match, or None.
+    """
+    return await db.scalar(
+        select(Match)
+        .options(*MATCH_OPTIONS)
+        .where(Match.id == match_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+@router.get("", response_model=MatchesListResponse | MatchesFieldsListResponse, response_model_exclude_unset=True)
+async def list_matches(upcoming : bool | None = Query(None), team_id : int | None = Query(None), status : MatchStatus | None = Query(None), my_matches : bool | None = Query(None), page: PageParams = Depends(), fields: FieldsParams = Depends(), db: AsyncSession = Depends(get_read_db), user: str = Depends(get_current_user)):
+    """
+    This function gets the matchs, a page at a time.
 
     param : upcoming - Filter to the following 30 days.
     param : team_id - Filter to a team.
     param : status - Filter to a status.
     param : my_matches - Filter if the user plays the match.
+    param : page - The pagination parameters.
+    param : fields - The fields asked, every field by default.
     param : db - The database.
     param : user - The client.
-    return : Return all the matchs.
+    return : Return the page of matchs.
     """
-    matches = db.query(Match)
+    matches = select(Match).options(*MATCH_OPTIONS)
+    params = {}
 
     if upcoming:
         today = date.today()
-        matches = matches.join(Event).filter(
+        matches = matches.join(Event).where(
             Event.event_date.between(today, today + timedelta(days=30))
         )
 
     if status:
-        matches = matches.filter(Match.status == status)
+        matches = matches.where(Match.status == status)
 
     if my_matches:
-        player = db.query(Player).filter(Player.user_id == user.id).first()
-
-        matches = matches.join(
-            Team,
-            or_(
-                Team.id == Match.team1_id,
-                Team.id == Match.team2_id,
-            )
-        ).filter(
-            or_(
-                Team.player1_id == player.id,
-                Team.player2_id == player.id,
-            )
+        # Matchs du joueur par l'index de match_participants, sans joindre les équipes
+        matches = matches.where(Match.id.in_(MATCH_IDS_BY_USER_ID))
+        params["user_id"] = user.id
+
+    names = fields.names(MATCH_FIELDS, MATCH_COMPACT)
+    if names is not None:
+        # Colonnes demandées seulement : ni équipes, ni joueurs, ni poules
+        matches = matches.with_only_columns(*columns(MATCH_FIELDS, names))
+        if {"event_date", "event_time"} & set(names):
+            matches = matches.join(MATCH_EVENT, MATCH_EVENT.id == Match.event_id)
+        matches = await fetch_page(db, matches, Match.id, page, params, rows=True)
+        return MatchesFieldsListResponse(
+            matches=[MatchFieldsResponse(**row._mapping) for row in matches.items],
+            total=matches.total,
+            next_after=matches.next_after,
         )
 
-    matches = matches.all()
-    return MatchesListResponse(matches=matches, total=len(matches))
+    matches = await fetch_page(db, matches, Match.id, page, params)
+    return MatchesListResponse(matches=matches.items, total=matches.total, next_after=matches.next_after)
 
 
 
 @router.get("/{match_id}", response_model=MatchResponse)
-def get_match(match_id: int, db: Session = Depends(get_db), _: str = Depends(get_current_user)):
+async def get_match(match_id: int, db: AsyncSession = Depends(get_read_db), _: str = Depends(get_current_user)):
     """
     This function gets a specific match.
 
@@ -66,7 +94,7 @@ def get_match(match_id: int, db: Session = Depends(get_db), _: str = Depends(get
     param : _ - The client.
     return : Return the match.
     """
-    match = db.get(Match, match_id)
+    match = await load_match(db, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     return MatchResponse.model_validate(match)
@@ -74,7 +102,7 @@ def get_match(match_id: int, db: Session = Depends(get_db), _: str = Depends(get
 
 
 @router.post("", response_model=MatchResponse, status_code=status.HTTP_201_CREATED)
-def create_match(data: MatchRequest, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def create_match(data: MatchRequest, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function creates a match.
 
@@ -89,16 +117,16 @@ def create_match(data: MatchRequest, db: Session = Depends(get_db), _: str = Dep
     if data.court_number < 1 or data.court_number > 10:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Court need to be 1 to 10")
     try:
-        team1 = db.get(Team, data.team1_id)
-        team2 = db.get(Team, data.team2_id)
+        team1 = await db.get(Team, data.team1_id)
+        team2 = await db.get(Team, data.team2_id)
 
         if team1 is None or team2 is None:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Team not found")
         
         event : Event = None
         if data.event is None:
-            event = Event(event_date=func.current_date(), event_time=time())
+            event = Event(event_date=date.today(), event_time=time())
         else:
             event = Event(event_date=data.event.event_date, event_time=data.event.event_time)
         
@@ -114,17 +142,20 @@ def create_match(data: MatchRequest, db: Session = Depends(get_db), _: str = Dep
             event=event
         )
         db.add(match)
-        db.commit()
-        db.refresh(match)
+        await db.flush()
+        await apply_contributions(db, [], await match_contributions(db, match))
+        await refresh_participants(db, [match.id])
+        await db.commit()
     except:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Error in the field")
+    match = await load_match(db, match.id)
     return MatchResponse.model_validate(match)
 
 
 
 @router.put("/{match_id}", response_model=MatchResponse)
-def update_match(match_id: int, data: MatchRequest, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def update_match(match_id: int, data: MatchRequest, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function updates a match.
     
@@ -140,17 +171,20 @@ def update_match(match_id: int, data: MatchRequest, db: Session = Depends(get_db
     if data.court_number < 1 or data.court_number > 10:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Court need to be 1 to 10")
     
-    match = db.get(Match, match_id)
+    match = await db.get(Match, match_id, options=[selectinload(Match.event).selectinload(Event.matches)])
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
         
     try:
+        # Contribution au classement avant modification, retirée après
+        before = await match_contributions(db, match)
+        before_teams = (match.team1_id, match.team2_id)
 
-        team1 = db.get(Team, data.team1_id)
-        team2 = db.get(Team, data.team2_id)
+        team1 = await db.get(Team, data.team1_id)
+        team2 = await db.get(Team, data.team2_id)
 
         if team1 is None or team2 is None:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Team not found")
 
         match.court_number=data.court_number
@@ -161,7 +195,7 @@ def update_match(match_id: int, data: MatchRequest, db: Session = Depends(get_db
         match.team2=team2
 
         if data.event is not None:
-            event = db.query(Event).filter(and_(Event.event_date == data.event.event_date, Event.event_time == data.event.event_time)).first()
+            event = await db.scalar(select(Event).where(and_(Event.event_date == data.event.event_date, Event.event_time == data.event.event_time)))
             if event is not None:
                 match.event = event
             else:
@@ -173,16 +207,21 @@ def update_match(match_id: int, data: MatchRequest, db: Session = Depends(get_db
                     db.add(event)
                     match.event = event
 
-        db.commit()
+        await db.flush()
+        await apply_contributions(db, before, await match_contributions(db, match))
+        if (match.team1_id, match.team2_id) != before_teams:
+            await refresh_participants(db, [match.id])
+        await db.commit()
     except:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Error in the field")
+    match = await load_match(db, match_id)
     return MatchResponse.model_validate(match)
 
 
 
 @router.delete("/{match_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_match(match_id: int, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def delete_match(match_id: int, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function remove a match.
 
@@ -191,12 +230,12 @@ def delete_match(match_id: int, db: Session = Depends(get_db), _: str = Depends(
     param : _ - The client.
     return : Return no content
     """
-    match = db.get(Match, match_id)
+    match = await db.get(Match, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     
     if match.status != "A_VENIR":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The match is over or canceled.")
 
-    db.delete(match)
-    db.commit()
+    await db.delete(match)
+    await db.commit()
@@ -0,0 +1,112 @@
+# ============================================
+# FICHIER : backend/app/api/pagination.py
+# ============================================
+
+# Pagination par curseur (keyset) des listes : les éléments sont triés par id
+# et une page reprend après le dernier id reçu (WHERE id > after LIMIT n).
+# Le coût d'une page ne dépend pas de sa position, contrairement à OFFSET, et
+# une insertion entre deux pages ne décale ni ne duplique aucun élément.
+
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from fastapi import Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Taille de page par défaut et maximale
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class PageParams:
+    """
+    This class is the pagination parameters of a list (dependency).
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+        after: int | None = Query(None),
+        with_total: bool = Query(False),
+        unpaginated: bool = Query(False, alias="all"),
+    ):
+        # This attribute is the maximal number of items of the page.
+        self.limit = limit
+
+        # This attribute is the id of the last item of the previous page, None for the first page.
+        self.after = after
+
+        # This attribute asks the total of items (one more COUNT query).
+        self.with_total = with_total
+
+        # This attribute asks the whole list with its total, the shape before pagination.
+        self.unpaginated = unpaginated
+
+
+@dataclass
+class Page:
+    """
+    This class is a page of a list.
+    """
+
+    # This attribute is the items of the page.
+    items: List[Any]
+
+    # This attribute is the total of items, None if not asked.
+    total: Optional[int]
+
+    # This attribute is the cursor of the next page, None on the last page.
+    next_after: Optional[int]
+
+
+
+async def read(db: AsyncSession, statement, params: Optional[dict], rows: bool) -> list:
+    """
+    This function executes the select of a list.
+
+    param : db - The session of database.
+    param : statement - The select.
+    param : params - The values of the bind parameters.
+    param : rows - True to read rows of columns instead of entities.
+    return : Return the items.
+    """
+    result = await db.execute(statement, params)
+    return result.all() if rows else result.scalars().all()
+
+
+
+async def fetch_page(db: AsyncSession, statement, key, page: PageParams, params: Optional[dict] = None, rows: bool = False) -> Page:
+    """
+    This function reads a page of a list.
+
+    param : db - The session of database.
+    param : statement - The select of the entities (or of columns with an "id"), with its filters.
+    param : key - The id column, unique: the order of the pages.
+    param : page - The pagination parameters.
+    param : params - The values of the bind parameters of the statement.
+    param : rows - True to read rows of columns instead of entities.
+    return : Return the page.
+    """
+    statement = statement.order_by(key)
+
+    if page.unpaginated:
+        items = await read(db, statement, params, rows)
+        return Page(items=items, total=len(items), next_after=None)
+
+    total = None
+    if page.with_total:
+        # Les ids seulement : ni colonnes ni chargements des relations
+        ids = statement.with_only_columns(key).order_by(None).subquery()
+        total = await db.scalar(select(func.count()).select_from(ids), params)
+
+    if page.after is not None:
+        statement = statement.where(key > page.after)
+    # Un élément de plus : indique s'il existe une page suivante
+    items = await read(db, statement.limit(page.limit + 1), params, rows)
+
+    next_after = None
+    if len(items) > page.limit:
+        items = items[:page.limit]
+        next_after = items[-1].id
+    return Page(items=items, total=total, next_after=next_after)
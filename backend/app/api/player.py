@@ -1,35 +1,51 @@
 # app/api/players.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_read_db
 from app.api.deps import get_current_user, get_current_admin
+from app.api.pagination import PageParams, fetch_page
+from app.api.sparse import FieldsParams, columns
+from app.core.revocation import revocation_list
+from app.models.loaders import PLAYER_COMPACT, PLAYER_FIELDS, PLAYER_OPTIONS
 from app.models.models import Player, Team, User
-from app.schemas.player import PlayerRequest, PlayerResponse, PlayersListResponse
+from app.schemas.player import PlayerFieldsResponse, PlayerRequest, PlayerResponse, PlayersFieldsListResponse, PlayersListResponse
 
 router = APIRouter()
 
 
-@router.get("", response_model=PlayersListResponse)
-def list_players(db: Session = Depends(get_db), _: str = Depends(get_current_user)):
+@router.get("", response_model=PlayersListResponse | PlayersFieldsListResponse, response_model_exclude_unset=True)
+async def list_players(page: PageParams = Depends(), fields: FieldsParams = Depends(), db: AsyncSession = Depends(get_read_db), _: str = Depends(get_current_user)):
     """
-    This function gets all the players.
+    This function gets the players, a page at a time.
 
+    param : page - The pagination parameters.
+    param : fields - The fields asked, every field by default.
     param : db - The session of database.
     param : _ - The client.
-    return : Return all the players.
+    return : Return the page of players.
     """
-    players = db.query(Player).all()
+    names = fields.names(PLAYER_FIELDS, PLAYER_COMPACT)
+    if names is not None:
+        players = await fetch_page(db, select(*columns(PLAYER_FIELDS, names)), Player.id, page, rows=True)
+        return PlayersFieldsListResponse(
+            players=[PlayerFieldsResponse(**row._mapping) for row in players.items],
+            total=players.total,
+            next_after=players.next_after,
+        )
+
+    players = await fetch_page(db, select(Player), Player.id, page)
 
     return PlayersListResponse(
-        players=players,
-        total=len(players),
+        players=players.items,
+        total=players.total,
+        next_after=players.next_after,
     )
 
 
 
 @router.get("/{player_id}", response_model=PlayerResponse)
-def get_player(player_id: int, db: Session = Depends(get_db), _: str = Depends(get_current_user)):
+async def get_player(player_id: int, db: AsyncSession = Depends(get_read_db), _: str = Depends(get_current_user)):
     """
     This function gets a specific player.
 
@@ -38,7 +54,7 @@ def get_player(player_id: int, db: Session = Depends(get_db), _: str = Depends(g
     param : _ - The client.
     return : Return the player.
     """
-    player = db.get(Player, player_id)
+    player = await db.get(Player, player_id)
 
     if not player:
         raise HTTPException(
@@ -51,7 +67,7 @@ def get_player(player_id: int, db: Session = Depends(get_db), _: str = Depends(g
 
 
 @router.post("", response_model=PlayerResponse, status_code=status.HTTP_201_CREATED)
-def create_player(data: PlayerRequest, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def create_player(data: PlayerRequest, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function creates a player.
 
@@ -60,10 +76,10 @@ def create_player(data: PlayerRequest, db: Session = Depends(get_db), _: str = D
     param : _ - The client.
     return : Return the player created.
     """
-    from app.core.security import get_password_hash #Dynamic import, because need to initialize .env
+    from app.core.security import get_password_hash_async #Dynamic import, because need to initialize .env
     
     try:
-        user = db.query(User).filter(User.email == data.email).first()
+        user = await db.scalar(select(User).where(User.email == data.email))
         if user is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -71,7 +87,7 @@ def create_player(data: PlayerRequest, db: Session = Depends(get_db), _: str = D
             )
 
         user = User(email = data.email,
-                    password_hash = get_password_hash(data.password),
+                    password_hash = await get_password_hash_async(data.password),
                     role = data.role
                 )
         db.add(user)
@@ -84,18 +100,18 @@ def create_player(data: PlayerRequest, db: Session = Depends(get_db), _: str = D
                         user = user
                     )
         db.add(player)
-        db.commit()
+        await db.commit()
     except:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid field")
-    db.refresh(player)
+    await db.refresh(player)
 
     return PlayerResponse.model_validate(player)
 
 
 
 @router.put("/{player_id}", response_model=PlayerResponse)
-def update_player(player_id: int, data: PlayerRequest, db: Session = Depends(get_db),_: str = Depends(get_current_admin)):
+async def update_player(player_id: int, data: PlayerRequest, db: AsyncSession = Depends(get_async_db),_: str = Depends(get_current_admin)):
     """
     This function updates a player.
     
@@ -105,9 +121,9 @@ def update_player(player_id: int, data: PlayerRequest, db: Session = Depends(get
     param : _ - The client.
     return : Return the player updated.
     """
-    from app.core.security import get_password_hash #Dynamic import, because need to initialize .env
+    from app.core.security import get_password_hash_async #Dynamic import, because need to initialize .env
 
-    player = db.get(Player, player_id)
+    player = await db.get(Player, player_id, options=PLAYER_OPTIONS)
 
     if not player:
         raise HTTPException(
@@ -115,10 +131,12 @@ def update_player(player_id: int, data: PlayerRequest, db: Session = Depends(get
             detail="Player not found",
         )
 
+    password_hash = await get_password_hash_async(data.password)
+
     try:
         user = player.user
         user.email = data.email
-        user.password_hash = get_password_hash(data.password)
+        user.password_hash = password_hash
         user.role = data.role
         
         player.first_name = data.first_name
@@ -128,17 +146,20 @@ def update_player(player_id: int, data: PlayerRequest, db: Session = Depends(get
         player.birth_date = data.birth_date
         player.photo_url = data.photo_url
 
-        db.commit()
+        await db.run_sync(revocation_list.revoke_user, user)
+        await db.commit()
     except:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid field")
 
+    await db.refresh(player)
+
     return PlayerResponse.model_validate(player)
 
 
 
 @router.delete("/{player_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_player(player_id: int, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def delete_player(player_id: int, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function remove a player.
 
@@ -147,7 +168,7 @@ def delete_player(player_id: int, db: Session = Depends(get_db), _: str = Depend
     param : _ - The client.
     return : Return no content
     """
-    player = db.get(Player, player_id)
+    player = await db.get(Player, player_id, options=PLAYER_OPTIONS)
 
     if not player:
         raise HTTPException(
@@ -155,10 +176,11 @@ def delete_player(player_id: int, db: Session = Depends(get_db), _: str = Depend
             detail="Player not found",
         )
     
-    team = db.query(Team).filter(or_(Team.player1 == player, Team.player2 == player)).first()
+    team = await db.scalar(select(Team).where(or_(Team.player1 == player, Team.player2 == player)).limit(1))
     if team is not None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The player is in a team")
 
-    db.delete(player.user)
-    db.delete(player)
-    db.commit()
+    await db.run_sync(revocation_list.revoke_user_id, player.user.id, (player.user.token_version or 0) + 1)
+    await db.delete(player.user)
+    await db.delete(player)
+    await db.commit()
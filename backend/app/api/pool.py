@@ -1,24 +1,48 @@
+from collections import defaultdict
+from typing import List
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db, get_read_db
 from app.api.deps import get_current_user, get_current_admin
+from app.models.loaders import POOL_OPTIONS
 from app.models.models import Match, Pool, Team
+from app.models.statements import POOL_SUMMARIES, POOL_SUMMARY, POOL_TEAM_COMPANIES, POOL_TEAM_COMPANIES_BY_POOL
 from app.schemas.pool import PoolRequest, PoolResponse, PoolsListResponse
 
 router = APIRouter()
 
-def pool_to_response(pool: Pool) -> PoolResponse:
-    return PoolResponse(
-        id=pool.id,
-        name=pool.name,
-        teams_count=len(pool.teams),
-        teams=[team.company for team in pool.teams],
-    )
+async def pool_responses(db: AsyncSession, pool_id: int | None = None) -> List[PoolResponse]:
+    """
+    This function builds the pools' responses in two queries, whatever the number of pools.
+
+    param : db - The session of database.
+    param : pool_id - Only this pool, or every pool if None.
+    return : Return the pools.
+    """
+    if pool_id is None:
+        summaries, companies = POOL_SUMMARIES, POOL_TEAM_COMPANIES
+    else:
+        summaries, companies = POOL_SUMMARY, POOL_TEAM_COMPANIES_BY_POOL
+
+    pools = (await db.execute(summaries, {"pool_id": pool_id})).all()
+    if not pools:
+        return []
+
+    teams = defaultdict(list)
+    for team_pool_id, company in await db.execute(companies, {"pool_id": pool_id}):
+        teams[team_pool_id].append(company)
+
+    return [
+        PoolResponse(id=pool.id, name=pool.name, teams_count=pool.teams_count, teams=teams[pool.id])
+        for pool in pools
+    ]
 
 
 @router.get("", response_model=PoolsListResponse)
-def list_pools(db: Session = Depends(get_db), _: str = Depends(get_current_user)):
+async def list_pools(db: AsyncSession = Depends(get_read_db), _: str = Depends(get_current_user)):
     """
     This function gets all the pools.
 
@@ -26,13 +50,13 @@ def list_pools(db: Session = Depends(get_db), _: str = Depends(get_current_user)
     param : _ - The client.
     return : Return all the pools.
     """
-    pools = db.query(Pool).all()
-    return PoolsListResponse(pools=[pool_to_response(pool) for pool in pools], total=len(pools))
+    pools = await pool_responses(db)
+    return PoolsListResponse(pools=pools, total=len(pools))
 
 
 
 @router.get("/{pool_id}", response_model=PoolResponse)
-def get_pool(pool_id: int, db: Session = Depends(get_db), _: str = Depends(get_current_user)):
+async def get_pool(pool_id: int, db: AsyncSession = Depends(get_read_db), _: str = Depends(get_current_user)):
     """
     This function gets a specific pool.
 
@@ -41,15 +65,15 @@ def get_pool(pool_id: int, db: Session = Depends(get_db), _: str = Depends(get_c
     param : _ - The client.
     return : Return the pool.
     """
-    pool = db.get(Pool, pool_id)
-    if not pool:
+    pools = await pool_responses(db, pool_id)
+    if not pools:
         raise HTTPException(status_code=404, detail="Pool not found")
-    return pool_to_response(pool)
+    return pools[0]
 
 
 
 @router.post("", response_model=PoolResponse, status_code=status.HTTP_201_CREATED)
-def create_pool(data: PoolRequest, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def create_pool(data: PoolRequest, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function creates a pool.
 
@@ -65,25 +89,19 @@ def create_pool(data: PoolRequest, db: Session = Depends(get_db), _: str = Depen
     db.add(pool)
 
     for team_id in data.team_ids:
-        team = db.get(Team, team_id)
+        team = await db.get(Team, team_id)
         if team is None:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
         team.pool = pool
 
-    db.commit()
-    db.refresh(pool)
-    return PoolResponse(
-        id=pool.id,
-        name=pool.name,
-        teams_count=len(pool.teams),
-        teams=[team.company for team in pool.teams]
-    )
+    await db.commit()
+    return (await pool_responses(db, pool.id))[0]
 
 
 
 @router.put("/{pool_id}", response_model=PoolResponse)
-def update_pool(pool_id: int, data: PoolRequest, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def update_pool(pool_id: int, data: PoolRequest, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function updates a pool.
     
@@ -96,40 +114,35 @@ def update_pool(pool_id: int, data: PoolRequest, db: Session = Depends(get_db),
     if len(data.team_ids) != 6:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A pool has 6 teams")
     
-    pool = db.get(Pool, pool_id)
+    pool = await db.get(Pool, pool_id, options=POOL_OPTIONS)
     if not pool:
         raise HTTPException(status_code=404, detail="Pool not found")
     
     for team in pool.teams:
-        result = db.query(Match).filter(Match.status == "TERMINE").first()
+        result = await db.scalar(select(Match).where(Match.status == "TERMINE").limit(1))
         if result is not None:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A team had already played")
     
     pool = Pool(name=data.name)
 
     for team_id in pool.teams:
-        team = db.get(Team, team_id)
+        team = await db.get(Team, team_id)
         team.pool = None
 
     for team_id in data.team_ids:
-        team = db.get(Team, team_id)
+        team = await db.get(Team, team_id)
         if team is None:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
         team.pool = pool
 
-    db.commit()
-    return PoolResponse(
-        id=pool.id,
-        name=pool.name,
-        teams_count=len(pool.teams),
-        teams=[team.company for team in pool.teams]
-    )
+    await db.commit()
+    return (await pool_responses(db, pool.id))[0]
 
 
 
 @router.delete("/{pool_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_pool(pool_id: int, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def delete_pool(pool_id: int, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function remove a pool.
 
@@ -138,14 +151,14 @@ def delete_pool(pool_id: int, db: Session = Depends(get_db), _: str = Depends(ge
     param : _ - The client.
     return : Return no content
     """
-    pool = db.get(Pool, pool_id)
+    pool = await db.get(Pool, pool_id, options=POOL_OPTIONS)
     if not pool:
         raise HTTPException(status_code=404, detail="Pool not found")
     
     for team in pool.teams:
-        result = db.query(Match).filter(Match.status == "TERMINE").first()
+        result = await db.scalar(select(Match).where(Match.status == "TERMINE").limit(1))
         if result is not None:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A team had already played")
 
-    db.delete(pool)
-    db.commit()
+    await db.delete(pool)
+    await db.commit()
@@ -1,16 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.api.deps import get_current_user
-from app.models.models import User, Player
+from app.core.cache import Principal
+from app.models.models import Player
+from app.models.statements import PLAYER_BY_USER_ID
 from app.schemas.profile import ProfilePhoto, ProfileResponse, ProfilePlayer, ProfileUser, ProfilePlayerRequest
 
 router = APIRouter()
 
 
+async def load_profile(db: AsyncSession, user_id: int) -> Player | None:
+    """
+    This function loads the player of a user with its account.
+
+    param : db - The session of database.
+    param : user_id - The user's id.
+    return : Return the player, or None.
+    """
+    return await db.scalar(PLAYER_BY_USER_ID, {"user_id": user_id})
+
+
 @router.get("/me", response_model=ProfileResponse)
-def get_profile(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_profile(db: AsyncSession = Depends(get_async_db), current_user: Principal = Depends(get_current_user)):
     """
     This function gets the current user's profile.
 
@@ -18,7 +31,7 @@ def get_profile(db: Session = Depends(get_db), current_user: User = Depends(get_
     param : current_user - The connected user.
     return : Return the profile.
     """
-    player = db.query(Player).filter(Player.user_id == current_user.id).first()
+    player = await load_profile(db, current_user.id)
 
     if not player:
         raise HTTPException(
@@ -27,14 +40,14 @@ def get_profile(db: Session = Depends(get_db), current_user: User = Depends(get_
         )
 
     return ProfileResponse(
-        user=ProfileUser.model_validate(current_user),
+        user=ProfileUser.model_validate(player.user),
         player=ProfilePlayer.model_validate(player)
     )
 
 
 
 @router.put("/me", response_model=ProfileResponse)
-def update_profile(data: ProfilePlayerRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def update_profile(data: ProfilePlayerRequest, db: AsyncSession = Depends(get_async_db), current_user: Principal = Depends(get_current_user)):
     """
     This function updates the current user's profile.
 
@@ -43,7 +56,7 @@ def update_profile(data: ProfilePlayerRequest, db: Session = Depends(get_db), cu
     param : current_user - The connected user.
     return : Return the profile updated.
     """
-    player = db.query(Player).filter(Player.user_id == current_user.id).first()
+    player = await load_profile(db, current_user.id)
 
     if not player:
         raise HTTPException(
@@ -72,18 +85,18 @@ def update_profile(data: ProfilePlayerRequest, db: Session = Depends(get_db), cu
     if data.email is not None:
         player.user.email = data.email
 
-    db.commit()
-    db.refresh(player)
+    await db.commit()
+    player = await load_profile(db, current_user.id)
 
     return ProfileResponse(
-        user=ProfileUser.model_validate(current_user),
+        user=ProfileUser.model_validate(player.user),
         player=ProfilePlayer.model_validate(player)
     )
 
 
 
 @router.put("/me/photo", status_code=status.HTTP_201_CREATED)
-def upload_profile_photo(data: ProfilePhoto, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def upload_profile_photo(data: ProfilePhoto, db: AsyncSession = Depends(get_async_db), current_user: Principal = Depends(get_current_user)):
     """
     This function stores the profile photo URI.
 
@@ -92,7 +105,7 @@ def upload_profile_photo(data: ProfilePhoto, db: Session = Depends(get_db), curr
     param : current_user - The connected user.
     return : Return the stored photo URI.
     """
-    player = db.query(Player).filter(Player.user_id == current_user.id).first()
+    player = await load_profile(db, current_user.id)
 
     if not player:
         raise HTTPException(
@@ -101,15 +114,15 @@ def upload_profile_photo(data: ProfilePhoto, db: Session = Depends(get_db), curr
         )
 
     player.photo_url = data.photo_url
-    db.commit()
-    db.refresh(player)
+    await db.commit()
+    await db.refresh(player)
 
     return {"photo_url": player.photo_url}
 
 
 
 @router.delete("/me/photo", status_code=status.HTTP_204_NO_CONTENT)
-def delete_profile_photo(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def delete_profile_photo(db: AsyncSession = Depends(get_async_db), current_user: Principal = Depends(get_current_user)):
     """
     This function deletes the profile photo URI.
 
@@ -117,7 +130,7 @@ def delete_profile_photo(db: Session = Depends(get_db), current_user: User = Dep
     param : current_user - The connected user.
     return : Return no content.
     """
-    player = db.query(Player).filter(Player.user_id == current_user.id).first()
+    player = await load_profile(db, current_user.id)
 
     if not player:
         raise HTTPException(
@@ -126,6 +139,6 @@ def delete_profile_photo(db: Session = Depends(get_db), current_user: User = Dep
         )
 
     player.photo_url = None
-    db.commit()
+    await db.commit()
 
     return
@@ -0,0 +1,75 @@
+# ============================================
+# FICHIER : backend/app/api/sparse.py
+# ============================================
+
+# Réponses partielles des listes : fields=id,court_number ou view=compact.
+# Seules les colonnes demandées sont sélectionnées en SQL (pas d'entité ni de
+# relation chargée) et la réponse ne contient que ces champs.
+
+from enum import Enum
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, status
+
+
+class ResponseView(str, Enum):
+    """
+    This is the shape of the items of a list.
+    """
+
+    # Every field, with the nested objects.
+    FULL = "full"
+
+    # The fields of the compact view of the list.
+    COMPACT = "compact"
+
+
+
+class FieldsParams:
+    """
+    This class is the fields asked for the items of a list (dependency).
+    """
+
+    def __init__(
+        self,
+        fields: str | None = Query(None, description="Champs à renvoyer, séparés par des virgules"),
+        view: ResponseView = Query(ResponseView.FULL),
+    ):
+        # This attribute is the fields asked, None if not given.
+        self.fields = fields
+
+        # This attribute is the view asked.
+        self.view = view
+
+    def names(self, available: Dict[str, object], compact: Sequence[str]) -> Optional[List[str]]:
+        """
+        This function returns the fields to read.
+
+        param : available - The columns of the list, by field.
+        param : compact - The fields of the compact view.
+        return : Return the fields (id first), or None for the full response.
+        """
+        if self.fields is None:
+            return list(compact) if self.view == ResponseView.COMPACT else None
+
+        names = [name.strip() for name in self.fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)} (available: {', '.join(available)})"
+            )
+        # L'id sert de curseur à la pagination : toujours présent
+        return ["id"] + [name for name in dict.fromkeys(names) if name != "id"]
+
+
+
+def columns(available: Dict[str, object], names: Sequence[str]) -> list:
+    """
+    This function returns the columns of fields, labelled by their name.
+
+    param : available - The columns of the list, by field.
+    param : names - The fields.
+    return : Return the columns.
+    """
+    return [available[name].label(name) for name in names]
@@ -1,43 +1,72 @@
 from ast import For
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db, get_read_db
 from app.api.deps import get_current_user, get_current_admin
+from app.api.pagination import PageParams, fetch_page
+from app.api.sparse import FieldsParams, columns
+from app.models.loaders import TEAM_COMPACT, TEAM_FIELDS, TEAM_OPTIONS
 from app.models.models import Match, Team
-from app.schemas.team import TeamRequest, TeamResponse, TeamsListResponse
+from app.models.statements import TEAMS, TEAMS_BY_POOL
+from app.schemas.team import TeamFieldsResponse, TeamRequest, TeamResponse, TeamsFieldsListResponse, TeamsListResponse
 
 router = APIRouter()
 
 
-@router.get("", response_model=TeamsListResponse)
-def list_teams(pool_id: int | None = Query(None), company: str | None = Query(None), db: Session = Depends(get_db), _: str = Depends(get_current_user)):
+async def load_team(db: AsyncSession, team_id: int) -> Team | None:
     """
-    This function gets all the teams.
+    This function loads a team with its players and pool.
+
+    param : db - The session of database.
+    param : team_id - The team's id.
+    return : Return the team, or None.
+    """
+    return await db.scalar(
+        select(Team)
+        .options(*TEAM_OPTIONS)
+        .where(Team.id == team_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+@router.get("", response_model=TeamsListResponse | TeamsFieldsListResponse, response_model_exclude_unset=True)
+async def list_teams(pool_id: int | None = Query(None), company: str | None = Query(None), page: PageParams = Depends(), fields: FieldsParams = Depends(), db: AsyncSession = Depends(get_read_db), _: str = Depends(get_current_user)):
+    """
+    This function gets the teams, a page at a time.
 
     param : pool_id - The team's pool id.
     param : company - The team's company name.
+    param : page - The pagination parameters.
+    param : fields - The fields asked, every field by default.
     param : db - The database.
     param : _ - The client.
-    return : Return all the teams.
+    return : Return the page of teams.
     """
-    teams = db.query(Team)
-
-    if pool_id is not None:
-        teams = teams.filter(Team.pool_id == pool_id)
+    teams = TEAMS_BY_POOL if pool_id is not None else TEAMS
 
     if company is not None:
-        teams = teams.filter(Team.company == company)
+        teams = teams.where(Team.company == company)
+
+    names = fields.names(TEAM_FIELDS, TEAM_COMPACT)
+    if names is not None:
+        # Colonnes demandées seulement : ni joueurs, ni poule
+        teams = await fetch_page(db, teams.with_only_columns(*columns(TEAM_FIELDS, names)), Team.id, page, {"pool_id": pool_id}, rows=True)
+        return TeamsFieldsListResponse(
+            teams=[TeamFieldsResponse(**row._mapping) for row in teams.items],
+            total=teams.total,
+            next_after=teams.next_after,
+        )
 
-    teams = teams.all()
+    teams = await fetch_page(db, teams, Team.id, page, {"pool_id": pool_id})
 
-    return TeamsListResponse(teams=teams, total=len(teams))
+    return TeamsListResponse(teams=teams.items, total=teams.total, next_after=teams.next_after)
 
 
 
 @router.get("/{team_id}", response_model=TeamResponse)
-def get_team(team_id: int, db: Session = Depends(get_db), _: str = Depends(get_current_user)):
+async def get_team(team_id: int, db: AsyncSession = Depends(get_read_db), _: str = Depends(get_current_user)):
     """
     This function gets a specific teams.
 
@@ -46,7 +75,7 @@ def get_team(team_id: int, db: Session = Depends(get_db), _: str = Depends(get_c
     param : _ - The client.
     return : Return the team.
     """
-    team = db.get(Team, team_id)
+    team = await load_team(db, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     return TeamResponse.model_validate(team)
@@ -54,7 +83,7 @@ def get_team(team_id: int, db: Session = Depends(get_db), _: str = Depends(get_c
 
 
 @router.post("", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
-def create_team(data: TeamRequest, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def create_team(data: TeamRequest, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function creates a teams.
 
@@ -65,14 +94,14 @@ def create_team(data: TeamRequest, db: Session = Depends(get_db), _: str = Depen
     """
     team = Team(**data.model_dump())
     db.add(team)
-    db.commit()
-    db.refresh(team)
+    await db.commit()
+    team = await load_team(db, team.id)
     return TeamResponse.model_validate(team)
 
 
 
 @router.put("/{team_id}", response_model=TeamResponse)
-def update_team(team_id: int, data: TeamRequest, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def update_team(team_id: int, data: TeamRequest, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function updates a teams.
 
@@ -82,24 +111,26 @@ def update_team(team_id: int, data: TeamRequest, db: Session = Depends(get_db),
     param : _ - The client.
     return : Return the team updated.
     """
-    query = db.query(Match).filter(or_(Match.team1_id == team_id, Match.team2_id == team_id)).first()
+    # Une équipe qui a joué ne change plus : match_participants reste exact
+    query = await db.scalar(select(Match).where(or_(Match.team1_id == team_id, Match.team2_id == team_id)).limit(1))
     if query is not None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The team had already played")
     
-    team = db.get(Team, team_id)
+    team = await db.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
     for key, value in data.model_dump().items():
         setattr(team, key, value)
 
-    db.commit()
+    await db.commit()
+    team = await load_team(db, team_id)
     return TeamResponse.model_validate(team)
 
 
 
 @router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_team(team_id: int, db: Session = Depends(get_db), _: str = Depends(get_current_admin)):
+async def delete_team(team_id: int, db: AsyncSession = Depends(get_async_db), _: str = Depends(get_current_admin)):
     """
     This function remove a team.
 
@@ -108,13 +139,13 @@ def delete_team(team_id: int, db: Session = Depends(get_db), _: str = Depends(ge
     param : _ - The client.
     return : Return no content
     """
-    query = db.query(Match).filter(or_(Match.team1_id == team_id, Match.team2_id == team_id)).first()
+    query = await db.scalar(select(Match).where(or_(Match.team1_id == team_id, Match.team2_id == team_id)).limit(1))
     if query is not None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The team had already played")
     
-    team = db.get(Team, team_id)
+    team = await db.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
-    db.delete(team)
-    db.commit()
+    await db.delete(team)
+    await db.commit()
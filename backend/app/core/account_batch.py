@@ -0,0 +1,178 @@
+# ============================================
+# FICHIER : backend/app/core/account_batch.py
+# ============================================
+
+import secrets
+import string
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.revocation import revocation_list
+from app.core.security import bulk_hasher, get_password_hash
+from app.models.models import Player, User
+
+
+@dataclass
+class TemporaryPassword:
+    """
+    This class is the temporary password given to a user.
+    """
+
+    # The user's id.
+    user_id: int
+
+    # The user's email.
+    email: str
+
+    # The password, shown only once.
+    temporary_password: str
+
+
+
+@dataclass
+class ResetReport:
+    """
+    This class is the report of a batch of password resets.
+    """
+
+    # The temporary passwords of the accounts reset (their chunk is committed).
+    accounts: List[TemporaryPassword] = field(default_factory=list)
+
+    # The ids of the accounts left unchanged (their chunk failed and was rolled back).
+    failed_user_ids: List[int] = field(default_factory=list)
+
+
+
+def generate_temp_password() -> str:
+    """Generate a random temporary password."""
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*()"
+    return "".join(secrets.choice(alphabet) for _ in range(16))
+
+
+
+def select_user_ids(
+    db: Session,
+    user_ids: Optional[List[int]] = None,
+    company: Optional[str] = None,
+    role: Optional[str] = None,
+    inactive_since: Optional[datetime] = None,
+    exclude_id: Optional[int] = None,
+) -> List[int]:
+    """
+    This function returns the ids of the users matching every criterion given.
+
+    param : db - The session of database.
+    param : user_ids - The ids allowed.
+    param : company - The company of the player.
+    param : role - The role of the user.
+    param : inactive_since - No login since this date (or never, if created before).
+    param : exclude_id - An id never selected (the admin doing the operation).
+    return : Return the ids, sorted.
+    """
+    query = select(User.id)
+    if user_ids is not None:
+        query = query.where(User.id.in_(user_ids))
+    if company is not None:
+        query = query.join(Player, Player.user_id == User.id).where(Player.company == company)
+    if role is not None:
+        query = query.where(User.role == role)
+    if inactive_since is not None:
+        query = query.where(or_(
+            User.last_login_at < inactive_since,
+            and_(User.last_login_at.is_(None), User.created_at < inactive_since),
+        ))
+    if exclude_id is not None:
+        query = query.where(User.id != exclude_id)
+    return list(db.scalars(query.order_by(User.id)))
+
+
+
+def reset_passwords(db: Session, user_ids: List[int]) -> ResetReport:
+    """
+    This function gives a temporary password to several users, one bulk update per chunk.
+    A chunk that fails is rolled back and reported; the passwords of the chunks committed are always returned.
+
+    param : db - The session of database.
+    param : user_ids - The ids of the users.
+    return : Return the temporary passwords and the ids left unchanged.
+    """
+    report = ResetReport()
+    for chunk in chunks(user_ids):
+        try:
+            users = db.execute(
+                select(User.id, User.email, User.token_version).where(User.id.in_(chunk)).order_by(User.id)
+            ).all()
+            passwords = [generate_temp_password() for _ in users]
+
+            # Le hachage de tout le lot est réparti entre les threads du pool
+            futures = [bulk_hasher.submit(get_password_hash, password) for password in passwords]
+            hashes = [future.result() for future in futures]
+
+            versions = {user.id: (user.token_version or 0) + 1 for user in users}
+            db.execute(update(User), [
+                {
+                    "id": user.id,
+                    "password_hash": password_hash,
+                    "must_change_password": True,
+                    "token_version": versions[user.id],
+                }
+                for user, password_hash in zip(users, hashes)
+            ])
+            revocation_list.revoke_user_ids(db, versions)
+            db.commit()
+        except Exception:
+            # Lot annulé : ses comptes gardent leur mot de passe, les lots déjà validés restent rendus
+            db.rollback()
+            report.failed_user_ids.extend(chunk)
+            continue
+
+        report.accounts.extend(
+            TemporaryPassword(user_id=user.id, email=user.email, temporary_password=password)
+            for user, password in zip(users, passwords)
+        )
+    return report
+
+
+
+def set_active(db: Session, user_ids: List[int], active: bool) -> List[int]:
+    """
+    This function activates or deactivates several users, one bulk update per chunk.
+    Deactivated users lose their tokens at once.
+
+    param : db - The session of database.
+    param : user_ids - The ids of the users.
+    param : active - The new state.
+    return : Return the ids of the users changed.
+    """
+    changed = []
+    for chunk in chunks(user_ids):
+        query = update(User).where(User.id.in_(chunk), User.is_active.isnot(active)).values(is_active=active)
+        if not active:
+            query = query.values(token_version=User.token_version + 1)
+        rows = db.execute(
+            query.returning(User.id, User.token_version),
+            execution_options={"synchronize_session": False},
+        ).all()
+        if not active:
+            revocation_list.revoke_user_ids(db, {row.id: row.token_version for row in rows})
+        db.commit()
+        changed.extend(sorted(row.id for row in rows))
+    return changed
+
+
+
+def chunks(user_ids: List[int]) -> Iterator[List[int]]:
+    """
+    This function splits the ids in chunks of admin_batch_chunk_size.
+
+    param : user_ids - The ids.
+    return : Yield the chunks.
+    """
+    size = settings.admin_batch_chunk_size
+    for start in range(0, len(user_ids), size):
+        yield user_ids[start:start + size]
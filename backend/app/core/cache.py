@@ -0,0 +1,181 @@
+# ============================================
+# FICHIER : backend/app/core/cache.py
+# ============================================
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    This class is the lightweight identity of an authenticated user.
+    """
+
+    # This is the user's id.
+    id: int
+
+    # This is the user's role. Only JOUEUR or ADMINISTRATEUR.
+    role: str
+
+    # This is if the user is active.
+    is_active: bool
+
+    # This is the id of the player linked to the user.
+    player_id: Optional[int] = None
+
+    # This is the id (jti) of the token used.
+    token_id: Optional[str] = None
+
+    # This is the version of the token used.
+    token_version: int = 0
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        """
+        This function builds a principal from a user entity.
+
+        param : user - The user.
+        return : Return the principal.
+        """
+        return cls(
+            id=user.id,
+            role=user.role,
+            is_active=bool(user.is_active),
+            player_id=user.player.id if user.player is not None else None,
+            token_version=user.token_version or 0,
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        """
+        This function builds a principal from the claims of a stateless token.
+
+        param : payload - The decoded token.
+        return : Return the principal.
+        """
+        return cls(
+            id=int(payload["sub"]),
+            role=payload["role"],
+            is_active=True,
+            player_id=payload.get("player_id"),
+            token_id=payload.get("jti"),
+            token_version=payload.get("ver", 0),
+        )
+
+
+
+class PrincipalCache:
+    """
+    This class is a bounded LRU cache of verified principals, keyed by token.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[Principal, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        """
+        This function returns the cached principal of a token.
+
+        param : token - The JWT.
+        return : Return the principal, or None if absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            principal, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(token)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return principal
+
+    def set(self, token: str, principal: Principal, token_exp: Optional[float] = None) -> None:
+        """
+        This function stores a principal. The TTL never goes beyond the token's expiration.
+
+        param : token - The JWT.
+        param : principal - The verified principal.
+        param : token_exp - The token's "exp" claim (timestamp).
+        """
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (principal, expires_at)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        This function removes every cached token of a user.
+
+        param : user_id - The user's id.
+        """
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self) -> None:
+        """
+        This function empties the cache and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        This function returns the counters of the cache.
+
+        return : Return the size, hits and misses.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, token: str) -> None:
+        principal, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(principal.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[principal.id]
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.principal_cache_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
@@ -0,0 +1,109 @@
+# ============================================
+# FICHIER : backend/app/core/calibration.py
+# ============================================
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+from app.core.security import build_password_context
+
+SAMPLE_PASSWORD = "Calibration@2025!"
+
+BCRYPT_ROUNDS = [10, 11, 12, 13, 14]
+
+# (memory_cost en KiB, time_cost) : du moins coûteux au plus coûteux
+ARGON2_PARAMS = [
+    (19456, 2),
+    (32768, 2),
+    (65536, 2),
+    (65536, 3),
+    (131072, 3),
+    (262144, 3),
+]
+
+
+@dataclass
+class Measure:
+    """
+    This class is the verify latency of a set of hashing parameters.
+    """
+
+    # The scheme (bcrypt or argon2).
+    scheme: str
+
+    # The parameters of the scheme.
+    params: Dict[str, int]
+
+    # The median verify latency, in milliseconds.
+    verify_ms: float
+
+
+
+def measure(scheme: str, params: Dict[str, int], samples: int = 5) -> Measure:
+    """
+    This function measures the median verify latency of a set of parameters.
+
+    param : scheme - The scheme.
+    param : params - The parameters given to build_password_context.
+    param : samples - The number of verify done.
+    return : Return the measure.
+    """
+    context = build_password_context(schemes=[scheme], **params)
+    hashed = context.hash(SAMPLE_PASSWORD)
+
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify(SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return Measure(scheme=scheme, params=params, verify_ms=timings[len(timings) // 2])
+
+
+
+def calibrate(target_ms: float, schemes: List[str], parallelism: int = 4, samples: int = 5) -> Dict[str, List[Measure]]:
+    """
+    This function benchmarks the candidates of each scheme on this host.
+
+    The candidates are tried from the cheapest; the search stops at the first
+    one above twice the target, the next ones being even slower.
+
+    param : target_ms - The wanted verify latency.
+    param : schemes - The schemes to benchmark.
+    param : parallelism - The argon2 parallelism.
+    param : samples - The number of verify per candidate.
+    return : Return the measures per scheme.
+    """
+    candidates = {
+        "bcrypt": [{"bcrypt_rounds": rounds} for rounds in BCRYPT_ROUNDS],
+        "argon2": [
+            {"argon2_memory_cost": memory, "argon2_time_cost": t, "argon2_parallelism": parallelism}
+            for memory, t in ARGON2_PARAMS
+        ],
+    }
+
+    results = {}
+    for scheme in schemes:
+        measures = []
+        for params in candidates[scheme]:
+            result = measure(scheme, params, samples)
+            measures.append(result)
+            if result.verify_ms > target_ms * 2:
+                break
+        results[scheme] = measures
+    return results
+
+
+
+def suggest(measures: List[Measure], target_ms: float) -> Measure:
+    """
+    This function picks the strongest parameters under the target, or the cheapest ones.
+
+    param : measures - The measures of a scheme, from the cheapest.
+    param : target_ms - The wanted verify latency.
+    return : Return the suggested measure.
+    """
+    under_target = [m for m in measures if m.verify_ms <= target_ms]
+    return under_target[-1] if under_target else measures[0]
@@ -1,12 +1,65 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
+import os
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./padel_corpo.db"
+    # Pilote asynchrone des routes async, déduit de database_url si vide (aiosqlite, asyncpg)
+    async_database_url: str = ""
+    # Réplique en lecture des routes GET (URL synchrone, pilote async déduit),
+    # database_url si vide. SQLite : même fichier ouvert en lecture seule
+    read_database_url: str = ""
+
+    # Pool de connexions des serveurs de base (PostgreSQL), ignoré par SQLite
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+
+    # Profil de performance SQLite (dev, test, prod) et surcharges "pragma=valeur,..."
+    sqlite_profile: str = "dev"
+    sqlite_pragmas: str = ""
     secret_key: str
     algorithm: str = "HS256"
-    access_token_expire_minutes: int = 1440
+    jwt_backend: str = "pyjwt"
+    access_token_expire_minutes: int = 5
+    refresh_token_expire_days: int = 14
     allowed_origins: str = "http://localhost:5173"
+
+    # Cache des utilisateurs authentifiés (get_current_user)
+    principal_cache_size: int = 1024
+    principal_cache_ttl_seconds: int = 300
+
+    # "stateful" relit l'utilisateur en base, "stateless" fait confiance aux claims du token
+    auth_mode: str = "stateless"
+    revocation_refresh_seconds: float = 1.0
+
+    # Protection anti-brute force : "database" partage les compteurs entre workers (login_attempts),
+    # "memory" les garde dans le worker (un seul processus, tests ; nombre d'emails borné)
+    login_attempts_backend: str = "database"
+    login_max_attempts: int = 5
+    login_attempt_window_minutes: int = 30
+    login_lockout_minutes: int = 30
+    login_attempts_flush_seconds: float = 10.0
+    login_attempts_max_entries: int = 100000
+
+    # Schémas de hachage acceptés, le premier sert aux nouveaux hashs (ex : "argon2,bcrypt")
+    password_schemes: str = "bcrypt"
+    bcrypt_rounds: int = 12
+    argon2_memory_cost: int = 65536
+    argon2_time_cost: int = 3
+    argon2_parallelism: int = 4
+
+    # Nombre de threads dédiés au hachage des mots de passe
+    password_hash_workers: int = 4
+
+    # Opérations en masse (import, réinitialisations) : threads de hachage dédiés et lignes par transaction
+    bulk_hash_workers: int = os.cpu_count() or 4
+    import_chunk_size: int = 500
+    admin_batch_chunk_size: int = 500
+
+    # Instrumentation SQL : une même requête répétée ce nombre de fois dans une requête HTTP signale un N+1
+    n_plus_one_threshold: int = 5
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,90 @@
+# ============================================
+# FICHIER : backend/app/core/hashing.py
+# ============================================
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    This class runs the password hashing in a dedicated bounded pool.
+
+    bcrypt releases the GIL, so a thread pool is enough to use several cores
+    while keeping the request threadpool free for the other endpoints.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.total_wait_ms = 0.0
+        self.total_run_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def submit(self, fn: Callable[..., T], *args):
+        """
+        This function queues a hashing job.
+
+        param : fn - The hashing function.
+        param : args - The arguments of the function.
+        return : Return the future of the job.
+        """
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+
+        def job():
+            started_at = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                return fn(*args)
+            finally:
+                finished_at = time.perf_counter()
+                wait_ms = (started_at - submitted_at) * 1000
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.total_wait_ms += wait_ms
+                    self.total_run_ms += (finished_at - started_at) * 1000
+                    self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+        return self._executor.submit(job)
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        This function runs a hashing job without blocking the event loop.
+
+        param : fn - The hashing function.
+        param : args - The arguments of the function.
+        return : Return the result of the function.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        """
+        This function returns the queue depth and latency of the pool.
+
+        return : Return the counters.
+        """
+        with self._lock:
+            completed = self.completed
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "in_flight": self.running,
+                "completed": completed,
+                "avg_wait_ms": round(self.total_wait_ms / completed, 3) if completed else 0.0,
+                "avg_run_ms": round(self.total_run_ms / completed, 3) if completed else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
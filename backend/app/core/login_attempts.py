@@ -0,0 +1,466 @@
+# ============================================
+# FICHIER : backend/app/core/login_attempts.py
+# ============================================
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, case, delete, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.standings import upsert
+from app.database import SessionLocal
+from app.models.models import LoginAttempt
+
+
+@dataclass
+class AttemptState:
+    """
+    This class is the lockout state of an email.
+    """
+
+    # The timestamps of the failures still in the window.
+    failures: List[float] = field(default_factory=list)
+
+    # When the account is unlocked (timestamp), if locked.
+    locked_until: Optional[float] = None
+
+    def is_locked(self, now: float) -> bool:
+        return self.locked_until is not None and self.locked_until > now
+
+    def is_expired(self, now: float, window: float) -> bool:
+        # Plus aucun échec dans la fenêtre ni verrouillage : l'état ne sert plus
+        return not self.is_locked(now) and all(t <= now - window for t in self.failures)
+
+
+
+@dataclass
+class AttemptChange:
+    """
+    This class is what a worker has not yet written to login_attempts for an email.
+    """
+
+    # When the failures were forgotten after a successful login, if they were.
+    reset_at: Optional[float] = None
+
+    # The timestamps of the failures recorded since the last write (after reset_at).
+    failures: List[float] = field(default_factory=list)
+
+    # When the account is unlocked (timestamp), if these failures locked it.
+    locked_until: Optional[float] = None
+
+    def merge(self, newer: "AttemptChange") -> "AttemptChange":
+        # Un succès plus récent rend caduc tout ce qui précède
+        if newer.reset_at is not None:
+            return newer
+        locks = [t for t in (self.locked_until, newer.locked_until) if t is not None]
+        return AttemptChange(self.reset_at, self.failures + newer.failures, max(locks) if locks else None)
+
+
+
+class AttemptBackend(ABC):
+    """
+    This class is the storage of the lockout states, shared or not between workers.
+    """
+
+    @abstractmethod
+    def get(self, email: str) -> Optional[AttemptState]:
+        """Return the state of an email, or None if it has no failure left."""
+
+    @abstractmethod
+    def record_failure(self, email: str, now: float, window: float, max_attempts: int, lockout: float) -> AttemptState:
+        """Add a failure in the sliding window and lock the email when needed."""
+
+    @abstractmethod
+    def reset(self, email: str) -> None:
+        """Forget the failures of an email after a successful login."""
+
+    def drain_dirty(self) -> Dict[str, AttemptChange]:
+        """Return the changes not yet written and forget them."""
+        return {}
+
+    def requeue(self, changes: Dict[str, AttemptChange]) -> None:
+        """Put back drained changes whose write failed, before the ones made since."""
+
+    def prune(self, now: float, window: float) -> int:
+        """Forget the states whose failures and lockout are over, return how many."""
+        return 0
+
+    def restore(self, email: str, state: AttemptState) -> None:
+        """Load a persisted state at startup."""
+
+    def clear(self) -> None:
+        """Forget every state."""
+
+
+
+class MemoryAttemptBackend(AttemptBackend):
+    """
+    This class keeps the states in the process. Enough for a single worker and the tests:
+    each worker only sees its own failures, login_attempts only serves restarts.
+
+    The map is bounded: the expired states are pruned at each persist, and past
+    max_entries the states are evicted (expired first, then the oldest unlocked).
+    Their changes not yet written are kept until the next persist.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._states: Dict[str, AttemptState] = {}
+        self._changes: Dict[str, AttemptChange] = {}
+        self._lock = threading.Lock()
+
+    def get(self, email: str) -> Optional[AttemptState]:
+        with self._lock:
+            state = self._states.get(email)
+            return AttemptState(list(state.failures), state.locked_until) if state else None
+
+    def record_failure(self, email: str, now: float, window: float, max_attempts: int, lockout: float) -> AttemptState:
+        with self._lock:
+            state = self._states.setdefault(email, AttemptState())
+            state.failures = [t for t in state.failures if t > now - window]
+            state.failures.append(now)
+            if len(state.failures) >= max_attempts:
+                state.locked_until = now + lockout
+            change = self._changes.setdefault(email, AttemptChange())
+            change.failures.append(now)
+            change.locked_until = state.locked_until
+            if len(self._states) > self.max_entries:
+                self._evict(now, window, keep=email)
+            return AttemptState(list(state.failures), state.locked_until)
+
+    def reset(self, email: str) -> None:
+        with self._lock:
+            # Aucun état : rien à écrire, c'est le cas de presque toutes les connexions
+            if self._states.pop(email, None) is not None:
+                self._changes[email] = AttemptChange(reset_at=time.time())
+
+    def drain_dirty(self) -> Dict[str, AttemptChange]:
+        with self._lock:
+            changes, self._changes = self._changes, {}
+            return changes
+
+    def requeue(self, changes: Dict[str, AttemptChange]) -> None:
+        with self._lock:
+            for email, change in changes.items():
+                newer = self._changes.get(email)
+                self._changes[email] = change.merge(newer) if newer is not None else change
+
+    def prune(self, now: float, window: float) -> int:
+        with self._lock:
+            return self._prune(now, window)
+
+    def restore(self, email: str, state: AttemptState) -> None:
+        with self._lock:
+            self._states[email] = state
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._changes.clear()
+
+    def _prune(self, now: float, window: float) -> int:
+        # Les lignes expirées de login_attempts sont supprimées par persist(), pour tous les workers
+        expired = [email for email, state in self._states.items() if state.is_expired(now, window)]
+        for email in expired:
+            del self._states[email]
+        return len(expired)
+
+    def _evict(self, now: float, window: float, keep: str) -> None:
+        if self._prune(now, window) and len(self._states) <= self.max_entries:
+            return
+        # Toujours plein (emails essayés en masse) : les plus anciens non verrouillés, par lot d'un dixième
+        target = self.max_entries - self.max_entries // 10
+        candidates = sorted(
+            (state.failures[-1], email)
+            for email, state in self._states.items()
+            if email != keep and not state.is_locked(now)
+        )
+        for _, email in candidates[:max(len(self._states) - target, 0)]:
+            del self._states[email]
+
+
+
+class DatabaseAttemptBackend(AttemptBackend):
+    """
+    This class keeps the states in login_attempts, shared by every worker.
+
+    Each failure is one atomic INSERT ... ON CONFLICT DO UPDATE that increments
+    the count and locks in the same statement, so concurrent workers never lose
+    a failure. The row keeps a count and the last failure: the window restarts
+    after window seconds without failure, instead of sliding failure by failure.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+
+    def get(self, email: str) -> Optional[AttemptState]:
+        with self.session_factory() as db:
+            row = db.execute(
+                select(LoginAttempt.attempts_count, LoginAttempt.last_attempt, LoginAttempt.locked_until)
+                .where(LoginAttempt.email == email)
+            ).first()
+        if row is None:
+            return None
+        # La fenêtre n'est connue que de l'appelant : l'état complet, filtré par is_locked / is_expired
+        return to_state(row, now=None, window=None)
+
+    def record_failure(self, email: str, now: float, window: float, max_attempts: int, lockout: float) -> AttemptState:
+        table = LoginAttempt.__table__
+        with self.session_factory() as db:
+            statement = upsert(db.get_bind().dialect.name)(table).values(
+                email=email,
+                attempts_count=1,
+                last_attempt=to_datetime(now),
+                locked_until=to_datetime(now + lockout) if max_attempts <= 1 else None,
+            )
+            # Valeurs d'avant la mise à jour : le compte repart de 1 hors de la fenêtre
+            count = case(
+                (table.c.last_attempt > to_datetime(now - window), table.c.attempts_count + 1),
+                else_=1,
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.email],
+                set_={
+                    "attempts_count": count,
+                    "last_attempt": statement.excluded.last_attempt,
+                    "locked_until": case(
+                        (count >= max_attempts, to_datetime(now + lockout)),
+                        else_=table.c.locked_until,
+                    ),
+                },
+            ).returning(table.c.attempts_count, table.c.last_attempt, table.c.locked_until)
+            row = db.execute(statement).one()
+            db.commit()
+        return to_state(row, now, window)
+
+    def reset(self, email: str) -> None:
+        with self.session_factory() as db:
+            db.execute(delete(LoginAttempt.__table__).where(LoginAttempt.email == email))
+            db.commit()
+
+    def clear(self) -> None:
+        with self.session_factory() as db:
+            db.execute(delete(LoginAttempt.__table__))
+            db.commit()
+
+
+
+class LoginAttemptTracker:
+    """
+    This class tracks the failed logins in a sliding window and locks the email after too many.
+
+    With the memory backend, persist() writes the changes to login_attempts in
+    one transaction, so a login never writes by itself. With the database
+    backend every failure is already written; persist() only deletes the
+    expired rows.
+    """
+
+    def __init__(self, backend: AttemptBackend, max_attempts: int, window_minutes: int, lockout_minutes: int):
+        self.backend = backend
+        self.max_attempts = max_attempts
+        self.window = window_minutes * 60
+        self.lockout = lockout_minutes * 60
+
+    def locked_until(self, email: str) -> Optional[float]:
+        """
+        This function returns when the email is unlocked, if it is locked.
+
+        param : email - The email used to log in.
+        return : Return the timestamp, or None.
+        """
+        state = self.backend.get(email)
+        if state is not None and state.is_locked(time.time()):
+            return state.locked_until
+        return None
+
+    def record_failure(self, email: str) -> AttemptState:
+        """
+        This function records a failed login.
+
+        param : email - The email used to log in.
+        return : Return the new state.
+        """
+        return self.backend.record_failure(email, time.time(), self.window, self.max_attempts, self.lockout)
+
+    def record_success(self, email: str) -> None:
+        """
+        This function forgets the failures after a successful login.
+
+        param : email - The email used to log in.
+        """
+        self.backend.reset(email)
+
+    def persist(self, db: Session) -> int:
+        """
+        This function writes the changes of the backend and deletes the expired rows, in one transaction.
+        Each email is an increment (or a delete bounded by the success), never an overwrite,
+        so the workers sharing login_attempts do not lose each other's failures.
+        If the transaction fails, the changes are put back for the next call.
+
+        param : db - The session of database.
+        return : Return the number of emails written.
+        """
+        now = time.time()
+        self.backend.prune(now, self.window)
+        changes = self.backend.drain_dirty()
+
+        try:
+            table = LoginAttempt.__table__
+            insert = upsert(db.get_bind().dialect.name)
+            for email, change in changes.items():
+                if change.reset_at is not None:
+                    # Les échecs écrits par les autres workers après ce succès restent comptés
+                    db.execute(delete(table).where(
+                        table.c.email == email, table.c.last_attempt <= to_datetime(change.reset_at),
+                    ))
+                if change.failures:
+                    db.execute(increment(
+                        insert, table, email, change, to_datetime(now - self.window), self.max_attempts, self.lockout,
+                    ))
+            db.execute(delete_expired(now, self.window))
+            db.commit()
+        except Exception:
+            db.rollback()
+            self.backend.requeue(changes)
+            raise
+        return len(changes)
+
+    def restore(self, db: Session) -> int:
+        """
+        This function loads the persisted states still relevant (startup).
+
+        param : db - The session of database.
+        return : Return the number of emails loaded.
+        """
+        now = time.time()
+        # Plus utiles : supprimées au lieu de rester indéfiniment
+        db.execute(delete_expired(now, self.window))
+        count = 0
+        for row in db.execute(
+            select(LoginAttempt.email, LoginAttempt.attempts_count, LoginAttempt.last_attempt, LoginAttempt.locked_until)
+        ):
+            self.backend.restore(row.email, to_state(row[1:], now, self.window))
+            count += 1
+        db.commit()
+        return count
+
+    def clear(self) -> None:
+        """
+        This function forgets every state.
+        """
+        self.backend.clear()
+
+
+
+def increment(insert, table, email: str, change: AttemptChange, cutoff: datetime, max_attempts: int, lockout: float):
+    """
+    This function builds the UPSERT adding the failures of a change to the row of an email.
+    The row is locked when the failures of all the workers together reach max_attempts.
+
+    param : insert - The insert function of the dialect.
+    param : table - The login_attempts table.
+    param : email - The email used to log in.
+    param : change - The failures not yet written.
+    param : cutoff - The start of the window: an older row starts again from these failures.
+    param : max_attempts - The number of failures that locks the email.
+    param : lockout - The length of the lockout in seconds.
+    return : Return the statement.
+    """
+    statement = insert(table).values(
+        email=email,
+        attempts_count=len(change.failures),
+        last_attempt=to_datetime(max(change.failures)),
+        locked_until=to_datetime(change.locked_until) if change.locked_until else None,
+    )
+    new = statement.excluded
+    count = case(
+        (table.c.last_attempt > cutoff, table.c.attempts_count + new.attempts_count),
+        else_=new.attempts_count,
+    )
+    lock_at = to_datetime(max(change.failures) + lockout)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.email],
+        set_={
+            "attempts_count": count,
+            "last_attempt": case(
+                (or_(table.c.last_attempt.is_(None), new.last_attempt > table.c.last_attempt), new.last_attempt),
+                else_=table.c.last_attempt,
+            ),
+            "locked_until": case(
+                (and_(
+                    new.locked_until.is_not(None),
+                    or_(table.c.locked_until.is_(None), new.locked_until > table.c.locked_until),
+                ), new.locked_until),
+                (and_(
+                    count >= max_attempts,
+                    or_(table.c.locked_until.is_(None), table.c.locked_until < lock_at),
+                ), lock_at),
+                else_=table.c.locked_until,
+            ),
+        },
+    )
+
+def delete_expired(now: float, window: float):
+    """
+    This function builds the DELETE of the rows without failure in the window nor lockout.
+
+    param : now - The current timestamp.
+    param : window - The length of the window in seconds.
+    return : Return the statement.
+    """
+    # Table et non entité : aucune synchronisation avec les objets chargés dans la session
+    table = LoginAttempt.__table__
+    return delete(table).where(
+        or_(table.c.last_attempt.is_(None), table.c.last_attempt <= to_datetime(now - window)),
+        or_(table.c.locked_until.is_(None), table.c.locked_until <= to_datetime(now)),
+    )
+
+def to_state(row, now: Optional[float], window: Optional[float]) -> AttemptState:
+    """
+    This function builds a state from (attempts_count, last_attempt, locked_until).
+    The count is kept as that many failures at the last one, none outside the window.
+
+    param : row - The values of a login_attempts row.
+    param : now - The current timestamp, None to keep the count whatever its age.
+    param : window - The length of the window in seconds.
+    return : Return the state.
+    """
+    count, last_attempt, locked_until = row
+    last_attempt = to_timestamp(last_attempt)
+    recent = last_attempt is not None and (now is None or last_attempt > now - window)
+    return AttemptState([last_attempt] * (count or 0) if recent else [], to_timestamp(locked_until))
+
+def to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+def to_timestamp(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    # SQLite renvoie des dates naïves : elles sont stockées en UTC
+    return (value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)).timestamp()
+
+def build_backend(name: str) -> AttemptBackend:
+    """
+    This function builds the backend chosen by LOGIN_ATTEMPTS_BACKEND.
+
+    param : name - "database" (shared by the workers) or "memory" (single process).
+    return : Return the backend.
+    """
+    if name == "database":
+        return DatabaseAttemptBackend(SessionLocal)
+    if name == "memory":
+        return MemoryAttemptBackend(max_entries=settings.login_attempts_max_entries)
+    raise ValueError(f"LOGIN_ATTEMPTS_BACKEND inconnu : {name}")
+
+login_attempts = LoginAttemptTracker(
+    backend=build_backend(settings.login_attempts_backend),
+    max_attempts=settings.login_max_attempts,
+    window_minutes=settings.login_attempt_window_minutes,
+    lockout_minutes=settings.login_lockout_minutes,
+)
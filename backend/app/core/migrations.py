@@ -0,0 +1,177 @@
+# ============================================
+# FICHIER : backend/app/core/migrations.py
+# ============================================
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+
+# Journal d'uvicorn : l'alerte apparaît avec les autres messages de démarrage
+logger = logging.getLogger("uvicorn.error")
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Révision du schéma d'origine, créé par l'ancien create_all au démarrage
+BASELINE_REVISION = "0001"
+
+
+def alembic_config(url: Optional[str] = None) -> Config:
+    """
+    This function builds the Alembic configuration of the backend.
+
+    param : url - The database to migrate, DATABASE_URL by default.
+    return : Return the configuration.
+    """
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    # configparser interprète les % (mots de passe encodés dans l'URL)
+    config.set_main_option("sqlalchemy.url", (url or settings.database_url).replace("%", "%%"))
+    return config
+
+
+
+def head_revision() -> str:
+    """
+    This function returns the latest revision of the migrations.
+
+    return : Return the revision.
+    """
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """
+    This function returns the revision of a database, without any DDL.
+
+    param : connection - The connection to the database.
+    return : Return the revision, or None if the database was never migrated.
+    """
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+
+def table_columns(connection: Connection) -> Dict[str, Set[str]]:
+    """
+    This function returns the columns of every table of a database.
+
+    param : connection - The connection to the database.
+    return : Return the columns, by table.
+    """
+    inspector = inspect(connection)
+    return {
+        table: {column["name"] for column in inspector.get_columns(table)}
+        for table in inspector.get_table_names()
+        if table != "alembic_version"
+    }
+
+
+
+def revision_schema(revision: str) -> Dict[str, Set[str]]:
+    """
+    This function returns the tables and columns of a revision, built in an in-memory database.
+
+    param : revision - The revision.
+    return : Return the columns, by table.
+    """
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        config = alembic_config("sqlite://")
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+        schema = table_columns(connection)
+    engine.dispose()
+    return schema
+
+
+
+def missing_from(expected: Dict[str, Set[str]], actual: Dict[str, Set[str]]) -> List[str]:
+    """
+    This function compares two schemas.
+
+    param : expected - The columns expected, by table.
+    param : actual - The columns of the database, by table.
+    return : Return the tables and columns missing, empty if every one is there.
+    """
+    missing = []
+    for table, columns in sorted(expected.items()):
+        if table not in actual:
+            missing.append(table)
+        else:
+            missing.extend(f"{table}.{column}" for column in sorted(columns - actual[table]))
+    return missing
+
+
+
+def baseline_differences(connection: Connection) -> List[str]:
+    """
+    This function compares a database created without migrations to the baseline revision.
+
+    param : connection - The connection to the database.
+    return : Return the tables and columns missing, empty if the database can be marked at the baseline.
+    """
+    return missing_from(revision_schema(BASELINE_REVISION), table_columns(connection))
+
+
+
+def upgrade(url: Optional[str] = None, revision: str = "head") -> Optional[str]:
+    """
+    This function applies the migrations up to a revision.
+    A database created by the old create_all is first marked at the baseline, without DDL.
+
+    param : url - The database to migrate, DATABASE_URL by default.
+    param : revision - The revision to reach.
+    return : Return the revision before the upgrade.
+    """
+    config = alembic_config(url)
+    engine = create_engine(url or settings.database_url, poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            previous = current_revision(connection)
+            legacy = previous is None and "users" in inspect(connection).get_table_names()
+            missing = baseline_differences(connection) if legacy else []
+    finally:
+        engine.dispose()
+
+    if legacy:
+        if missing:
+            raise RuntimeError(
+                f"The database was created without migrations and lacks {', '.join(missing)}: "
+                f"upgrade it by hand then run `alembic stamp {BASELINE_REVISION}`"
+            )
+        command.stamp(config, BASELINE_REVISION)
+
+    command.upgrade(config, revision)
+    return previous
+
+
+
+def check_schema(engine: Engine) -> bool:
+    """
+    This function checks the revision of the database at startup, without any DDL.
+    A database never migrated stops the startup; another revision only logs a warning
+    (a worker still running while the migrations of the next version are applied).
+
+    param : engine - The engine.
+    return : Return True if the database is at the latest revision.
+    """
+    with engine.connect() as connection:
+        current = current_revision(connection)
+    if current is None:
+        raise RuntimeError("The database has no schema revision: run `python manage.py migrate`")
+
+    head = head_revision()
+    if current != head:
+        logger.warning("Database at revision %s, expected %s: run `python manage.py migrate`", current, head)
+        return False
+    return True
@@ -0,0 +1,66 @@
+# ============================================
+# FICHIER : backend/app/core/participants.py
+# ============================================
+
+# Table match_participants : les joueurs de chaque match, recopiés depuis ses
+# équipes dans la transaction de chaque écriture de match. Les requêtes d'un
+# joueur (ses matchs, ses événements, ses résultats) lisent l'index
+# (player_id, match_id) au lieu de joindre les équipes avec des OR.
+# Une équipe qui a joué ne peut plus être modifiée : seules les écritures de
+# matchs changent la table, la suppression d'un match l'efface en cascade.
+
+from typing import Iterable, List
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.models import MatchParticipant
+from app.models.statements import PARTICIPANTS_FROM_MATCHES, PARTICIPANTS_OF_MATCHES
+
+# Colonnes remplies par les statements des participants, dans leur ordre
+COLUMNS = ("match_id", "player_id", "team_id", "side")
+
+
+
+async def refresh_participants(db: AsyncSession, match_ids: Iterable[int]) -> None:
+    """
+    This function recopies the players of matches into match_participants, in the transaction of the session.
+    The matches must be flushed: the teams are read from the database.
+
+    param : db - The session of database.
+    param : match_ids - The ids of the matches created or updated.
+    """
+    match_ids = list(match_ids)
+    if not match_ids:
+        return
+
+    table = MatchParticipant.__table__
+    await db.execute(delete(table).where(table.c.match_id.in_(match_ids)))
+    await db.execute(
+        insert(table).from_select(COLUMNS, PARTICIPANTS_OF_MATCHES),
+        {"match_ids": match_ids},
+    )
+
+
+
+def rebuild_participants(db: Session, apply: bool = True) -> List[int]:
+    """
+    This function recomputes match_participants from the teams of every match and compares it to the live table.
+    The table is replaced in one transaction; matches written during the rebuild may be missed.
+
+    param : db - The session of database.
+    param : apply - False to only compare.
+    return : Return the ids of the matches whose live participants differ, empty if the table is right.
+    """
+    table = MatchParticipant.__table__
+    expected = {tuple(row) for row in db.execute(PARTICIPANTS_FROM_MATCHES)}
+    live = {tuple(row) for row in db.execute(select(*(table.c[name] for name in COLUMNS)))}
+
+    differences = sorted({row[0] for row in expected ^ live})
+
+    if apply and differences:
+        db.execute(delete(table))
+        db.execute(insert(table).from_select(COLUMNS, PARTICIPANTS_FROM_MATCHES))
+        db.commit()
+    return differences
@@ -0,0 +1,276 @@
+# ============================================
+# FICHIER : backend/app/core/player_import.py
+# ============================================
+
+import csv
+import json
+import re
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import bulk_hasher, get_password_hash
+from app.models.models import Player, User
+from app.schemas.player import PlayerRequest
+
+# Même règle que la contrainte chk_license_format, vérifiée avant l'insertion
+LICENSE_PATTERN = re.compile(r"^L[0-9]{6}$")
+
+OPTIONAL_FIELDS = ("birth_date", "photo_url")
+
+
+@dataclass
+class RowError:
+    """
+    This class is the error of a row.
+    """
+
+    # The row number in the file (1 is the first data row).
+    row: int
+
+    # The message.
+    message: str
+
+    # The email of the row, if readable.
+    email: Optional[str] = None
+
+
+
+@dataclass
+class ImportReport:
+    """
+    This class is the report of an import.
+    """
+
+    # The number of players created.
+    created: int = 0
+
+    # The rows refused.
+    errors: List[RowError] = field(default_factory=list)
+
+
+
+def read_rows(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    This function streams the rows of a CSV or NDJSON file.
+
+    param : lines - The lines of the file.
+    param : fmt - "csv" or "ndjson".
+    return : Yield (row number, row, parsing error).
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        number = 0
+        while True:
+            number += 1
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                # Champ trop long, guillemets mal fermés : la suite du fichier n'est plus lisible
+                yield number, None, f"Invalid CSV: {exc}"
+                return
+            yield number, row, None
+
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Invalid JSON: object expected"
+            continue
+        yield number, row, None
+
+
+
+def import_players(db: Session, lines: Iterable[str], fmt: str, chunk_size: Optional[int] = None) -> ImportReport:
+    """
+    This function imports players chunk by chunk: validation, set-based uniqueness
+    checks, parallel hashing and one insert per table per chunk.
+
+    param : db - The session of database.
+    param : lines - The lines of the file.
+    param : fmt - "csv" or "ndjson".
+    param : chunk_size - The number of rows per transaction.
+    return : Return the report.
+    """
+    report = ImportReport()
+    seen_emails = set()
+    seen_licenses = set()
+    rows = read_rows(lines, fmt)
+    chunk_size = chunk_size or settings.import_chunk_size
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return report
+
+        valid = []
+        for number, row, error in chunk:
+            if error is not None:
+                report.errors.append(RowError(row=number, message=error))
+                continue
+            data = validate_row(number, row, report)
+            if data is None:
+                continue
+            if data.email in seen_emails:
+                report.errors.append(RowError(row=number, email=data.email, message="Duplicate email in file"))
+                continue
+            if data.license_number in seen_licenses:
+                report.errors.append(RowError(row=number, email=data.email, message="Duplicate license in file"))
+                continue
+            seen_emails.add(data.email)
+            seen_licenses.add(data.license_number)
+            valid.append((number, data))
+
+        valid = drop_existing(db, valid, report)
+        if valid:
+            insert_chunk(db, valid, report)
+
+
+
+def validate_row(number: int, row: dict, report: ImportReport) -> Optional[PlayerRequest]:
+    """
+    This function validates a row with PlayerRequest.
+
+    param : number - The row number.
+    param : row - The raw row.
+    param : report - The report to complete.
+    return : Return the request, or None if invalid.
+    """
+    row = {key.strip(): value for key, value in row.items() if key is not None}
+    for name in OPTIONAL_FIELDS:
+        if row.get(name) == "":
+            row[name] = None
+
+    try:
+        data = PlayerRequest.model_validate(row)
+    except ValidationError as exc:
+        first = exc.errors()[0]
+        location = ".".join(str(part) for part in first["loc"])
+        # Valeur brute d'une ligne NDJSON : l'email n'est rapporté que s'il est une chaîne
+        email = row.get("email") if isinstance(row.get("email"), str) else None
+        report.errors.append(RowError(row=number, email=email, message=f"{location}: {first['msg']}"))
+        return None
+
+    if not LICENSE_PATTERN.match(data.license_number):
+        report.errors.append(RowError(row=number, email=data.email, message="license_number: expected L + 6 digits"))
+        return None
+
+    return data
+
+
+
+def drop_existing(db: Session, valid: List[Tuple[int, PlayerRequest]], report: ImportReport) -> List[Tuple[int, PlayerRequest]]:
+    """
+    This function removes the rows whose email or license already exists, in two queries.
+
+    param : db - The session of database.
+    param : valid - The valid rows of the chunk.
+    param : report - The report to complete.
+    return : Return the rows to insert.
+    """
+    if not valid:
+        return valid
+
+    emails = set(db.scalars(select(User.email).where(User.email.in_([d.email for _, d in valid]))))
+    licenses = set(db.scalars(
+        select(Player.license_number).where(Player.license_number.in_([d.license_number for _, d in valid]))
+    ))
+
+    kept = []
+    for number, data in valid:
+        if data.email in emails:
+            report.errors.append(RowError(row=number, email=data.email, message="Email already exists"))
+        elif data.license_number in licenses:
+            report.errors.append(RowError(row=number, email=data.email, message="License already exists"))
+        else:
+            kept.append((number, data))
+    return kept
+
+
+
+def insert_chunk(db: Session, valid: List[Tuple[int, PlayerRequest]], report: ImportReport) -> None:
+    """
+    This function hashes the passwords in parallel and inserts the chunk in one transaction.
+
+    param : db - The session of database.
+    param : valid - The rows to insert.
+    param : report - The report to complete.
+    """
+    futures = [bulk_hasher.submit(get_password_hash, data.password) for _, data in valid]
+    hashes = [future.result() for future in futures]
+
+    try:
+        user_ids = db.scalars(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [
+                {"email": data.email, "password_hash": password_hash, "role": data.role.value}
+                for (_, data), password_hash in zip(valid, hashes)
+            ],
+        ).all()
+        db.execute(insert(Player), [player_values(data, user_id) for (_, data), user_id in zip(valid, user_ids)])
+        db.commit()
+        report.created += len(valid)
+    except IntegrityError:
+        db.rollback()
+        # Une ligne invalide ne doit pas faire échouer tout le lot : on isole la fautive
+        for (number, data), password_hash in zip(valid, hashes):
+            insert_one(db, number, data, password_hash, report)
+
+
+
+def insert_one(db: Session, number: int, data: PlayerRequest, password_hash: str, report: ImportReport) -> None:
+    """
+    This function inserts a single row, after a failed chunk.
+
+    param : db - The session of database.
+    param : number - The row number.
+    param : data - The row.
+    param : password_hash - The hash of the password.
+    param : report - The report to complete.
+    """
+    try:
+        user_id = db.scalar(
+            insert(User).returning(User.id),
+            {"email": data.email, "password_hash": password_hash, "role": data.role.value},
+        )
+        db.execute(insert(Player), [player_values(data, user_id)])
+        db.commit()
+        report.created += 1
+    except IntegrityError as exc:
+        db.rollback()
+        report.errors.append(RowError(row=number, email=data.email, message=f"Database error: {exc.orig}"))
+
+
+
+def player_values(data: PlayerRequest, user_id: int) -> dict:
+    """
+    This function returns the values of the player row.
+
+    param : data - The row.
+    param : user_id - The id of the user created.
+    return : Return the values.
+    """
+    return {
+        "first_name": data.first_name,
+        "last_name": data.last_name,
+        "company": data.company,
+        "license_number": data.license_number,
+        "birth_date": data.birth_date,
+        "photo_url": data.photo_url,
+        "user_id": user_id,
+    }
@@ -0,0 +1,161 @@
+# ============================================
+# FICHIER : backend/app/core/query_stats.py
+# ============================================
+
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+# Journal d'uvicorn : les alertes N+1 apparaissent avec les logs d'accès
+logger = logging.getLogger("uvicorn.error")
+
+
+@dataclass
+class RequestQueries:
+    """
+    This class is the SQL statements issued while serving one request.
+    """
+
+    # This is the number of statements executed.
+    count: int = 0
+
+    # This is the total time spent in the database, in seconds.
+    duration: float = 0.0
+
+    # This is the number of executions of each statement (the SQL text, parameters excluded).
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float) -> None:
+        """
+        This function records one statement.
+
+        param : statement - The SQL text.
+        param : duration - The execution time, in seconds.
+        """
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        This function returns the statements executed at least `threshold` times : the sign of an N+1.
+
+        param : threshold - The number of executions, n_plus_one_threshold by default.
+        return : Return the statements and their count, most frequent first.
+        """
+        threshold = threshold or settings.n_plus_one_threshold
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+# Statements de la requête en cours. Copiée dans le threadpool et les greenlets d'AsyncSession :
+# l'objet est partagé, les routes sync et async y écrivent toutes les deux
+current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[RequestQueries]:
+    """
+    This function records the statements executed in the block, by the instrumented engines.
+
+    return : Yield the statements recorded.
+    """
+    queries = RequestQueries()
+    token = current_queries.set(queries)
+    try:
+        yield queries
+    finally:
+        current_queries.reset(token)
+
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    This function times every statement of an engine, for the request being served.
+
+    param : engine - The engine (sync_engine for an AsyncEngine).
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(connection, cursor, statement, parameters, context, executemany):
+        started = connection.info["query_start"].pop()
+        queries = current_queries.get()
+        if queries is not None:
+            queries.record(statement, time.perf_counter() - started)
+
+
+
+class QueryMetrics:
+    """
+    This class is the SQL counters of the API, per route.
+    """
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self.n_plus_one = 0
+
+    def record(self, route: str, queries: RequestQueries) -> None:
+        """
+        This function adds the statements of a request, and logs a warning on an N+1 pattern.
+
+        param : route - The method and path template, as "GET /api/v1/matches".
+        param : queries - The statements of the request.
+        """
+        repeated = queries.repeated()
+        with self._lock:
+            counters = self._routes.setdefault(
+                route, {"requests": 0, "queries": 0, "max_queries": 0, "db_time_ms": 0.0}
+            )
+            counters["requests"] += 1
+            counters["queries"] += queries.count
+            counters["max_queries"] = max(counters["max_queries"], queries.count)
+            counters["db_time_ms"] += queries.duration * 1000
+            if repeated:
+                self.n_plus_one += 1
+
+        for shape, count in repeated:
+            logger.warning("Possible N+1 on %s: %d x %s", route, count, " ".join(shape.split())[:200])
+
+    def clear(self) -> None:
+        """
+        This function resets the counters.
+        """
+        with self._lock:
+            self._routes.clear()
+            self.n_plus_one = 0
+
+    def stats(self) -> dict:
+        """
+        This function returns the counters, with the average per request.
+
+        return : Return the counters of each route and the number of N+1 detected.
+        """
+        with self._lock:
+            return {
+                "n_plus_one": self.n_plus_one,
+                "routes": {
+                    route: {
+                        "requests": counters["requests"],
+                        "avg_queries": round(counters["queries"] / counters["requests"], 2),
+                        "max_queries": counters["max_queries"],
+                        "avg_db_time_ms": round(counters["db_time_ms"] / counters["requests"], 3),
+                    }
+                    for route, counters in sorted(self._routes.items())
+                },
+            }
+
+
+query_metrics = QueryMetrics()
@@ -0,0 +1,231 @@
+# ============================================
+# FICHIER : backend/app/core/revocation.py
+# ============================================
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import Principal, principal_cache
+from app.core.config import settings
+from app.models.models import RefreshToken, TokenRevocation, User
+
+
+# Clé de Session.info : révocations écrites dans la transaction en cours, pas encore validées
+PENDING_KEY = "pending_revocations"
+
+
+class RevocationList:
+    """
+    This class is the in-memory view of the token_revocations table.
+
+    Revocations made by this process are applied once their transaction is
+    committed; the ones made by the other workers are read incrementally
+    (id > last id seen) at most every refresh_seconds, so checking a token
+    never needs a query.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._revoked_jtis: Dict[str, float] = {}
+        self._min_versions: Dict[int, Tuple[int, float]] = {}
+        self._last_id = 0
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def is_revoked(self, principal: Principal) -> bool:
+        """
+        This function checks if the token of a principal is revoked.
+
+        param : principal - The principal built from the token.
+        return : Return True if the token must be refused.
+        """
+        with self._lock:
+            if principal.token_id is not None and principal.token_id in self._revoked_jtis:
+                return True
+            entry = self._min_versions.get(principal.id)
+            return entry is not None and principal.token_version < entry[0]
+
+    def is_stale(self) -> bool:
+        """
+        This function checks if the revocations of the other workers must be read again.
+
+        return : Return True if the last refresh is older than refresh_seconds.
+        """
+        return time.time() - self._last_refresh >= self.refresh_seconds
+
+    def refresh(self, db: Session) -> None:
+        """
+        This function reads the revocations added since the last refresh.
+
+        param : db - The session of database.
+        """
+        now = time.time()
+        if now - self._last_refresh < self.refresh_seconds:
+            return
+        self._last_refresh = now
+
+        rows = (
+            db.query(TokenRevocation)
+            .filter(TokenRevocation.id > self._last_id)
+            .order_by(TokenRevocation.id)
+            .all()
+        )
+        with self._lock:
+            for row in rows:
+                self._apply(row.user_id, row.jti, row.token_version, row.expires_at)
+                self._last_id = max(self._last_id, row.id)
+            self._prune(now)
+
+    def revoke_token(self, db: Session, user_id: int, jti: str) -> None:
+        """
+        This function revokes a single token (logout). Applied in memory once the caller commits.
+
+        param : db - The session of database.
+        param : user_id - The owner of the token.
+        param : jti - The id of the token.
+        """
+        row = TokenRevocation(user_id=user_id, jti=jti, expires_at=self._expiration())
+        db.add(row)
+        self._stage(db, [row])
+
+    def revoke_user(self, db: Session, user: User) -> None:
+        """
+        This function revokes every token of a user by bumping its token version. Applied in memory once the caller commits.
+
+        param : db - The session of database.
+        param : user - The user.
+        """
+        user.token_version = (user.token_version or 0) + 1
+        self.revoke_user_id(db, user.id, user.token_version)
+
+    def revoke_user_id(self, db: Session, user_id: int, token_version: int) -> None:
+        """
+        This function revokes the tokens of a user below a version. Applied in memory once the caller commits.
+
+        param : db - The session of database.
+        param : user_id - The user's id.
+        param : token_version - The minimal version still valid.
+        """
+        self.revoke_user_ids(db, {user_id: token_version})
+
+    def revoke_user_ids(self, db: Session, versions: Dict[int, int]) -> None:
+        """
+        This function revokes the tokens of several users at once (batch operations). Applied in memory once the caller commits.
+
+        param : db - The session of database.
+        param : versions - The minimal version still valid, by user's id.
+        """
+        if not versions:
+            return
+
+        now = datetime.now(timezone.utc)
+        expires_at = self._expiration()
+        rows = [
+            TokenRevocation(user_id=user_id, token_version=token_version, expires_at=expires_at)
+            for user_id, token_version in versions.items()
+        ]
+        db.add_all(rows)
+        db.query(TokenRevocation).filter(TokenRevocation.expires_at < now).delete(synchronize_session=False)
+        db.query(RefreshToken).filter(
+            RefreshToken.user_id.in_(versions),
+            RefreshToken.revoked_at.is_(None),
+        ).update({RefreshToken.revoked_at: now})
+        self._stage(db, rows)
+
+    def apply_committed(self, db: Session) -> None:
+        """
+        This function applies the revocations of a session once its transaction is committed.
+
+        param : db - The session of database.
+        """
+        pending = db.info.pop(PENDING_KEY, [])
+        if not pending:
+            return
+        with self._lock:
+            for revocation in pending:
+                self._apply(*revocation)
+        # Version minimale changée : le principal en cache porte l'ancienne
+        for user_id in {user_id for user_id, _, token_version, _ in pending if token_version is not None}:
+            principal_cache.invalidate_user(user_id)
+
+    def clear(self) -> None:
+        """
+        This function forgets every revocation.
+        """
+        with self._lock:
+            self._revoked_jtis.clear()
+            self._min_versions.clear()
+            self._last_id = 0
+            self._last_refresh = 0.0
+
+    def stats(self) -> dict:
+        """
+        This function returns the size of the revocation list.
+
+        return : Return the counters.
+        """
+        with self._lock:
+            return {
+                "revoked_tokens": len(self._revoked_jtis),
+                "revoked_users": len(self._min_versions),
+                "last_id": self._last_id,
+            }
+
+    @staticmethod
+    def _stage(db: Session, rows: List[TokenRevocation]) -> None:
+        # Copie des valeurs : appliquées après le commit, oubliées au rollback
+        db.info.setdefault(PENDING_KEY, []).extend(
+            (row.user_id, row.jti, row.token_version, row.expires_at) for row in rows
+        )
+
+    def _apply(self, user_id: int, jti, token_version, expires_at: datetime) -> None:
+        expires_at = expires_at.replace(tzinfo=expires_at.tzinfo or timezone.utc).timestamp()
+        if jti is not None:
+            self._revoked_jtis[jti] = expires_at
+        if token_version is not None:
+            current = self._min_versions.get(user_id)
+            if current is None or current[0] < token_version:
+                self._min_versions[user_id] = (token_version, expires_at)
+
+    def _prune(self, now: float) -> None:
+        for jti, expires_at in list(self._revoked_jtis.items()):
+            if expires_at <= now:
+                del self._revoked_jtis[jti]
+        for user_id, (_, expires_at) in list(self._min_versions.items()):
+            if expires_at <= now:
+                del self._min_versions[user_id]
+
+    @staticmethod
+    def _expiration() -> datetime:
+        # Au-delà, tous les tokens concernés sont expirés
+        return datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
+
+
+revocation_list = RevocationList(refresh_seconds=settings.revocation_refresh_seconds)
+
+
+@event.listens_for(Session, "after_commit")
+def apply_committed_revocations(db: Session) -> None:
+    """
+    This function applies the revocations of a session to the in-memory list after its commit.
+
+    param : db - The session of database.
+    """
+    revocation_list.apply_committed(db)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def drop_uncommitted_revocations(db: Session, transaction) -> None:
+    """
+    This function forgets the revocations of a transaction rolled back (or never committed).
+
+    param : db - The session of database.
+    param : transaction - The transaction ended.
+    """
+    if transaction.parent is None:
+        db.info.pop(PENDING_KEY, None)
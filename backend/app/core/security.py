@@ -1,10 +1,45 @@
+import hashlib
+import secrets
+import uuid
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Dict, List, Optional, Type
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.hashing import PasswordHasher
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def build_password_context(
+    schemes: Optional[List[str]] = None,
+    bcrypt_rounds: Optional[int] = None,
+    argon2_memory_cost: Optional[int] = None,
+    argon2_time_cost: Optional[int] = None,
+    argon2_parallelism: Optional[int] = None,
+) -> CryptContext:
+    """Construit le contexte de hachage ; un hash d'un autre schéma ou d'un autre coût est à mettre à jour"""
+    if schemes is None:
+        schemes = [scheme.strip() for scheme in settings.password_schemes.split(",") if scheme.strip()]
+    # passlib nomme "argon2" le schéma, la variante argon2id est imposée par argon2__type
+    schemes = ["argon2" if scheme == "argon2id" else scheme for scheme in schemes]
+    rounds = bcrypt_rounds or settings.bcrypt_rounds
+
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+        argon2__type="ID",
+        argon2__memory_cost=argon2_memory_cost or settings.argon2_memory_cost,
+        argon2__time_cost=argon2_time_cost or settings.argon2_time_cost,
+        argon2__parallelism=argon2_parallelism or settings.argon2_parallelism,
+    )
+
+pwd_context = build_password_context()
+
+password_hasher = PasswordHasher(max_workers=settings.password_hash_workers)
+
+# Pool réservé aux opérations en masse, pour ne pas retarder les connexions servies par l'API
+bulk_hasher = PasswordHasher(max_workers=settings.bulk_hash_workers)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Vérifie si le mot de passe correspond au hash"""
@@ -14,6 +49,96 @@ def get_password_hash(password: str) -> str:
     """Hash un mot de passe"""
     return pwd_context.hash(password)
 
+def needs_rehash(hashed_password: str) -> bool:
+    """Indique si le hash utilise un schéma ou des paramètres obsolètes"""
+    return pwd_context.needs_update(hashed_password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Vérifie le mot de passe dans le pool de hachage, sans bloquer l'API"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash un mot de passe dans le pool de hachage, sans bloquer l'API"""
+    return await password_hasher.run(get_password_hash, password)
+
+class TokenError(Exception):
+    """Token JWT invalide, expiré ou mal signé"""
+
+
+class JWTBackend(ABC):
+    """Interface minimale d'une bibliothèque JWT"""
+
+    name: str
+
+    def __init__(self, secret_key: str, algorithm: str):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    @abstractmethod
+    def encode(self, claims: dict) -> str:
+        """Signe les claims"""
+
+    @abstractmethod
+    def decode(self, token: str) -> dict:
+        """Vérifie la signature et l'expiration, lève TokenError sinon"""
+
+
+class JoseBackend(JWTBackend):
+    """Backend python-jose"""
+
+    name = "jose"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        super().__init__(secret_key, algorithm)
+        from jose import JWTError, jwt
+        self._jwt = jwt
+        self._error = JWTError
+
+    def encode(self, claims: dict) -> str:
+        return self._jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except self._error as exc:
+            raise TokenError(str(exc)) from exc
+
+
+class PyJWTBackend(JWTBackend):
+    """Backend PyJWT"""
+
+    name = "pyjwt"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        super().__init__(secret_key, algorithm)
+        import jwt
+        self._jwt = jwt
+        self._error = jwt.PyJWTError
+
+    def encode(self, claims: dict) -> str:
+        return self._jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except self._error as exc:
+            raise TokenError(str(exc)) from exc
+
+
+JWT_BACKENDS: Dict[str, Type[JWTBackend]] = {
+    JoseBackend.name: JoseBackend,
+    PyJWTBackend.name: PyJWTBackend,
+}
+
+def get_jwt_backend(name: Optional[str] = None) -> JWTBackend:
+    """Instancie le backend JWT choisi (JWT_BACKEND par défaut)"""
+    backend = JWT_BACKENDS.get(name or settings.jwt_backend)
+    if backend is None:
+        raise ValueError(f"Backend JWT inconnu : {name or settings.jwt_backend}")
+    return backend(settings.secret_key, settings.algorithm)
+
+jwt_backend = get_jwt_backend()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Crée un token JWT"""
     to_encode = data.copy()
@@ -23,13 +148,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)  # ← minuscules
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+    encoded_jwt = jwt_backend.encode(to_encode)
     return encoded_jwt
 
 def decode_token(token: str) -> Optional[dict]:
     """Décode un token JWT"""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])  # ← minuscules
-        return payload
-    except JWTError:
-        return None
\ No newline at end of file
+        return jwt_backend.decode(token)
+    except TokenError:
+        return None
+
+def create_refresh_token() -> tuple[str, str]:
+    """Crée un refresh token opaque et retourne (token, hash à stocker)"""
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+def hash_refresh_token(token: str) -> str:
+    """Hash un refresh token (SHA-256, le token est déjà aléatoire)"""
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,147 @@
+# ============================================
+# FICHIER : backend/app/core/sqlite.py
+# ============================================
+
+import logging
+import re
+from typing import Dict, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Journal d'uvicorn : la ligne apparaît avec les autres messages de démarrage
+logger = logging.getLogger("uvicorn.error")
+
+Pragmas = Dict[str, Union[int, str]]
+
+# Profils de performance SQLite, appliqués à chaque nouvelle connexion
+SQLITE_PROFILES: Dict[str, Pragmas] = {
+    "dev": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+        "cache_size": -16000,  # en Kio : 16 Mo
+        "temp_store": "MEMORY",
+        "mmap_size": 0,
+    },
+    # La base de test est recréée à chaque test : la durabilité n'a pas d'importance
+    "test": {
+        "journal_mode": "MEMORY",
+        "synchronous": "OFF",
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "mmap_size": 0,
+    },
+    # WAL + NORMAL : les lectures ne bloquent plus sur l'écriture des scores,
+    # une transaction n'est perdue qu'en cas de coupure de la machine
+    "prod": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+        "cache_size": -64000,  # en Kio : 64 Mo
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,  # 256 Mo
+    },
+}
+
+# journal_mode doit être appliqué en premier : il change la façon dont les autres s'appliquent
+PRAGMA_ORDER = ("journal_mode", "synchronous", "foreign_keys", "busy_timeout", "cache_size", "temp_store", "mmap_size")
+
+
+def resolve_pragmas(profile: str, overrides: Optional[str] = None) -> Pragmas:
+    """
+    This function returns the pragmas of a profile, with the overrides applied.
+
+    param : profile - The name of the profile (dev, test or prod).
+    param : overrides - The pragmas to change, as "name=value,name=value".
+    return : Return the pragmas.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile {profile!r}, expected one of {sorted(SQLITE_PROFILES)}")
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for item in (overrides or "").split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        name = name.strip().lower()
+        value = value.strip()
+        if name not in PRAGMA_ORDER or not re.fullmatch(r"-?\w+", value):
+            raise ValueError(f"Invalid SQLite pragma override {item.strip()!r}")
+        pragmas[name] = int(value) if value.lstrip("-").isdigit() else value
+    return pragmas
+
+
+
+def configure_sqlite(
+    engine: Engine, profile: str, overrides: Optional[str] = None, read_only: bool = False
+) -> Optional[Pragmas]:
+    """
+    This function applies a performance profile to every connection opened by a SQLite engine.
+
+    param : engine - The engine.
+    param : profile - The name of the profile (dev, test or prod).
+    param : overrides - The pragmas to change, as "name=value,name=value".
+    param : read_only - True for the engine of the GET routes : query_only is set.
+    return : Return the pragmas applied, or None if the engine is not SQLite.
+    """
+    if engine.dialect.name != "sqlite":
+        return None
+
+    pragmas = resolve_pragmas(profile, overrides)
+    if read_only:
+        # Le mode de journal appartient au fichier : c'est le moteur d'écriture qui le fixe
+        pragmas.pop("journal_mode", None)
+        pragmas["query_only"] = "ON"
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name in PRAGMA_ORDER + ("query_only",):
+                if name in pragmas:
+                    cursor.execute(f"PRAGMA {name}={pragmas[name]}")
+        finally:
+            cursor.close()
+
+    return pragmas
+
+
+
+def effective_pragmas(engine: Engine) -> Optional[Pragmas]:
+    """
+    This function reads back the pragmas of a connection, as SQLite applied them.
+
+    param : engine - The engine.
+    return : Return the pragmas, or None if the engine is not SQLite.
+    """
+    if engine.dialect.name != "sqlite":
+        return None
+
+    with engine.connect() as connection:
+        return {
+            name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in PRAGMA_ORDER
+        }
+
+
+
+def log_sqlite_profile(engine: Engine, profile: str) -> None:
+    """
+    This function logs the effective pragmas at startup.
+
+    param : engine - The engine.
+    param : profile - The name of the profile.
+    """
+    pragmas = effective_pragmas(engine)
+    if pragmas is None:
+        return
+    logger.info(
+        "SQLite profile %s: %s",
+        profile,
+        ", ".join(f"{name}={value}" for name, value in pragmas.items()),
+    )
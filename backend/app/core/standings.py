@@ -0,0 +1,218 @@
+# ============================================
+# FICHIER : backend/app/core/standings.py
+# ============================================
+
+# Table company_standings : le classement des entreprises tenu à jour dans la
+# transaction de chaque écriture de match. Une écriture retire la contribution
+# du match avant modification et ajoute celle d'après : seules les lignes des
+# entreprises concernées changent, sans relire l'historique des matchs.
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import case, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.models import CompanyStanding, Match, Team
+from app.models.statements import STANDINGS_FROM_MATCHES
+
+# Compteurs cumulés par entreprise (first_seen est un minimum, pas un cumul)
+COUNTERS = ("matches_played", "wins", "losses", "points", "sets_won", "sets_lost")
+
+
+@dataclass(frozen=True)
+class Contribution:
+    """
+    This class is what a finished match adds to the standing of one company.
+    """
+
+    # This attribute is the name of the company.
+    company: str
+
+    # This attribute is the position of the match (match id * 2, + 1 as second team).
+    first_seen: int
+
+    # This attribute is the value added to each counter, in the order of COUNTERS.
+    counters: tuple
+
+
+@dataclass(frozen=True)
+class StandingDifference:
+    """
+    This class is a company whose live standing differs from the one recomputed from the matches.
+    """
+
+    # This attribute is the name of the company.
+    company: str
+
+    # This attribute is the live row, None if missing.
+    live: Optional[dict]
+
+    # This attribute is the recomputed row, None if the company has no finished match.
+    expected: Optional[dict]
+
+
+
+def contributions(match_id: int, status: str, score_team1, score_team2, company1: str, company2: str) -> List[Contribution]:
+    """
+    This function computes what a match adds to the standings, the rules of the ranking.
+
+    param : match_id - The match's id.
+    param : status - The match's status, only TERMINE counts.
+    param : score_team1 - The score of the first team, None counts 0.
+    param : score_team2 - The score of the second team, None counts 0.
+    param : company1 - The company of the first team.
+    param : company2 - The company of the second team.
+    return : Return one contribution by team, empty if the match is not finished.
+    """
+    if status != "TERMINE":
+        return []
+
+    result = []
+    for order, company, scored, conceded in (
+        (0, company1, score_team1 or 0, score_team2 or 0),
+        (1, company2, score_team2 or 0, score_team1 or 0),
+    ):
+        won = 1 if scored > conceded else 0
+        lost = 1 if scored < conceded else 0
+        result.append(Contribution(company, match_id * 2 + order, (1, won, lost, won * 3, scored, conceded)))
+    return result
+
+
+
+async def match_contributions(db: AsyncSession, match: Match) -> List[Contribution]:
+    """
+    This function computes what a match of the session adds to the standings.
+
+    param : db - The session of database.
+    param : match - The match, flushed (its id and team ids are set).
+    return : Return the contributions.
+    """
+    if match.status != "TERMINE":
+        return []
+    # Équipes déjà dans la session en général : pas de requête
+    team1 = await db.get(Team, match.team1_id)
+    team2 = await db.get(Team, match.team2_id)
+    return contributions(match.id, match.status, match.score_team1, match.score_team2, team1.company, team2.company)
+
+
+
+def first_appearance(company):
+    """
+    This function builds the first appearance of a company in the finished matches.
+
+    param : company - The column or value of the company.
+    return : Return the scalar subquery.
+    """
+    return (
+        select(func.min(case((Team.id == Match.team1_id, Match.id * 2), else_=Match.id * 2 + 1)))
+        .join(Team, or_(Team.id == Match.team1_id, Team.id == Match.team2_id))
+        .where(Team.company == company, Match.status == "TERMINE")
+        .scalar_subquery()
+    )
+
+
+
+def upsert(dialect: str):
+    """
+    This function returns the INSERT ... ON CONFLICT of a dialect.
+
+    param : dialect - The name of the dialect.
+    return : Return the insert function.
+    """
+    return postgresql_insert if dialect == "postgresql" else sqlite_insert
+
+
+
+async def apply_contributions(db: AsyncSession, removed: Iterable[Contribution], added: Iterable[Contribution]) -> None:
+    """
+    This function applies a change of matches to company_standings, in the transaction of the session.
+    The matches must be flushed: first_seen of a company losing a match is read from them.
+
+    param : db - The session of database.
+    param : removed - The contributions of the matches before the change.
+    param : added - The contributions of the matches after the change.
+    """
+    removed, added = list(removed), list(added)
+    # Un match modifié sans changer son résultat (terrain, date) : rien à écrire
+    if set(removed) == set(added):
+        return
+
+    deltas: Dict[str, List[int]] = defaultdict(lambda: [0] * len(COUNTERS))
+    first_seen: Dict[str, int] = {}
+    removed_first_seen: Dict[str, int] = {}
+    for contribution in removed:
+        deltas[contribution.company] = [d - c for d, c in zip(deltas[contribution.company], contribution.counters)]
+        removed_first_seen[contribution.company] = contribution.first_seen
+    for contribution in added:
+        deltas[contribution.company] = [d + c for d, c in zip(deltas[contribution.company], contribution.counters)]
+        first_seen[contribution.company] = min(first_seen.get(contribution.company, contribution.first_seen), contribution.first_seen)
+
+    table = CompanyStanding.__table__
+    statement = upsert(db.get_bind().dialect.name)(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.company],
+        set_={
+            **{name: table.c[name] + statement.excluded[name] for name in COUNTERS},
+            "first_seen": case(
+                (statement.excluded.first_seen < table.c.first_seen, statement.excluded.first_seen),
+                else_=table.c.first_seen,
+            ),
+        },
+    )
+    await db.execute(statement, [
+        {
+            "company": company,
+            **dict(zip(COUNTERS, delta)),
+            # Entreprise qui ne fait que perdre un match : valeur sans effet, relue plus bas
+            "first_seen": first_seen[company] if company in first_seen else removed_first_seen[company],
+        }
+        for company, delta in deltas.items()
+    ])
+
+    # Une entreprise sans match terminé sort du classement
+    await db.execute(delete(table).where(table.c.company.in_(list(deltas)), table.c.matches_played <= 0))
+
+    # Le match retiré était peut-être la première apparition : relue dans les matchs
+    left = {contribution.company for contribution in removed}
+    if left:
+        await db.execute(
+            update(table)
+            .where(table.c.company.in_(left))
+            .values(first_seen=first_appearance(table.c.company))
+        )
+
+
+
+def rebuild_standings(db: Session, apply: bool = True) -> List[StandingDifference]:
+    """
+    This function recomputes company_standings from every finished match and compares it to the live table.
+    The table is replaced in one transaction; matches written during the rebuild may be missed.
+
+    param : db - The session of database.
+    param : apply - False to only compare.
+    return : Return the companies whose live standing differs, empty if the table is right.
+    """
+    columns = COUNTERS + ("first_seen",)
+    expected = {row.company: {name: row._mapping[name] for name in columns} for row in db.execute(STANDINGS_FROM_MATCHES)}
+    live = {
+        standing.company: {name: getattr(standing, name) for name in columns}
+        for standing in db.scalars(select(CompanyStanding))
+    }
+
+    differences = [
+        StandingDifference(company, live.get(company), expected.get(company))
+        for company in sorted(expected.keys() | live.keys())
+        if live.get(company) != expected.get(company)
+    ]
+
+    if apply and differences:
+        db.execute(delete(CompanyStanding))
+        if expected:
+            db.execute(insert(CompanyStanding), [{"company": company, **row} for company, row in expected.items()])
+        db.commit()
+    return differences
@@ -1,15 +1,88 @@
+from datetime import date
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.sql import func
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
+from app.core.sqlite import configure_sqlite
+
+def engine_options(url: str) -> dict:
+    """Options du moteur selon le dialecte : threads pour SQLite, pool pour les serveurs de base"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.get_driver_name() == "aiosqlite":
+            return {}
+        return {"connect_args": {"check_same_thread": False}}  # Nécessaire pour SQLite
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
 
 engine = create_engine(
     settings.database_url,  # ← Changé de DATABASE_URL à database_url
-    connect_args={"check_same_thread": False}  # Nécessaire pour SQLite
+    **engine_options(settings.database_url)
 )
 
+configure_sqlite(engine, settings.sqlite_profile, settings.sqlite_pragmas)
+instrument_engine(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Pilotes asynchrones utilisés quand ASYNC_DATABASE_URL n'est pas fourni
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """Déduit l'URL du pilote asynchrone depuis celle du pilote synchrone"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver known for {parsed.drivername!r}, set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+async_database_url = settings.async_database_url or to_async_url(settings.database_url)
+async_engine = create_async_engine(async_database_url, **engine_options(async_database_url))
+
+configure_sqlite(async_engine.sync_engine, settings.sqlite_profile, settings.sqlite_pragmas)
+instrument_engine(async_engine.sync_engine)
+
+# expire_on_commit=False : relire un attribut après commit déclencherait un chargement implicite
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def to_read_only_url(url: str) -> str:
+    """URL de lecture : SQLite rouvre le même fichier en lecture seule, les serveurs restent inchangés"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return url
+    database = parsed.database
+    if not database.startswith("file:"):
+        database = f"file:{database}"
+    return parsed.set(
+        database=database,
+        query={**parsed.query, "mode": "ro", "uri": "true"},
+    ).render_as_string(hide_password=False)
+
+def read_engine_options(url: str) -> dict:
+    """Options du moteur de lecture : transactions en lecture seule côté serveur"""
+    options = engine_options(url)
+    if make_url(url).get_driver_name() == "asyncpg":
+        options["connect_args"] = {"server_settings": {"default_transaction_read_only": "on"}}
+    return options
+
+# Moteur distinct pour les routes GET : son propre pool ne concurrence pas les écritures
+read_database_url = to_read_only_url(to_async_url(settings.read_database_url or settings.database_url))
+read_engine = create_async_engine(read_database_url, **read_engine_options(read_database_url))
+
+configure_sqlite(read_engine.sync_engine, settings.sqlite_profile, settings.sqlite_pragmas, read_only=True)
+instrument_engine(read_engine.sync_engine)
+
+ReadSessionLocal = async_sessionmaker(read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -20,12 +93,23 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Générateur de session asynchrone de base de données"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_db():
+    """Générateur de session asynchrone en lecture seule, pour les routes GET"""
+    async with ReadSessionLocal() as db:
+        yield db
+
 def init_db():
     """Initialise la base de données avec un admin par défaut"""
-    from app.models.models import User, Player, Base
+    from app.models.models import User, Player
+    from app.core.migrations import upgrade
     from app.core.security import get_password_hash
     
-    Base.metadata.create_all(bind=engine)
+    upgrade()
     
     db = SessionLocal()
     try:
@@ -44,7 +128,7 @@ def init_db():
                 first_name="Admin",
                 company="Admin",
                 license_number="L000000",
-                birth_date=func.current_date(),
+                birth_date=date.today(),
                 photo_url="Admin",
                 user=admin
             )
@@ -1,17 +1,60 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.login_attempts import login_attempts
+from app.core.migrations import check_schema
+from app.core.query_stats import query_metrics, track_queries
+from app.core.sqlite import log_sqlite_profile
 from app.api import auth, player, team, event, match, pool, profile, result, admin
-from app.database import engine
-from app.models import models
+from app.database import engine, SessionLocal
 
-# Créer les tables
-models.Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
+
+def persist_login_attempts():
+    """Écrit en une transaction les tentatives de connexion modifiées"""
+    db = SessionLocal()
+    try:
+        login_attempts.persist(db)
+    finally:
+        db.close()
+
+def restore_login_attempts():
+    """Recharge les blocages persistés au démarrage"""
+    db = SessionLocal()
+    try:
+        login_attempts.restore(db)
+    finally:
+        db.close()
+
+async def flush_login_attempts():
+    """Persiste périodiquement les tentatives de connexion (write-behind)"""
+    while True:
+        await asyncio.sleep(settings.login_attempts_flush_seconds)
+        try:
+            await run_in_threadpool(persist_login_attempts)
+        except Exception:
+            logger.exception("Échec de la persistance des tentatives de connexion")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_sqlite_profile(engine, settings.sqlite_profile)
+    # Aucun DDL au démarrage : le schéma est créé et mis à jour par `python manage.py migrate`
+    check_schema(engine)
+    await run_in_threadpool(restore_login_attempts)
+    flusher = asyncio.create_task(flush_login_attempts())
+    yield
+    flusher.cancel()
+    await run_in_threadpool(persist_login_attempts)
 
 app = FastAPI(
     title="Corpo Padel API",
     description="API pour la gestion de tournois corporatifs de padel",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configuration CORS
@@ -32,6 +75,27 @@ async def add_security_headers(request, call_next):
     response.headers["X-XSS-Protection"] = "1; mode=block"
     return response
 
+def route_template(scope) -> str:
+    """Gabarit de la route (/api/v1/matches/{match_id}) : une entrée de métriques par route, pas par URL"""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Le chemin d'une route incluse peut être relatif à son routeur : le préfixe vient de l'URL
+    segments = scope["path"].rstrip("/").split("/")
+    relative = [segment for segment in route.path.split("/") if segment]
+    prefix = "/".join(segments[:len(segments) - len(relative)])
+    return f"{prefix}/{'/'.join(relative)}".rstrip("/") or "/"
+
+# Instrumentation SQL : nombre de requêtes et temps passé en base, par requête HTTP
+@app.middleware("http")
+async def add_query_stats(request, call_next):
+    with track_queries() as queries:
+        response = await call_next(request)
+    query_metrics.record(f"{request.method} {route_template(request.scope)}", queries)
+    response.headers["X-DB-Queries"] = str(queries.count)
+    response.headers["Server-Timing"] = f'db;dur={queries.duration * 1000:.1f};desc="{queries.count} queries"'
+    return response
+
 # Routes
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(player.router, prefix="/api/v1/players", tags=["User"])
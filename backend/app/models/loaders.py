@@ -0,0 +1,93 @@
+# ============================================
+# FICHIER : backend/app/models/loaders.py
+# ============================================
+
+# Chargements explicites des relations lues par les réponses.
+# En contexte async, un chargement implicite (lazy load) lève une erreur :
+# chaque requête des routes async déclare donc ce qu'elle charge.
+
+from sqlalchemy.orm import aliased, joinedload, selectinload
+
+from app.models.models import Event, Match, Player, Pool, Team
+
+# TeamResponse : les deux joueurs et la poule, dans le même SELECT que les équipes.
+# Que des relations many-to-one : les jointures ne dupliquent aucune ligne.
+# innerjoin quand la clé étrangère est NOT NULL, la poule reste optionnelle
+TEAM_OPTIONS = (
+    joinedload(Team.player1, innerjoin=True),
+    joinedload(Team.player2, innerjoin=True),
+    joinedload(Team.pool),
+)
+
+# MatchResponse : l'évènement et les deux équipes complètes, en un seul SELECT
+# quel que soit le nombre de matchs
+MATCH_OPTIONS = (
+    joinedload(Match.event, innerjoin=True),
+    joinedload(Match.team1, innerjoin=True).options(*TEAM_OPTIONS),
+    joinedload(Match.team2, innerjoin=True).options(*TEAM_OPTIONS),
+)
+
+# EventResponse : les matchs (colonnes seulement)
+EVENT_OPTIONS = (
+    selectinload(Event.matches),
+)
+
+# PoolResponse : les équipes de la poule
+POOL_OPTIONS = (
+    selectinload(Pool.teams),
+)
+
+# ProfileResponse : le compte du joueur
+PLAYER_OPTIONS = (
+    selectinload(Player.user),
+)
+
+
+# Réponses partielles des listes (fields= ou view=compact) : les colonnes
+# demandées sont les seules lues, sans entité ni relation chargée.
+# Chaque liste : les champs disponibles et ceux de la vue compacte.
+
+# Évènement d'un match, joint seulement si une de ses colonnes est demandée
+MATCH_EVENT = aliased(Event, name="match_event")
+
+MATCH_FIELDS = {
+    "id": Match.id,
+    "court_number": Match.court_number,
+    "status": Match.status,
+    "score_team1": Match.score_team1,
+    "score_team2": Match.score_team2,
+    "team1_id": Match.team1_id,
+    "team2_id": Match.team2_id,
+    "event_id": Match.event_id,
+    "event_date": MATCH_EVENT.event_date,
+    "event_time": MATCH_EVENT.event_time,
+}
+# Vue planning : terrain, horaire et équipes
+MATCH_COMPACT = ("id", "court_number", "status", "event_date", "event_time", "team1_id", "team2_id")
+
+TEAM_FIELDS = {
+    "id": Team.id,
+    "company": Team.company,
+    "player1_id": Team.player1_id,
+    "player2_id": Team.player2_id,
+    "pool_id": Team.pool_id,
+}
+TEAM_COMPACT = ("id", "company", "pool_id")
+
+PLAYER_FIELDS = {
+    "id": Player.id,
+    "first_name": Player.first_name,
+    "last_name": Player.last_name,
+    "company": Player.company,
+    "license_number": Player.license_number,
+    "birth_date": Player.birth_date,
+    "photo_url": Player.photo_url,
+}
+PLAYER_COMPACT = ("id", "first_name", "last_name", "company")
+
+EVENT_FIELDS = {
+    "id": Event.id,
+    "event_date": Event.event_date,
+    "event_time": Event.event_time,
+}
+EVENT_COMPACT = ("id", "event_date", "event_time")
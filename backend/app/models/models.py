@@ -2,7 +2,7 @@
 # FICHIER : backend/app/models/models.py
 # ============================================
 
-from sqlalchemy import Column, Integer, String, Boolean, Date, Time, DateTime, Text, ForeignKey, CheckConstraint, func
+from sqlalchemy import Column, Integer, String, Boolean, Date, Time, DateTime, Text, ForeignKey, CheckConstraint, Index, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -34,6 +34,12 @@ class User(Base):
     # This attribute represents if the user need to change their password.
     must_change_password = Column(Boolean, default=True)
 
+    # This attribute is the version of the user's tokens. Older tokens are revoked.
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # This attribute represents when the user last logged in.
+    last_login_at = Column(DateTime(timezone=True), nullable=True)
+
     # This attribute represents when the user is created.
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -44,6 +50,9 @@ class User(Base):
     # This is the player information linked to the user.
     player = relationship("Player", back_populates="user", uselist=False, cascade="all, delete-orphan")
 
+    # This is the refresh tokens issued to the user.
+    refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
+
 
 
 class Player(Base):
@@ -61,8 +70,8 @@ class Player(Base):
     # This attribute is the player's last name.
     last_name = Column(String, nullable=False)
 
-    # This attribute is the player's company name.
-    company = Column(String, nullable=False)
+    # This attribute is the player's company name (accounts of a company, admin batches).
+    company = Column(String, nullable=False, index=True)
 
     # This attribute is the player's license number.
     license_number = Column(
@@ -85,8 +94,11 @@ class Player(Base):
 
     # This "attribute" add a constrain to the license number.
     __table_args__ = (
+        # "L" suivi de 6 chiffres, écrit avec des fonctions communes à SQLite et PostgreSQL
         CheckConstraint(
-            "license_number GLOB 'L[0-9][0-9][0-9][0-9][0-9][0-9]'",
+            "length(license_number) = 7 "
+            "AND substr(license_number, 1, 1) = 'L' "
+            "AND ltrim(substr(license_number, 2), '0123456789') = ''",
             name="chk_license_format"
         ),
     )
@@ -130,8 +142,8 @@ class Team(Base):
     # This attribute is the team's id.
     id = Column(Integer, primary_key=True)
 
-    # This attribute is the team's company name.
-    company = Column(String, nullable=False)
+    # This attribute is the team's company name (filter of the teams, first appearance in the standings).
+    company = Column(String, nullable=False, index=True)
 
     # This attribute represents when the team is created.
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -175,11 +187,17 @@ class Event(Base):
     id = Column(Integer, primary_key=True)
 
     # This attribute is the event's date.
-    event_date = Column(Date, nullable=False, index=True)
+    event_date = Column(Date, nullable=False)
 
     # This attribute is the event's time.
     event_time = Column(Time, nullable=False)
 
+    # This "attribute" is the lookup of an event by date and time (update of a match), and the date ranges.
+    # Not unique: a match created without event gets its own event for today.
+    __table_args__ = (
+        Index("ix_events_event_date_time", event_date, event_time),
+    )
+
     # This attribute represents when the event is created.
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -211,8 +229,7 @@ class Match(Base):
         String,
         CheckConstraint("status IN ('A_VENIR', 'TERMINE', 'ANNULE')"),
         nullable=False,
-        default="A_VENIR",
-        index=True
+        default="A_VENIR"
     )
 
     # This attribute is the score of the first team.
@@ -228,8 +245,8 @@ class Match(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
-    # This attribute is the event's id.
-    event_id = Column(ForeignKey("events.id"), nullable=False)
+    # This attribute is the event's id (matches of an event).
+    event_id = Column(ForeignKey("events.id"), nullable=False, index=True)
 
     # This attribute is the first team.
     team1_id = Column(ForeignKey("teams.id"), nullable=False, index=True)
@@ -237,9 +254,10 @@ class Match(Base):
     # This attribute is the second team.
     team2_id = Column(ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True)
 
-    # This "attribute" check if the team don't play against itself.
+    # This "attribute" check if the team don't play against itself, and gives the pages of a status in id order.
     __table_args__ = (
         CheckConstraint("team1_id != team2_id", name="chk_different_teams"),
+        Index("ix_matches_status_id", "status", "id"),
     )
 
     # This is the event linked.
@@ -273,3 +291,126 @@ class LoginAttempt(Base):
 
     # This attribute is when the account is unlucked.
     locked_until = Column(DateTime(timezone=True), nullable=True, default=func.now())
+
+
+
+class TokenRevocation(Base):
+    """
+    This class represents a revoked token, or every token of a user below a version.
+    """
+    __tablename__ = "token_revocations"
+
+    # This attribute is the id of the revocation.
+    id = Column(Integer, primary_key=True)
+
+    # This attribute is the user whose tokens are revoked.
+    user_id = Column(Integer, nullable=False, index=True)
+
+    # This attribute is the id (jti) of the revoked token, for a logout.
+    jti = Column(String, nullable=True)
+
+    # This attribute is the minimal token version still valid for the user.
+    token_version = Column(Integer, nullable=True)
+
+    # This attribute is when the revocation becomes useless (every token concerned is expired).
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    # This attribute represents when the revocation is created.
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+
+class RefreshToken(Base):
+    """
+    This class represents a refresh token. Only its hash is stored.
+    """
+    __tablename__ = "refresh_tokens"
+
+    # This attribute is the id of the refresh token.
+    id = Column(Integer, primary_key=True)
+
+    # This attribute is the SHA-256 of the token.
+    token_hash = Column(String, nullable=False, unique=True)
+
+    # This attribute groups the tokens rotated from the same login.
+    family_id = Column(String, nullable=False, index=True)
+
+    # This attribute is when the token expires.
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    # This attribute is when the token was used or revoked.
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+    # This attribute represents when the token is created.
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+    # This attribute is the owner of the token.
+    user_id = Column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # This is the user linked.
+    user = relationship("User", back_populates="refresh_tokens")
+
+
+
+class CompanyStanding(Base):
+    """
+    This class represents the standing of a company over the finished matches.
+    It is updated in the transaction of every match created or updated.
+    """
+    __tablename__ = "company_standings"
+
+    # This attribute is the name of the company.
+    company = Column(String, primary_key=True)
+
+    # This attribute is the number of finished matches played.
+    matches_played = Column(Integer, nullable=False, default=0)
+
+    # This attribute is the number of matches won.
+    wins = Column(Integer, nullable=False, default=0)
+
+    # This attribute is the number of matches lost.
+    losses = Column(Integer, nullable=False, default=0)
+
+    # This attribute is the number of points (3 by win).
+    points = Column(Integer, nullable=False, default=0)
+
+    # This attribute is the number of sets won.
+    sets_won = Column(Integer, nullable=False, default=0)
+
+    # This attribute is the number of sets lost.
+    sets_lost = Column(Integer, nullable=False, default=0)
+
+    # This attribute is the first appearance of the company (match id * 2, + 1 as second team), to break ties.
+    first_seen = Column(Integer, nullable=False)
+
+    # This "attribute" is the order of the ranking, read without sort.
+    __table_args__ = (
+        Index("ix_company_standings_ranking", points.desc(), first_seen),
+    )
+
+
+
+class MatchParticipant(Base):
+    """
+    This class represents a player of a match, copied from the teams of the match.
+    It is updated in the transaction of every match created or updated.
+    """
+    __tablename__ = "match_participants"
+
+    # This attribute is the match played.
+    match_id = Column(ForeignKey("matches.id", ondelete="CASCADE"), primary_key=True)
+
+    # This attribute is the player. A player of both teams is only on the side of the first team.
+    player_id = Column(ForeignKey("players.id"), primary_key=True)
+
+    # This attribute is the team of the player in the match.
+    team_id = Column(ForeignKey("teams.id"), nullable=False)
+
+    # This attribute is the side of the team in the match (1 or 2).
+    side = Column(Integer, CheckConstraint("side IN (1, 2)"), nullable=False)
+
+    # This "attribute" is the matches of a player, read by one index range in match order.
+    __table_args__ = (
+        Index("ix_match_participants_player_match", "player_id", "match_id"),
+    )
@@ -0,0 +1,249 @@
+# ============================================
+# FICHIER : backend/app/models/statements.py
+# ============================================
+
+# Requêtes les plus fréquentes, construites une seule fois à l'import.
+# Seuls les paramètres (bindparam) changent d'un appel à l'autre : pas de
+# reconstruction du select() ni de recalcul de sa clé de cache SQLAlchemy,
+# la forme compilée est retrouvée directement dans le cache du moteur.
+
+from sqlalchemy import Float, Integer, bindparam, case, cast, func, literal, or_, select, union_all
+from sqlalchemy.orm import aliased, selectinload
+
+from app.models.loaders import PLAYER_OPTIONS, TEAM_OPTIONS
+from app.models.models import CompanyStanding, Event, Match, MatchParticipant, Player, Pool, Team, User
+
+# get_current_user (mode stateful) : le principal d'un utilisateur, paramètre user_id
+PRINCIPAL_BY_USER_ID = (
+    select(User.id, User.role, User.is_active, Player.id.label("player_id"), User.token_version)
+    .outerjoin(Player, Player.user_id == User.id)
+    .where(User.id == bindparam("user_id"))
+)
+
+# Profil : le joueur d'un utilisateur avec son compte, paramètre user_id
+PLAYER_BY_USER_ID = (
+    select(Player)
+    .options(*PLAYER_OPTIONS)
+    .where(Player.user_id == bindparam("user_id"))
+    .execution_options(populate_existing=True)
+)
+
+# Classement : les matchs d'un statut avec leurs deux équipes, paramètre status
+MATCHES_BY_STATUS = (
+    select(Match)
+    .options(selectinload(Match.team1), selectinload(Match.team2))
+    .where(Match.status == bindparam("status"))
+)
+
+# Équipes : toutes, ou celles d'une poule (paramètre pool_id), avec joueurs et poule
+TEAMS = select(Team).options(*TEAM_OPTIONS)
+TEAMS_BY_POOL = TEAMS.where(Team.pool_id == bindparam("pool_id"))
+
+# Poules : le nombre d'équipes est compté par la base, sans charger les équipes
+POOL_SUMMARIES = (
+    select(Pool.id, Pool.name, func.count(Team.id).label("teams_count"))
+    .outerjoin(Team, Team.pool_id == Pool.id)
+    .group_by(Pool.id, Pool.name)
+    .order_by(Pool.id)
+)
+POOL_SUMMARY = POOL_SUMMARIES.where(Pool.id == bindparam("pool_id"))
+
+# Noms des équipes de chaque poule : deux colonnes, pas d'objets Team
+POOL_TEAM_COMPANIES = (
+    select(Team.pool_id, Team.company)
+    .where(Team.pool_id.isnot(None))
+    .order_by(Team.pool_id, Team.id)
+)
+POOL_TEAM_COMPANIES_BY_POOL = POOL_TEAM_COMPANIES.where(Team.pool_id == bindparam("pool_id"))
+
+
+def my_results_statement():
+    """
+    This function builds the results of a player (paramètre user_id) in one joined query.
+    The matches of the player are read from match_participants, the statistics by window functions over every row.
+
+    return : Return the statement.
+    """
+    opponents, opponent1, opponent2 = aliased(Team), aliased(Player), aliased(Player)
+    me = select(Player.id).where(Player.user_id == bindparam("user_id")).scalar_subquery()
+
+    # Un joueur des deux équipes est du côté de l'équipe 1 (match_participants)
+    in_team1 = MatchParticipant.side == 1
+    player_score = case((in_team1, Match.score_team1), else_=Match.score_team2)
+    opponent_score = case((in_team1, Match.score_team2), else_=Match.score_team1)
+
+    # Un score absent compare à NULL : ni victoire ni défaite
+    won = case((player_score > opponent_score, 1), else_=0)
+    lost = case((player_score < opponent_score, 1), else_=0)
+    wins = func.sum(won).over()
+    total = func.count().over()
+
+    return (
+        select(
+            Match.id.label("match_id"),
+            Event.event_date.label("date"),
+            Match.court_number,
+            player_score.label("player_score"),
+            opponent_score.label("opponent_score"),
+            case(
+                (or_(player_score.is_(None), opponent_score.is_(None)), literal("A_VENIR")),
+                (player_score > opponent_score, literal("VICTOIRE")),
+                (player_score < opponent_score, literal("DEFAITE")),
+                else_=literal("NUL"),
+            ).label("result"),
+            opponents.company.label("opponent_company"),
+            opponent1.first_name.label("opponent1_first_name"),
+            opponent1.last_name.label("opponent1_last_name"),
+            opponent2.first_name.label("opponent2_first_name"),
+            opponent2.last_name.label("opponent2_last_name"),
+            total.label("total_matches"),
+            wins.label("wins"),
+            func.sum(lost).over().label("losses"),
+            # Même ordre d'opérations que wins / total * 100 en Python : même flottant
+            (cast(wins, Float) / total * 100).label("win_rate"),
+        )
+        .select_from(MatchParticipant)
+        .join(Match, Match.id == MatchParticipant.match_id)
+        .join(Event, Event.id == Match.event_id)
+        .join(opponents, opponents.id == case((in_team1, Match.team2_id), else_=Match.team1_id))
+        .join(opponent1, opponent1.id == opponents.player1_id)
+        .join(opponent2, opponent2.id == opponents.player2_id)
+        # Joueur résolu d'abord : un parcours de l'index (player_id, match_id)
+        .where(MatchParticipant.player_id == me, Match.status == "TERMINE")
+        .order_by(MatchParticipant.match_id)
+    )
+
+
+# Résultats : une ligne par match terminé du joueur, statistiques répétées sur chaque ligne
+MY_RESULTS = my_results_statement()
+
+# Existence du joueur, lue seulement quand il n'a aucun résultat
+PLAYER_ID_BY_USER_ID = select(Player.id).where(Player.user_id == bindparam("user_id"))
+
+
+
+def standings_statement():
+    """
+    This function builds the standings of companies from every finished match, aggregated by the database.
+    Each match gives two rows (the point of view of each team), grouped by company.
+    first_seen is the first appearance of the company (match id, then team 1 before team 2):
+    it breaks ties on points, in the order of the former Python aggregation.
+
+    return : Return the statement.
+    """
+    def side(team_id, score_for, score_against, order):
+        scored = func.coalesce(score_for, 0)
+        conceded = func.coalesce(score_against, 0)
+        return (
+            select(
+                Team.company.label("company"),
+                (Match.id * 2 + order).label("first_seen"),
+                scored.label("sets_won"),
+                conceded.label("sets_lost"),
+                case((scored > conceded, 1), else_=0).label("won"),
+                case((scored < conceded, 1), else_=0).label("lost"),
+            )
+            .join(Team, Team.id == team_id)
+            .where(Match.status == "TERMINE")
+        )
+
+    sides = union_all(
+        side(Match.team1_id, Match.score_team1, Match.score_team2, 0),
+        side(Match.team2_id, Match.score_team2, Match.score_team1, 1),
+    ).subquery("sides")
+
+    return (
+        select(
+            sides.c.company,
+            func.count().label("matches_played"),
+            func.sum(sides.c.won).label("wins"),
+            func.sum(sides.c.lost).label("losses"),
+            (func.sum(sides.c.won) * 3).label("points"),
+            func.sum(sides.c.sets_won).label("sets_won"),
+            func.sum(sides.c.sets_lost).label("sets_lost"),
+            func.min(sides.c.first_seen).label("first_seen"),
+        )
+        .group_by(sides.c.company)
+    )
+
+
+def rankings_statement(standings):
+    """
+    This function builds a ranking from standings, positions assigned by the database.
+
+    param : standings - The table or subquery of the standings.
+    return : Return the statement.
+    """
+    order = (standings.c.points.desc(), standings.c.first_seen)
+    return (
+        select(
+            func.row_number().over(order_by=order).label("position"),
+            standings.c.company,
+            standings.c.matches_played,
+            standings.c.wins,
+            standings.c.losses,
+            standings.c.points,
+            standings.c.sets_won,
+            standings.c.sets_lost,
+        )
+        .order_by(*order)
+    )
+
+
+# Classement recalculé depuis tout l'historique des matchs (reconstruction, benchmark)
+STANDINGS_FROM_MATCHES = standings_statement()
+RANKINGS_FROM_MATCHES = rankings_statement(STANDINGS_FROM_MATCHES.subquery("standings"))
+
+# Classement des entreprises : lecture de company_standings, une ligne par entreprise
+RANKINGS = rankings_statement(CompanyStanding.__table__)
+
+
+
+def participants_statement(*criteria):
+    """
+    This function builds the rows of match_participants from the teams of the matches.
+    A player of both teams is only on the side of the first team: one row by match and player.
+
+    param : criteria - The filters of the matches.
+    return : Return the statement.
+    """
+    team1, team2 = aliased(Team, name="team1"), aliased(Team, name="team2")
+    in_team1 = (team1.player1_id, team1.player2_id)
+
+    def member(team, player_id, side, *exclude):
+        return (
+            select(
+                Match.id.label("match_id"),
+                player_id.label("player_id"),
+                team.id.label("team_id"),
+                literal(side, Integer).label("side"),
+            )
+            .join(team1, team1.id == Match.team1_id)
+            .join(team2, team2.id == Match.team2_id)
+            .where(*criteria, *exclude)
+        )
+
+    return union_all(
+        member(team1, team1.player1_id, 1),
+        member(team1, team1.player2_id, 1),
+        member(team2, team2.player1_id, 2, team2.player1_id.not_in(in_team1)),
+        member(team2, team2.player2_id, 2, team2.player2_id.not_in(in_team1)),
+    )
+
+
+# Participants recalculés depuis les équipes : de tous les matchs (reconstruction), ou de quelques matchs (écritures)
+PARTICIPANTS_FROM_MATCHES = participants_statement()
+PARTICIPANTS_OF_MATCHES = participants_statement(Match.id.in_(bindparam("match_ids", expanding=True)))
+
+# Matchs et événements d'un joueur (paramètre user_id) : un parcours de l'index (player_id, match_id)
+MATCH_IDS_BY_USER_ID = (
+    select(MatchParticipant.match_id)
+    .join(Player, Player.id == MatchParticipant.player_id)
+    .where(Player.user_id == bindparam("user_id"))
+)
+EVENT_IDS_BY_USER_ID = (
+    select(Match.event_id)
+    .join(MatchParticipant, MatchParticipant.match_id == Match.id)
+    .join(Player, Player.id == MatchParticipant.player_id)
+    .where(Player.user_id == bindparam("user_id"))
+)
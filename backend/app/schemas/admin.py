@@ -1,4 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, model_validator
+from app.schemas.player import UserRole
 
 class ResetPasswordResponse(BaseModel):
     """
@@ -11,3 +14,117 @@ class ResetPasswordResponse(BaseModel):
     model_config = ConfigDict(
         from_attributes=True
     )
+
+
+
+class ImportRowError(BaseModel):
+    """
+    This class is a DTO of a row refused by the import.
+    """
+
+    # This is the row number in the file (1 is the first data row).
+    row: int
+
+    # This is the email of the row, if readable.
+    email: Optional[str] = None
+
+    # This is why the row was refused.
+    message: str
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
+
+class PlayerImportResponse(BaseModel):
+    """
+    This class is a DTO of the report of a bulk import.
+    """
+
+    # This is the number of players created.
+    created: int
+
+    # This is the number of rows refused.
+    failed: int
+
+    # This is the detail of the rows refused.
+    errors: List[ImportRowError]
+
+
+
+class AccountSelection(BaseModel):
+    """
+    This class is the DTO selecting the accounts of a batch operation. Every criterion given must match.
+    """
+
+    # This is the ids of the users.
+    user_ids: Optional[List[int]] = None
+
+    # This is the company of the players.
+    company: Optional[str] = None
+
+    # This is the role of the users.
+    role: Optional[UserRole] = None
+
+    # This is the date since which the users have not logged in.
+    inactive_since: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def validate_not_empty(self):
+        # Sans critère, l'opération toucherait tous les comptes
+        if self.user_ids is None and self.company is None and self.role is None and self.inactive_since is None:
+            raise ValueError("At least one criterion is required")
+        return self
+
+
+
+class TemporaryPasswordResponse(BaseModel):
+    """
+    This class is a DTO of a temporary password given by a batch reset.
+    """
+
+    # This is the user's id.
+    user_id: int
+
+    # This is the user's email.
+    email: str
+
+    # This is the temporary password.
+    temporary_password: str
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
+
+class BatchResetPasswordResponse(BaseModel):
+    """
+    This class is a DTO when the admin resets several passwords.
+    """
+
+    # This is the number of accounts reset.
+    count: int
+
+    # This is the temporary passwords.
+    accounts: List[TemporaryPasswordResponse]
+
+    # This is the ids of the accounts left unchanged (a chunk failed and was rolled back).
+    failed_user_ids: List[int] = []
+
+    # This is the warning.
+    warning: str
+
+
+
+class BatchAccountResponse(BaseModel):
+    """
+    This class is a DTO when the admin activates or deactivates several accounts.
+    """
+
+    # This is the number of accounts changed.
+    count: int
+
+    # This is the ids of the accounts changed.
+    user_ids: List[int]
@@ -4,6 +4,7 @@
 
 from pydantic import BaseModel, EmailStr, Field, field_validator,  ConfigDict
 from datetime import datetime
+from typing import Optional
 import re
 
 class LoginRequest(BaseModel):
@@ -43,6 +44,11 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str
     user: UserResponse
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1)
 
 class ChangePasswordRequest(BaseModel):
     current_password: str
@@ -1,6 +1,6 @@
 # app/schemas/event.py
 from datetime import date, time
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict
 from .match import MatchResponse, MatchRequest, MatchStatus
 
@@ -80,9 +80,50 @@ class EventsListResponse(BaseModel):
     # This is the events.
     events: List[EventResponse]
 
-    # This is the total of events in the request.
-    total: int
+    # This is the total of events in the request, None if not asked.
+    total: Optional[int] = None
+
+    # This is the cursor of the next page (the `after` to send), None on the last page.
+    next_after: Optional[int] = None
 
     model_config = ConfigDict(
         from_attributes=True
     )
+
+
+
+class EventFieldsResponse(BaseModel):
+    """
+    This class is an event reduced to the fields asked (fields= or view=compact), without its matches.
+    Only the fields read are sent.
+    """
+
+    # The event's id.
+    id: int
+
+    # The event's date.
+    event_date: Optional[date] = None
+
+    # The event's time.
+    event_time: Optional[time] = None
+
+    # A full event is not a reduced one
+    model_config = ConfigDict(
+        extra="forbid"
+    )
+
+
+
+class EventsFieldsListResponse(BaseModel):
+    """
+    This class is the list of events reduced to the fields asked.
+    """
+
+    # This is the events.
+    events: List[EventFieldsResponse]
+
+    # This is the total of events in the request, None if not asked.
+    total: Optional[int] = None
+
+    # This is the cursor of the next page (the `after` to send), None on the last page.
+    next_after: Optional[int] = None
@@ -1,8 +1,8 @@
 # app/schemas/match.py
-from datetime import datetime, time
+from datetime import date, datetime, time
 from enum import Enum
 from typing import Optional, List
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from .team import TeamResponse
 
 class EventMini(BaseModel):
@@ -65,6 +65,12 @@ class MatchResponse(BaseModel):
     # This is the score of the second team.
     score_team2: Optional[str] = None
 
+    # The scores are stored as integers, sent as strings
+    @field_validator("score_team1", "score_team2", mode="before")
+    @classmethod
+    def score_as_string(cls, v):
+        return None if v is None else str(v)
+
     model_config = ConfigDict(
         from_attributes=True
     )
@@ -111,9 +117,77 @@ class MatchesListResponse(BaseModel):
     # This is the list of matches.
     matches: List[MatchResponse]
 
-    # This is the total in the request.
-    total: int
+    # This is the total in the request, None if not asked.
+    total: Optional[int] = None
+
+    # This is the cursor of the next page (the `after` to send), None on the last page.
+    next_after: Optional[int] = None
 
     model_config = ConfigDict(
         from_attributes=True
     )
+
+
+
+class MatchFieldsResponse(BaseModel):
+    """
+    This class is a match reduced to the fields asked (fields= or view=compact).
+    Only the fields read are sent.
+    """
+
+    # This is the match's id.
+    id: int
+
+    # This is the match's court.
+    court_number: Optional[int] = None
+
+    # This is the status of the match.
+    status: Optional[MatchStatus] = None
+
+    # This is the score of the first team.
+    score_team1: Optional[str] = None
+
+    # This is the score of the second team.
+    score_team2: Optional[str] = None
+
+    # This is the first team's id.
+    team1_id: Optional[int] = None
+
+    # This is the second team's id.
+    team2_id: Optional[int] = None
+
+    # This is the event's id.
+    event_id: Optional[int] = None
+
+    # This is the date of the event.
+    event_date: Optional[date] = None
+
+    # This is the time of the event.
+    event_time: Optional[time] = None
+
+    # The scores are stored as integers, sent as strings
+    @field_validator("score_team1", "score_team2", mode="before")
+    @classmethod
+    def score_as_string(cls, v):
+        return None if v is None else str(v)
+
+    # A full match is not a reduced one
+    model_config = ConfigDict(
+        extra="forbid"
+    )
+
+
+
+class MatchesFieldsListResponse(BaseModel):
+    """
+    This class is the list of matches reduced to the fields asked.
+    """
+
+    # This is the list of matches.
+    matches: List[MatchFieldsResponse]
+
+    # This is the total in the request, None if not asked.
+    total: Optional[int] = None
+
+    # This is the cursor of the next page (the `after` to send), None on the last page.
+    next_after: Optional[int] = None
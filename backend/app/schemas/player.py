@@ -111,9 +111,62 @@ class PlayersListResponse(BaseModel):
     # This is the list of players.
     players: List[PlayerResponse]
 
-    # This is the total in the request.
-    total: int
+    # This is the total in the request, None if not asked.
+    total: Optional[int] = None
+
+    # This is the cursor of the next page (the `after` to send), None on the last page.
+    next_after: Optional[int] = None
 
     model_config = ConfigDict(
         from_attributes=True
     )
+
+
+
+class PlayerFieldsResponse(BaseModel):
+    """
+    This class is a player reduced to the fields asked (fields= or view=compact).
+    Only the fields read are sent.
+    """
+
+    # This is the player's id.
+    id: int
+
+    # This is the player's first name.
+    first_name: Optional[str] = None
+
+    # This is the player's last name.
+    last_name: Optional[str] = None
+
+    # This is the player's company name.
+    company: Optional[str] = None
+
+    # This is the player's license.
+    license_number: Optional[str] = None
+
+    # This is the player's birth date.
+    birth_date: Optional[date] = None
+
+    # This is the player's profile picture.
+    photo_url: Optional[str] = None
+
+    # A full player is not a reduced one
+    model_config = ConfigDict(
+        extra="forbid"
+    )
+
+
+
+class PlayersFieldsListResponse(BaseModel):
+    """
+    This class is the list of players reduced to the fields asked.
+    """
+
+    # This is the list of players.
+    players: List[PlayerFieldsResponse]
+
+    # This is the total in the request, None if not asked.
+    total: Optional[int] = None
+
+    # This is the cursor of the next page (the `after` to send), None on the last page.
+    next_after: Optional[int] = None
@@ -1,5 +1,5 @@
 # app/schemas/team.py
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict, field_validator
 
 
@@ -111,9 +111,56 @@ class TeamsListResponse(BaseModel):
     # This is the list of teams.
     teams: List[TeamResponse]
 
-    # This is the total of teams in the request.
-    total: int
+    # This is the total of teams in the request, None if not asked.
+    total: Optional[int] = None
+
+    # This is the cursor of the next page (the `after` to send), None on the last page.
+    next_after: Optional[int] = None
 
     model_config = ConfigDict(
         from_attributes=True
     )
+
+
+
+class TeamFieldsResponse(BaseModel):
+    """
+    This class is a team reduced to the fields asked (fields= or view=compact).
+    Only the fields read are sent.
+    """
+
+    # This is the team's id.
+    id: int
+
+    # This is the team's company name.
+    company: Optional[str] = None
+
+    # This is the id of the first player.
+    player1_id: Optional[int] = None
+
+    # This is the id of the second player.
+    player2_id: Optional[int] = None
+
+    # This is the id of the team's pool.
+    pool_id: Optional[int] = None
+
+    # A full team is not a reduced one
+    model_config = ConfigDict(
+        extra="forbid"
+    )
+
+
+
+class TeamsFieldsListResponse(BaseModel):
+    """
+    This class is the list of teams reduced to the fields asked.
+    """
+
+    # This is the list of teams.
+    teams: List[TeamFieldsResponse]
+
+    # This is the total of teams in the request, None if not asked.
+    total: Optional[int] = None
+
+    # This is the cursor of the next page (the `after` to send), None on the last page.
+    next_after: Optional[int] = None
@@ -0,0 +1,227 @@
+"""
+Compare GET /matches servi par la route async (AsyncSession + aiosqlite) et par
+la même requête en route sync (Session dans le threadpool), sous charge concurrente.
+
+La base est un fichier SQLite temporaire rempli de --matches matchs.
+--threads borne le threadpool (40 par défaut dans Starlette) : c'est lui qui
+limite le modèle sync quand les requêtes attendent la base.
+--db-latency-ms ajoute à chaque requête SQL l'aller-retour réseau d'un serveur
+de base (PostgreSQL) : un thread bloqué côté sync, une attente non bloquante côté async.
+Sans latence (SQLite local), la route sync reste plus rapide : le temps est du CPU.
+--auth inclut l'authentification : la dépendance async réelle (get_current_user)
+contre sa jumelle sync, avec un seul token (principal en cache) ou un token neuf
+par requête (décodage JWT et requête du principal à chaque fois).
+
+Usage (depuis backend/) : python -m benchmarks.bench_async [--requests 2000] [--concurrency 10 50 200] [--db-latency-ms 1] [--auth cold]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, time as time_of_day
+
+import anyio
+import httpx
+from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.util import await_only
+
+from app.api import match
+from app.api.deps import get_current_user, security
+from app.core.cache import Principal, principal_cache
+from app.core.revocation import revocation_list
+from app.core.security import create_access_token, decode_token
+from app.core.sqlite import configure_sqlite
+from app.database import Base, get_async_db, get_db, get_read_db
+from app.models.loaders import MATCH_OPTIONS
+from app.models.models import Event, Match, Player, Team, User
+from app.models.statements import PRINCIPAL_BY_USER_ID
+from app.schemas.match import MatchesListResponse
+
+
+def seed(url: str, matches: int) -> None:
+    """Crée les tables et insère des équipes et des matchs"""
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        teams = []
+        for i in range(20):
+            players = [
+                Player(
+                    first_name=f"P{i}{j}",
+                    last_name="Bench",
+                    company=f"Company {i % 10}",
+                    license_number=f"L{100000 + i * 2 + j}",
+                    user=User(email=f"bench{i}{j}@example.com", password_hash="x", role="JOUEUR"),
+                )
+                for j in range(2)
+            ]
+            teams.append(Team(company=f"Company {i % 10}", player1=players[0], player2=players[1]))
+        db.add_all(teams)
+
+        for i in range(matches):
+            event = Event(event_date=date.today(), event_time=time_of_day(8 + i % 12))
+            db.add(Match(court_number=1 + i % 10, team1=teams[i % 20], team2=teams[(i + 1) % 20], event=event))
+        db.commit()
+    engine.dispose()
+
+
+def sync_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """Jumelle sync de get_current_user (son ancienne forme) : même travail, dans le threadpool"""
+    token = credentials.credentials
+    revocation_list.refresh(db)
+
+    principal = principal_cache.get(token)
+    if principal is None:
+        payload = decode_token(token)
+        row = db.execute(PRINCIPAL_BY_USER_ID, {"user_id": int(payload["sub"])}).first()
+        principal = Principal(
+            id=row[0], role=row[1], is_active=bool(row[2]), player_id=row[3],
+            token_id=payload.get("jti"), token_version=payload.get("ver", row[4]),
+        )
+        principal_cache.set(token, principal, payload.get("exp"))
+
+    if revocation_list.is_revoked(principal):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token révoqué")
+    return principal
+
+
+def build_app(path: str, pool_size: int, latency_ms: float, auth: str) -> FastAPI:
+    """Monte la route async réelle et sa jumelle sync sur la même base"""
+    # Pools dimensionnés pour la concurrence maximale : sinon le modèle sync se bloque
+    # (sessions qui gardent leur connexion en attendant un thread pour se fermer)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}, pool_size=pool_size, max_overflow=0
+    )
+    configure_sqlite(engine, "prod")
+    SyncSession = sessionmaker(bind=engine, autoflush=False)
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=pool_size, max_overflow=0)
+    configure_sqlite(async_engine.sync_engine, "prod")
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    if latency_ms > 0:
+        @event.listens_for(engine, "before_cursor_execute")
+        def sync_latency(*_):
+            time.sleep(latency_ms / 1000)
+
+        # Exécuté dans le greenlet de la requête : l'attente rend la main à la boucle
+        @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+        def async_latency(*_):
+            await_only(asyncio.sleep(latency_ms / 1000))
+
+    def sync_db():
+        with SyncSession() as db:
+            yield db
+
+    async def async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    bench = FastAPI()
+    bench.include_router(match.router, prefix="/async")
+
+    # Avec --auth none, la route sync n'authentifie pas et la route async reçoit un principal fixe
+    async def no_user():
+        return None
+
+    sync_user = sync_current_user if auth != "none" else no_user
+
+    @bench.get("/sync", response_model=MatchesListResponse)
+    def list_matches_sync(db: Session = Depends(get_db), current_user=Depends(sync_user)):
+        matches = db.scalars(select(Match).options(*MATCH_OPTIONS)).all()
+        return MatchesListResponse(matches=matches, total=len(matches))
+
+    bench.dependency_overrides[get_db] = sync_db
+    bench.dependency_overrides[get_async_db] = async_db
+    bench.dependency_overrides[get_read_db] = async_db
+    if auth == "none":
+        bench.dependency_overrides[get_current_user] = lambda: Principal(id=1, role="JOUEUR", is_active=True)
+    return bench
+
+
+def tokens(auth: str, count: int) -> list:
+    """En-têtes des requêtes : aucun, un seul token partagé ou un token neuf par requête"""
+    if auth == "none":
+        return [{}] * count
+    claims = {"sub": "1", "role": "JOUEUR", "ver": 0}
+    if auth == "cached":
+        return [{"Authorization": f"Bearer {create_access_token(claims)}"}] * count
+    return [{"Authorization": f"Bearer {create_access_token(claims)}"} for _ in range(count)]
+
+
+async def run(app: FastAPI, path: str, requests: int, concurrency: int, auth: str = "none") -> tuple:
+    """Envoie les requêtes par vagues de `concurrency` et renvoie (req/s, p50, p95)"""
+    latencies = []
+    headers = iter(tokens(auth, requests))
+    principal_cache.clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path, headers=next(headers))
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return requests / elapsed, statistics.median(latencies), p95
+
+
+async def main_async(args) -> None:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threads
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        seed(f"sqlite:///{path}", args.matches)
+        app = build_app(path, max(args.concurrency), args.db_latency_ms, args.auth)
+
+        # Préchauffe : connexions, caches de compilation
+        # La route async pagine par défaut : liste complète, comme la route sync
+        for route in ("/sync", "/async?all=true"):
+            await run(app, route, 20, 5, args.auth)
+
+        print(
+            f"{args.matches} matchs, threadpool {args.threads}, latence base {args.db_latency_ms} ms, "
+            f"{args.requests} requêtes par mesure, authentification {args.auth}\n"
+        )
+        print(f"{'route':<6} {'concurrence':>11} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        for concurrency in args.concurrency:
+            for name, route in (("sync", "/sync"), ("async", "/async?all=true")):
+                rate, p50, p95 = await run(app, route, args.requests, concurrency, args.auth)
+                print(f"{name:<6} {concurrency:>11} {rate:>9,.0f} {p50:>9.1f} {p95:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--matches", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--threads", type=int, default=40, help="Taille du threadpool de Starlette")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Aller-retour réseau simulé par requête SQL")
+    parser.add_argument(
+        "--auth", choices=["none", "cached", "cold"], default="cached",
+        help="Sans authentification, token en cache, ou token neuf par requête",
+    )
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
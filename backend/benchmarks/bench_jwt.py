@@ -0,0 +1,62 @@
+"""
+Micro-benchmark des backends JWT sur des tokens HS256 identiques à ceux de /auth/login.
+
+Usage (depuis backend/) : python -m benchmarks.bench_jwt [--iterations 20000]
+"""
+
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.security import JWT_BACKENDS, get_jwt_backend
+
+
+def login_claims() -> dict:
+    """Claims émis par login"""
+    return {
+        "sub": "42",
+        "email": "jean.dupont@techcorp.fr",
+        "role": "JOUEUR",
+        "player_id": 17,
+        "ver": 3,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        "jti": uuid.uuid4().hex,
+    }
+
+
+def ops_per_second(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    claims = login_claims()
+    backends = {name: get_jwt_backend(name) for name in JWT_BACKENDS}
+    tokens = {name: backend.encode(claims) for name, backend in backends.items()}
+
+    # Les claims doivent être identiques quel que soit le couple (émetteur, vérificateur)
+    reference = None
+    for issuer, token in tokens.items():
+        for verifier, backend in backends.items():
+            decoded = backend.decode(token)
+            reference = reference or decoded
+            status = "OK" if decoded == reference else "DIFFÉRENT"
+            print(f"{issuer:>6} -> {verifier:<6} claims {status}")
+    print()
+
+    print(f"{'backend':<8} {'encode/s':>12} {'decode/s':>12}")
+    for name, backend in backends.items():
+        encode = ops_per_second(lambda: backend.encode(claims), args.iterations)
+        decode = ops_per_second(lambda: backend.decode(tokens[name]), args.iterations)
+        print(f"{name:<8} {encode:>12,.0f} {decode:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Compare le classement des entreprises agrégé en Python (code d'avant : tous les
+matchs terminés chargés comme objets ORM avec leurs équipes), agrégé par la base
+(app.models.statements.RANKINGS_FROM_MATCHES) et lu dans la table company_standings
+(app.models.statements.RANKINGS), et vérifie que les trois classements sont identiques.
+
+La base est un fichier SQLite temporaire rempli de --matches matchs terminés
+entre --teams équipes de --companies entreprises.
+
+Usage (depuis backend/) : python -m benchmarks.bench_rankings [--matches 100000] [--runs 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, time as time_of_day
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.models import Event, Match, Player, Team, User
+from app.core.standings import rebuild_standings
+from app.models.statements import MATCHES_BY_STATUS, RANKINGS, RANKINGS_FROM_MATCHES
+
+
+def seed(db: Session, matches: int, teams: int, companies: int) -> None:
+    """Insère les équipes et leurs joueurs, puis les matchs en insertions groupées"""
+    db.execute(insert(User), [
+        {"id": i + 1, "email": f"bench{i}@example.com", "password_hash": "x", "role": "JOUEUR"}
+        for i in range(teams * 2)
+    ])
+    db.execute(insert(Player), [
+        {"id": i + 1, "first_name": f"P{i}", "last_name": "Bench", "company": f"Company {i // 2 % companies}",
+         "license_number": f"L{100000 + i}", "user_id": i + 1}
+        for i in range(teams * 2)
+    ])
+    db.execute(insert(Team), [
+        {"id": i + 1, "company": f"Company {i % companies}", "player1_id": i * 2 + 1, "player2_id": i * 2 + 2}
+        for i in range(teams)
+    ])
+    db.execute(insert(Event), [{"id": 1, "event_date": date.today(), "event_time": time_of_day(18, 0)}])
+
+    rng = random.Random(0)
+    rows = []
+    for i in range(matches):
+        team1, team2 = rng.sample(range(1, teams + 1), 2)
+        # Quelques matchs terminés sans score, comptés 0-0
+        scores = (None, None) if i % 50 == 0 else (rng.randint(0, 3), rng.randint(0, 3))
+        rows.append({
+            "court_number": i % 10 + 1, "team1_id": team1, "team2_id": team2, "event_id": 1,
+            "status": "TERMINE", "score_team1": scores[0], "score_team2": scores[1],
+        })
+    db.execute(insert(Match), rows)
+    db.commit()
+
+
+def rankings_python(db: Session) -> list:
+    """Classement d'avant : agrégation des objets Match en Python"""
+    stats = {}
+    for m in db.scalars(MATCHES_BY_STATUS, {"status": "TERMINE"}).all():
+        for team, scored, conceded in ((m.team1, m.score_team1, m.score_team2), (m.team2, m.score_team2, m.score_team1)):
+            v = stats.setdefault(team.company, {"matches": 0, "wins": 0, "losses": 0, "sets_won": 0, "sets_lost": 0})
+            v["matches"] += 1
+            v["sets_won"] += scored or 0
+            v["sets_lost"] += conceded or 0
+            if (scored or 0) > (conceded or 0):
+                v["wins"] += 1
+            elif (scored or 0) < (conceded or 0):
+                v["losses"] += 1
+
+    ranking_list = [
+        {"company": company, "matches_played": v["matches"], "wins": v["wins"], "losses": v["losses"],
+         "points": v["wins"] * 3, "sets_won": v["sets_won"], "sets_lost": v["sets_lost"]}
+        for company, v in stats.items()
+    ]
+    ranking_list.sort(key=lambda x: x["points"], reverse=True)
+    for idx, item in enumerate(ranking_list, start=1):
+        item["position"] = idx
+    return ranking_list
+
+
+def rankings_sql(db: Session) -> list:
+    """Classement agrégé par la base"""
+    return [dict(row._mapping) for row in db.execute(RANKINGS_FROM_MATCHES)]
+
+
+def rankings_table(db: Session) -> list:
+    """Classement lu dans company_standings"""
+    return [dict(row._mapping) for row in db.execute(RANKINGS)]
+
+
+def timings(fn, db: Session, runs: int) -> list:
+    durations = []
+    for _ in range(runs):
+        # Session vidée : l'avant recharge réellement ses objets
+        db.expunge_all()
+        start = time.perf_counter()
+        fn(db)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--matches", type=int, default=100000)
+    parser.add_argument("--teams", type=int, default=200)
+    parser.add_argument("--companies", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db, args.matches, args.teams, args.companies)
+            rebuild_standings(db)
+
+            python_rankings = rankings_python(db)
+            assert rankings_sql(db) == python_rankings, "SQL ranking differs from the Python ranking"
+            assert rankings_table(db) == python_rankings, "company_standings differs from the Python ranking"
+            print(f"{args.matches} matchs terminés, {len(python_rankings)} entreprises : classements identiques")
+
+            for label, fn in (("python", rankings_python), ("sql", rankings_sql), ("table", rankings_table)):
+                durations = timings(fn, db, args.runs)
+                print(f"{label:<7} médiane {statistics.median(durations):8.1f} ms   min {min(durations):8.1f} ms")
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
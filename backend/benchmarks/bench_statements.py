@@ -0,0 +1,128 @@
+"""
+Compare les requêtes chaudes reconstruites à chaque appel (code d'avant) et les
+select() précompilés de app.models.statements.
+
+Deux mesures par requête :
+- construction : bâtir l'objet requête et calculer sa clé de cache SQLAlchemy,
+  le travail fait avant de retrouver la forme compilée, sans la base ;
+- exécution : la requête complète sur une base SQLite en mémoire (une ligne).
+
+Usage (depuis backend/) : python -m benchmarks.bench_statements [--iterations 20000]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.database import Base
+from app.models.loaders import PLAYER_OPTIONS, TEAM_OPTIONS
+from app.models.models import Match, Player, Pool, Team, User
+from app.models.statements import MATCHES_BY_STATUS, PLAYER_BY_USER_ID, PRINCIPAL_BY_USER_ID, TEAMS_BY_POOL
+
+
+def seed(db: Session) -> None:
+    """Une poule, une équipe et ses deux joueurs"""
+    players = [
+        Player(
+            first_name=f"P{i}",
+            last_name="Bench",
+            company="ACME",
+            license_number=f"L10000{i}",
+            user=User(email=f"bench{i}@example.com", password_hash="x", role="JOUEUR"),
+        )
+        for i in range(2)
+    ]
+    db.add(Team(company="ACME", player1=players[0], player2=players[1], pool=Pool(name="Poule A")))
+    db.commit()
+
+
+def lookups(db: Session) -> dict:
+    """(avant, après) pour chaque requête chaude : (construction, exécution)"""
+    return {
+        "principal par user_id": (
+            (
+                lambda: db.query(User.id, User.role, User.is_active, Player.id, User.token_version)
+                .outerjoin(Player, Player.user_id == User.id)
+                .filter(User.id == 1),
+                lambda query: query.first(),
+            ),
+            (
+                lambda: PRINCIPAL_BY_USER_ID,
+                lambda statement: db.execute(statement, {"user_id": 1}).first(),
+            ),
+        ),
+        "joueur par user_id": (
+            (
+                lambda: select(Player).options(*PLAYER_OPTIONS).where(Player.user_id == 1)
+                .execution_options(populate_existing=True),
+                lambda statement: db.scalar(statement),
+            ),
+            (
+                lambda: PLAYER_BY_USER_ID,
+                lambda statement: db.scalar(statement, {"user_id": 1}),
+            ),
+        ),
+        "matchs par statut": (
+            (
+                lambda: select(Match).options(selectinload(Match.team1), selectinload(Match.team2))
+                .where(Match.status == "TERMINE"),
+                lambda statement: db.scalars(statement).all(),
+            ),
+            (
+                lambda: MATCHES_BY_STATUS,
+                lambda statement: db.scalars(statement, {"status": "TERMINE"}).all(),
+            ),
+        ),
+        "équipes par poule": (
+            (
+                lambda: select(Team).options(*TEAM_OPTIONS).where(Team.pool_id == 1),
+                lambda statement: db.scalars(statement).all(),
+            ),
+            (
+                lambda: TEAMS_BY_POOL,
+                lambda statement: db.scalars(statement, {"pool_id": 1}).all(),
+            ),
+        ),
+    }
+
+
+def cache_key(statement):
+    """Clé de cache calculée par SQLAlchemy à chaque exécution (Query : celle de son select)"""
+    if hasattr(statement, "statement"):
+        statement = statement.statement
+    return statement._generate_cache_key()
+
+
+def ops_per_second(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        seed(db)
+
+        print(f"{'requête':<24} {'':<6} {'construction/s':>15} {'exécution/s':>13}")
+        for name, ((build_before, run_before), (build_after, run_after)) in lookups(db).items():
+            for label, build, run in (("avant", build_before, run_before), ("après", build_after, run_after)):
+                # Préchauffe : cache de compilation du moteur
+                for _ in range(100):
+                    run(build())
+                construct = ops_per_second(lambda: cache_key(build()), args.iterations)
+                execute = ops_per_second(lambda: run(build()), args.iterations // 4)
+                print(f"{name:<24} {label:<6} {construct:>15,.0f} {execute:>13,.0f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
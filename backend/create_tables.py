@@ -1,11 +1,5 @@
-from sqlalchemy import create_engine
-from app.models.models import Base
+from app.core.migrations import upgrade
 
-# Créer les tables sans passer par init_db qui utilise bcrypt
-engine = create_engine(
-    "sqlite:///padel_corpo.db",
-    connect_args={"check_same_thread": False}
-)
-
-Base.metadata.create_all(bind=engine)
+# Créer ou mettre à jour les tables sans passer par init_db qui utilise bcrypt
+upgrade()
 print("✅ Tables créées avec succès!")
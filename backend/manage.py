@@ -0,0 +1,138 @@
+import argparse
+import sys
+import time
+
+from app.core.calibration import calibrate, suggest
+
+
+def calibrate_hashing(args):
+    """Mesure chaque schéma de hachage et propose les paramètres visant la latence cible"""
+    results = calibrate(args.target_ms, args.schemes, parallelism=args.parallelism, samples=args.samples)
+
+    for scheme, measures in results.items():
+        print(f"=== {scheme} ===")
+        for measure in measures:
+            params = ", ".join(f"{key}={value}" for key, value in measure.params.items())
+            print(f"  {params:<70} verify {measure.verify_ms:8.1f} ms")
+
+        best = suggest(measures, args.target_ms)
+        print(f"  Suggestion (cible {args.target_ms:.0f} ms) :")
+        for key, value in best.params.items():
+            print(f"    {key.upper()}={value}")
+        print()
+
+
+def import_players_file(args):
+    """Importe des joueurs depuis un fichier CSV ou NDJSON et affiche les lignes refusées"""
+    from app.core.player_import import import_players
+    from app.database import SessionLocal
+
+    fmt = args.format or ("ndjson" if args.path.lower().endswith((".ndjson", ".jsonl")) else "csv")
+    started_at = time.perf_counter()
+    with open(args.path, encoding="utf-8-sig", newline="") as lines, SessionLocal() as db:
+        report = import_players(db, lines, fmt, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - started_at
+
+    for error in report.errors:
+        print(f"  ligne {error.row} ({error.email or '?'}) : {error.message}")
+    print(f"{report.created} joueurs créés, {len(report.errors)} lignes refusées en {elapsed:.1f} s")
+    if report.errors:
+        sys.exit(1)
+
+
+def migrate(args):
+    """Crée ou met à jour le schéma de la base jusqu'à la révision demandée"""
+    from app.core.migrations import head_revision, upgrade
+
+    started_at = time.perf_counter()
+    try:
+        previous = upgrade(args.url, args.revision)
+    except RuntimeError as error:
+        print(f"Migration impossible : {error}")
+        sys.exit(1)
+    target = head_revision() if args.revision == "head" else args.revision
+    print(f"Base migrée de {previous or 'aucune révision'} à {target} en {time.perf_counter() - started_at:.1f} s")
+
+
+def rebuild_company_standings(args):
+    """Recalcule le classement des entreprises depuis les matchs et affiche les écarts avec la table"""
+    from app.core.standings import rebuild_standings
+    from app.database import SessionLocal
+
+    started_at = time.perf_counter()
+    with SessionLocal() as db:
+        differences = rebuild_standings(db, apply=not args.dry_run)
+    elapsed = time.perf_counter() - started_at
+
+    for difference in differences:
+        print(f"  {difference.company} : en base {difference.live or 'absente'}, recalculé {difference.expected or 'absente'}")
+    if args.dry_run:
+        print(f"{len(differences)} entreprises en écart (rien n'est modifié) en {elapsed:.1f} s")
+        if differences:
+            sys.exit(1)
+    else:
+        print(f"{len(differences)} entreprises corrigées en {elapsed:.1f} s")
+
+
+def rebuild_match_participants(args):
+    """Recopie les joueurs de chaque match depuis ses équipes et affiche les matchs en écart avec la table"""
+    from app.core.participants import rebuild_participants
+    from app.database import SessionLocal
+
+    started_at = time.perf_counter()
+    with SessionLocal() as db:
+        differences = rebuild_participants(db, apply=not args.dry_run)
+    elapsed = time.perf_counter() - started_at
+
+    if differences:
+        print(f"  matchs : {', '.join(str(match_id) for match_id in differences)}")
+    if args.dry_run:
+        print(f"{len(differences)} matchs en écart (rien n'est modifié) en {elapsed:.1f} s")
+        if differences:
+            sys.exit(1)
+    else:
+        print(f"{len(differences)} matchs corrigés en {elapsed:.1f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Commandes d'administration du backend Corpo Padel")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    calibrate_parser = commands.add_parser("calibrate-hashing", help="Calibre le coût du hachage des mots de passe")
+    calibrate_parser.add_argument("--target-ms", type=float, default=250.0, help="Latence de vérification visée")
+    calibrate_parser.add_argument("--schemes", nargs="+", default=["bcrypt", "argon2"], choices=["bcrypt", "argon2"])
+    calibrate_parser.add_argument("--parallelism", type=int, default=4, help="Parallélisme argon2")
+    calibrate_parser.add_argument("--samples", type=int, default=5, help="Vérifications mesurées par candidat")
+    calibrate_parser.set_defaults(handler=calibrate_hashing)
+
+    import_parser = commands.add_parser("import-players", help="Crée des joueurs depuis un fichier CSV ou NDJSON")
+    import_parser.add_argument("path", help="Fichier à importer (mêmes champs que la création d'un joueur)")
+    import_parser.add_argument("--format", choices=["csv", "ndjson"], help="Déduit de l'extension si absent")
+    import_parser.add_argument("--chunk-size", type=int, default=None, help="Lignes par transaction")
+    import_parser.set_defaults(handler=import_players_file)
+
+    migrate_parser = commands.add_parser("migrate", help="Applique les migrations du schéma (Alembic)")
+    migrate_parser.add_argument("revision", nargs="?", default="head", help="Révision à atteindre")
+    migrate_parser.add_argument("--url", default=None, help="Base à migrer, DATABASE_URL par défaut")
+    migrate_parser.set_defaults(handler=migrate)
+
+    standings_parser = commands.add_parser(
+        "rebuild-standings",
+        help="Recalcule company_standings depuis les matchs terminés (à lancer sans écriture de match en cours)",
+    )
+    standings_parser.add_argument("--dry-run", action="store_true", help="Affiche les écarts sans corriger la table")
+    standings_parser.set_defaults(handler=rebuild_company_standings)
+
+    participants_parser = commands.add_parser(
+        "rebuild-participants",
+        help="Remplit match_participants depuis les équipes des matchs (à lancer sans écriture de match en cours)",
+    )
+    participants_parser.add_argument("--dry-run", action="store_true", help="Affiche les écarts sans corriger la table")
+    participants_parser.set_defaults(handler=rebuild_match_participants)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# ============================================
+# FICHIER : backend/migrations/env.py
+# ============================================
+
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.models.models import Base
+
+config = context.config
+
+# Métadonnées des modèles : référence de `alembic revision --autogenerate`
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    """URL de la base à migrer : celle passée par manage.py, sinon DATABASE_URL"""
+    return config.get_main_option("sqlalchemy.url") or settings.database_url
+
+
+def configure(connection=None, url=None) -> None:
+    """Options communes aux deux modes"""
+    context.configure(
+        connection=connection,
+        url=url,
+        target_metadata=target_metadata,
+        # SQLite ne sait pas modifier une colonne : la table est recréée (batch)
+        render_as_batch=(connection.dialect.name if connection is not None else url.split(":")[0]).startswith("sqlite"),
+        # Une transaction par migration : une migration qui échoue ne défait pas les précédentes,
+        # et une migration peut sortir de sa transaction (CREATE INDEX CONCURRENTLY)
+        transaction_per_migration=True,
+        compare_type=True,
+    )
+
+
+def run_migrations_offline() -> None:
+    """Écrit le SQL des migrations sans se connecter (`alembic upgrade head --sql`)"""
+    configure(url=database_url())
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Applique les migrations sur la base, ou sur la connexion fournie par l'appelant"""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    # Pas de profil SQLite ici : foreign_keys=ON casserait la recréation des tables en batch
+    engine = create_engine(database_url(), poolclass=NullPool)
+    with engine.connect() as connection:
+        configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,151 @@
+"""initial schema
+
+Schéma d'origine, tel que le créait Base.metadata.create_all au démarrage.
+Une base existante créée ainsi est marquée à cette révision par
+`python manage.py migrate`, sans DDL.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 12:55:39.125946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_date', sa.Date(), nullable=False),
+    sa.Column('event_time', sa.Time(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_events_event_date'), 'events', ['event_date'], unique=False)
+
+    op.create_table('login_attempts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('attempts_count', sa.Integer(), nullable=True),
+    sa.Column('last_attempt', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_login_attempts_email'), 'login_attempts', ['email'], unique=True)
+    op.create_index(op.f('ix_login_attempts_id'), 'login_attempts', ['id'], unique=False)
+
+    op.create_table('pools',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('password_hash', sa.String(), nullable=False),
+    sa.Column('role', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('must_change_password', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+
+    op.create_table('players',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('first_name', sa.String(), nullable=False),
+    sa.Column('last_name', sa.String(), nullable=False),
+    sa.Column('company', sa.String(), nullable=False),
+    sa.Column('license_number', sa.String(), nullable=False),
+    sa.Column('birth_date', sa.Date(), nullable=True),
+    sa.Column('photo_url', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.CheckConstraint("length(license_number) = 7 AND substr(license_number, 1, 1) = 'L' AND ltrim(substr(license_number, 2), '0123456789') = ''", name='chk_license_format'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('license_number')
+    )
+    op.create_index(op.f('ix_players_user_id'), 'players', ['user_id'], unique=False)
+
+
+    op.create_table('teams',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('company', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('player1_id', sa.Integer(), nullable=False),
+    sa.Column('player2_id', sa.Integer(), nullable=False),
+    sa.Column('pool_id', sa.Integer(), nullable=True),
+    sa.CheckConstraint('player1_id != player2_id', name='chk_different_players'),
+    sa.ForeignKeyConstraint(['player1_id'], ['players.id'], ),
+    sa.ForeignKeyConstraint(['player2_id'], ['players.id'], ),
+    sa.ForeignKeyConstraint(['pool_id'], ['pools.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_teams_player1_id'), 'teams', ['player1_id'], unique=False)
+    op.create_index(op.f('ix_teams_player2_id'), 'teams', ['player2_id'], unique=False)
+    op.create_index(op.f('ix_teams_pool_id'), 'teams', ['pool_id'], unique=False)
+
+    op.create_table('matches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('court_number', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('score_team1', sa.Integer(), nullable=True),
+    sa.Column('score_team2', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('team1_id', sa.Integer(), nullable=False),
+    sa.Column('team2_id', sa.Integer(), nullable=False),
+    sa.CheckConstraint('team1_id != team2_id', name='chk_different_teams'),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.ForeignKeyConstraint(['team1_id'], ['teams.id'], ),
+    sa.ForeignKeyConstraint(['team2_id'], ['teams.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_matches_id'), 'matches', ['id'], unique=False)
+    op.create_index(op.f('ix_matches_status'), 'matches', ['status'], unique=False)
+    op.create_index(op.f('ix_matches_team1_id'), 'matches', ['team1_id'], unique=False)
+    op.create_index(op.f('ix_matches_team2_id'), 'matches', ['team2_id'], unique=False)
+
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_matches_team2_id'), table_name='matches')
+    op.drop_index(op.f('ix_matches_team1_id'), table_name='matches')
+    op.drop_index(op.f('ix_matches_status'), table_name='matches')
+    op.drop_index(op.f('ix_matches_id'), table_name='matches')
+    op.drop_table('matches')
+    op.drop_index(op.f('ix_teams_pool_id'), table_name='teams')
+    op.drop_index(op.f('ix_teams_player2_id'), table_name='teams')
+    op.drop_index(op.f('ix_teams_player1_id'), table_name='teams')
+    op.drop_table('teams')
+    op.drop_index(op.f('ix_players_user_id'), table_name='players')
+    op.drop_table('players')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
+    op.drop_table('pools')
+    op.drop_index(op.f('ix_login_attempts_id'), table_name='login_attempts')
+    op.drop_index(op.f('ix_login_attempts_email'), table_name='login_attempts')
+    op.drop_table('login_attempts')
+    op.drop_index(op.f('ix_events_event_date'), table_name='events')
+    op.drop_table('events')
@@ -0,0 +1,90 @@
+"""token revocation and last login
+
+Colonnes et tables ajoutées depuis le schéma d'origine : version des tokens,
+dernière connexion, liste de révocation et refresh tokens. L'ancien create_all
+du démarrage a pu créer les tables mais pas les colonnes : seul ce qui manque est créé.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 13:10:02.481907
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def existing_schema():
+    """Tables et colonnes de users déjà présentes (tout est à créer en mode --sql)"""
+    if context.is_offline_mode():
+        return set(), set()
+    inspector = sa.inspect(op.get_bind())
+    return set(inspector.get_table_names()), {column["name"] for column in inspector.get_columns('users')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables, user_columns = existing_schema()
+
+    # ADD COLUMN avec une valeur par défaut constante : pas de réécriture de la table
+    if 'token_version' not in user_columns:
+        op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+    if 'last_login_at' not in user_columns:
+        op.add_column('users', sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True))
+
+    if 'token_revocations' not in tables:
+        create_token_revocations()
+    if 'refresh_tokens' not in tables:
+        create_refresh_tokens()
+
+
+def create_token_revocations() -> None:
+    op.create_table('token_revocations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('jti', sa.String(), nullable=True),
+    sa.Column('token_version', sa.Integer(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_token_revocations_expires_at'), 'token_revocations', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_token_revocations_user_id'), 'token_revocations', ['user_id'], unique=False)
+
+
+def create_refresh_tokens() -> None:
+    op.create_table('refresh_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token_hash', sa.String(), nullable=False),
+    sa.Column('family_id', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_refresh_tokens_family_id'), 'refresh_tokens', ['family_id'], unique=False)
+    op.create_index(op.f('ix_refresh_tokens_user_id'), 'refresh_tokens', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_tokens_user_id'), table_name='refresh_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_family_id'), table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
+    op.drop_index(op.f('ix_token_revocations_user_id'), table_name='token_revocations')
+    op.drop_index(op.f('ix_token_revocations_expires_at'), table_name='token_revocations')
+    op.drop_table('token_revocations')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('last_login_at')
+        batch_op.drop_column('token_version')
@@ -0,0 +1,86 @@
+"""company standings
+
+Classement des entreprises tenu à jour à chaque écriture de match. La table est
+remplie depuis les matchs terminés existants (mêmes règles que
+app.core.standings : score absent compté 0, 3 points par victoire). Une base
+créée par create_all avec les modèles actuels a déjà la table : elle n'est
+remplie que si elle est vide.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 16:42:10.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = """
+INSERT INTO company_standings (company, matches_played, wins, losses, points, sets_won, sets_lost, first_seen)
+SELECT company, COUNT(*), SUM(won), SUM(lost), SUM(won) * 3, SUM(sets_won), SUM(sets_lost), MIN(first_seen)
+FROM (
+    SELECT t.company, m.id * 2 AS first_seen,
+           COALESCE(m.score_team1, 0) AS sets_won, COALESCE(m.score_team2, 0) AS sets_lost,
+           CASE WHEN COALESCE(m.score_team1, 0) > COALESCE(m.score_team2, 0) THEN 1 ELSE 0 END AS won,
+           CASE WHEN COALESCE(m.score_team1, 0) < COALESCE(m.score_team2, 0) THEN 1 ELSE 0 END AS lost
+    FROM matches m JOIN teams t ON t.id = m.team1_id
+    WHERE m.status = 'TERMINE'
+    UNION ALL
+    SELECT t.company, m.id * 2 + 1,
+           COALESCE(m.score_team2, 0), COALESCE(m.score_team1, 0),
+           CASE WHEN COALESCE(m.score_team2, 0) > COALESCE(m.score_team1, 0) THEN 1 ELSE 0 END,
+           CASE WHEN COALESCE(m.score_team2, 0) < COALESCE(m.score_team1, 0) THEN 1 ELSE 0 END
+    FROM matches m JOIN teams t ON t.id = m.team2_id
+    WHERE m.status = 'TERMINE'
+) sides
+GROUP BY company
+"""
+
+
+def existing_rows():
+    """None si la table n'existe pas, sinon son nombre de lignes (table à créer en mode --sql)"""
+    if context.is_offline_mode():
+        return None
+    bind = op.get_bind()
+    if 'company_standings' not in sa.inspect(bind).get_table_names():
+        return None
+    return bind.execute(sa.text("SELECT COUNT(*) FROM company_standings")).scalar()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rows = existing_rows()
+    if rows is None:
+        create_company_standings()
+    if not rows:
+        op.execute(BACKFILL)
+
+
+def create_company_standings() -> None:
+    op.create_table('company_standings',
+    sa.Column('company', sa.String(), nullable=False),
+    sa.Column('matches_played', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.Column('sets_won', sa.Integer(), nullable=False),
+    sa.Column('sets_lost', sa.Integer(), nullable=False),
+    sa.Column('first_seen', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('company')
+    )
+    op.create_index('ix_company_standings_ranking', 'company_standings', [sa.literal_column('points DESC'), 'first_seen'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_company_standings_ranking', table_name='company_standings')
+    op.drop_table('company_standings')
@@ -0,0 +1,80 @@
+"""workload indexes
+
+Index tirés des requêtes réelles :
+- matches.event_id : matchs d'un évènement (Event.matches, jointure upcoming) ;
+- matches (status, id) : pages d'un statut dans l'ordre des ids, remplace ix_matches_status ;
+- events (event_date, event_time) : recherche d'un évènement à la modification
+  d'un match et intervalles de dates, remplace ix_events_event_date. Pas unique :
+  un match créé sans évènement a son propre évènement du jour ;
+- teams.company et players.company : filtres par entreprise.
+
+PostgreSQL : index construits avec CONCURRENTLY, sans bloquer les écritures.
+Une base créée par create_all avec les modèles actuels a déjà ces index : seuls
+ceux qui manquent sont créés.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 18:05:31.640112
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nom, table, colonnes)
+ADDED = (
+    ('ix_matches_event_id', 'matches', ['event_id']),
+    ('ix_matches_status_id', 'matches', ['status', 'id']),
+    ('ix_events_event_date_time', 'events', ['event_date', 'event_time']),
+    ('ix_teams_company', 'teams', ['company']),
+    ('ix_players_company', 'players', ['company']),
+)
+
+# Préfixes des nouveaux index composites
+REPLACED = (
+    ('ix_matches_status', 'matches', ['status']),
+    ('ix_events_event_date', 'events', ['event_date']),
+)
+
+
+def existing_indexes():
+    """Noms des index des tables concernées (tous à créer en mode --sql)"""
+    if context.is_offline_mode():
+        return None
+    inspector = sa.inspect(op.get_bind())
+    return {
+        index['name']
+        for table in ('matches', 'events', 'teams', 'players')
+        for index in inspector.get_indexes(table)
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = existing_indexes()
+    # CREATE INDEX CONCURRENTLY ne s'exécute pas dans une transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in ADDED:
+            if existing is None or name not in existing:
+                op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for name, table, _ in REPLACED:
+            if existing is None or name in existing:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for name, table, _ in ADDED:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,81 @@
+"""match participants
+
+Joueurs de chaque match recopiés depuis ses équipes, indexés par
+(player_id, match_id) : les matchs, évènements et résultats d'un joueur sont
+lus sans joindre les équipes avec des OR. La table est remplie depuis les
+matchs existants (mêmes règles que app.models.statements.participants_statement :
+un joueur des deux équipes n'est que du côté de l'équipe 1). Une base créée par
+create_all avec les modèles actuels a déjà la table : elle n'est remplie que si
+elle est vide.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 19:12:47.503318
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = """
+INSERT INTO match_participants (match_id, player_id, team_id, side)
+SELECT m.id, t1.player1_id, t1.id, 1 FROM matches m JOIN teams t1 ON t1.id = m.team1_id
+UNION ALL
+SELECT m.id, t1.player2_id, t1.id, 1 FROM matches m JOIN teams t1 ON t1.id = m.team1_id
+UNION ALL
+SELECT m.id, t2.player1_id, t2.id, 2
+FROM matches m JOIN teams t1 ON t1.id = m.team1_id JOIN teams t2 ON t2.id = m.team2_id
+WHERE t2.player1_id NOT IN (t1.player1_id, t1.player2_id)
+UNION ALL
+SELECT m.id, t2.player2_id, t2.id, 2
+FROM matches m JOIN teams t1 ON t1.id = m.team1_id JOIN teams t2 ON t2.id = m.team2_id
+WHERE t2.player2_id NOT IN (t1.player1_id, t1.player2_id)
+"""
+
+
+def existing_rows():
+    """None si la table n'existe pas, sinon son nombre de lignes (table à créer en mode --sql)"""
+    if context.is_offline_mode():
+        return None
+    bind = op.get_bind()
+    if 'match_participants' not in sa.inspect(bind).get_table_names():
+        return None
+    return bind.execute(sa.text("SELECT COUNT(*) FROM match_participants")).scalar()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rows = existing_rows()
+    if rows is None:
+        create_match_participants()
+    if not rows:
+        op.execute(BACKFILL)
+
+
+def create_match_participants() -> None:
+    op.create_table('match_participants',
+    sa.Column('match_id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('side', sa.Integer(), sa.CheckConstraint('side IN (1, 2)'), nullable=False),
+    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('match_id', 'player_id')
+    )
+    op.create_index('ix_match_participants_player_match', 'match_participants', ['player_id', 'match_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_match_participants_player_match', table_name='match_participants')
+    op.drop_table('match_participants')
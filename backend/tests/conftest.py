@@ -2,24 +2,58 @@
 # FICHIER : backend/tests/conftest.py
 # ============================================
 
+import os
 from datetime import date, time
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.sql import func
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.main import app
-from app.database import Base, get_db
+from app.database import (
+    Base, engine_options, get_async_db, get_db, get_read_db, read_engine_options, to_async_url, to_read_only_url,
+)
 from app.models.models import Event, Match, User, Player
+from app.core.cache import Principal, principal_cache
+from app.core.participants import rebuild_participants
+from app.core.login_attempts import DatabaseAttemptBackend, login_attempts
+from app.core.revocation import revocation_list
+from app.core.query_stats import instrument_engine, query_metrics
+from app.core.sqlite import configure_sqlite
 from app.core.security import get_password_hash
 from app.api.deps import get_current_user, get_current_admin
 from fastapi import HTTPException, status
 
-# Base de données de test en mémoire
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+# Base de données de test : SQLite par défaut, TEST_DATABASE_URL pour PostgreSQL
+SQLALCHEMY_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "sqlite:///./test.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+configure_sqlite(engine, "test")
+instrument_engine(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Tentatives de connexion partagées, comme en production, dans la base de test
+login_attempts.backend = DatabaseAttemptBackend(TestingSessionLocal)
+
+# Même base pour les routes async. TestClient ouvre une boucle par requête :
+# pas de pool, une connexion async ne peut pas changer de boucle
+async_engine = create_async_engine(to_async_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+configure_sqlite(async_engine.sync_engine, "test")
+instrument_engine(async_engine.sync_engine)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Routes GET : même base ouverte en lecture seule, comme en production
+READ_DATABASE_URL = to_read_only_url(to_async_url(SQLALCHEMY_DATABASE_URL))
+read_engine = create_async_engine(
+    READ_DATABASE_URL,
+    poolclass=NullPool,
+    connect_args=read_engine_options(READ_DATABASE_URL).get("connect_args", {}),
+)
+configure_sqlite(read_engine.sync_engine, "test", read_only=True)
+instrument_engine(read_engine.sync_engine)
+TestingReadSessionLocal = async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False)
+
 @pytest.fixture(scope="function")
 def test_db():
     """Crée une base de données de test"""
@@ -45,10 +79,34 @@ def client(db_session):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
+    async def override_get_read_db():
+        async with TestingReadSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    principal_cache.clear()
+    revocation_list.clear()
+    login_attempts.clear()
+    query_metrics.clear()
     yield TestClient(app)
     app.dependency_overrides.clear()
 
+@pytest.fixture
+def assert_max_queries():
+    """Vérifie qu'une réponse n'a pas émis plus de `limit` requêtes SQL (en-tête X-DB-Queries)"""
+    def check(response, limit):
+        count = int(response.headers["X-DB-Queries"])
+        request = response.request
+        assert count <= limit, f"{request.method} {request.url.path}: {count} SQL queries, expected at most {limit}"
+        return count
+    return check
+
 @pytest.fixture
 def test_user(db_session):
     """Crée un utilisateur de test"""
@@ -98,14 +156,17 @@ def test_admin(db_session):
 
 @pytest.fixture
 def auth_user(client, test_user):
-    app.dependency_overrides[get_current_user] = lambda: test_user
+    # Principal construit une fois : pas de requête SQL du fixture dans les comptages des endpoints
+    principal = Principal.from_user(test_user)
+    app.dependency_overrides[get_current_user] = lambda: principal
     yield
     app.dependency_overrides.pop(get_current_user, None)
 
 @pytest.fixture
 def auth_admin(client, test_admin):
-    app.dependency_overrides[get_current_user] = lambda: test_admin
-    app.dependency_overrides[get_current_admin] = lambda: test_admin
+    principal = Principal.from_user(test_admin)
+    app.dependency_overrides[get_current_user] = lambda: principal
+    app.dependency_overrides[get_current_admin] = lambda: principal
     yield
     app.dependency_overrides.pop(get_current_user, None)
     app.dependency_overrides.pop(get_current_admin, None)
@@ -131,7 +192,8 @@ def auth_user_forbidden(client, test_user):
             detail="Forbidden"
         )
 
-    app.dependency_overrides[get_current_user] = lambda: test_user
+    principal = Principal.from_user(test_user)
+    app.dependency_overrides[get_current_user] = lambda: principal
     app.dependency_overrides[get_current_admin] = forbidden
     yield
     app.dependency_overrides.clear()
@@ -211,6 +273,8 @@ def event(db_session, teams):
 
     db_session.add(match)
     db_session.commit()
+    # Match inséré sans passer par l'API : participants recopiés
+    rebuild_participants(db_session)
     db_session.refresh(event)
 
     return event
@@ -234,6 +298,8 @@ def event_with_finished_match(db_session, teams):
 
     db_session.add(match)
     db_session.commit()
+    # Match inséré sans passer par l'API : participants recopiés
+    rebuild_participants(db_session)
     db_session.refresh(event)
 
     return event
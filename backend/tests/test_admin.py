@@ -49,3 +49,261 @@ def test_reset_password_not_found_player(client, auth_admin, db_session):
     )
 
     assert response.status_code == 404
+
+
+
+def test_metrics_ok(client, auth_admin):
+    response = client.get("/api/v1/admin/metrics")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert "hits" in data["principal_cache"]
+    assert "queue_depth" in data["password_hasher"]
+
+
+
+IMPORT_HEADER = "first_name,last_name,company,license_number,email,password,role,birth_date,photo_url\n"
+
+
+def test_import_players_csv_ok(client, auth_admin, db_session):
+    from app.models.models import Player
+    from app.core.security import verify_password
+
+    content = IMPORT_HEADER + (
+        "Alice,Martin,ACME,L200001,alice@test.com,Secret123!,JOUEUR,1990-01-01,\n"
+        "Bob,Durand,ACME,L200002,bob@test.com,Secret456!,JOUEUR,,\n"
+    )
+    response = client.post(
+        "/api/v1/admin/players/import",
+        files={"file": ("players.csv", content, "text/csv")},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"created": 2, "failed": 0, "errors": []}
+
+    player = db_session.query(Player).filter(Player.license_number == "L200001").one()
+    assert player.user.email == "alice@test.com"
+    assert player.user.must_change_password is True
+    assert verify_password("Secret123!", player.user.password_hash)
+
+
+
+def test_import_players_reports_errors_per_row(client, auth_admin, db_session, test_user):
+    content = IMPORT_HEADER + (
+        "Alice,Martin,ACME,L200001,alice@test.com,Secret123!,JOUEUR,,\n"
+        "Bis,Martin,ACME,L200003,alice@test.com,Secret123!,JOUEUR,,\n"
+        "Old,User,ACME,L200004,test@example.com,Secret123!,JOUEUR,,\n"
+        "Same,License,ACME,L111151,same@test.com,Secret123!,JOUEUR,,\n"
+        "Bad,License,ACME,X1,bad@test.com,Secret123!,JOUEUR,,\n"
+        "Bad,Role,ACME,L200005,role@test.com,Secret123!,CHEF,,\n"
+    )
+    response = client.post(
+        "/api/v1/admin/players/import",
+        files={"file": ("players.csv", content, "text/csv")},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 1
+    assert data["failed"] == 5
+    errors = {error["row"]: error["message"] for error in data["errors"]}
+    assert errors[2] == "Duplicate email in file"
+    assert errors[3] == "Email already exists"
+    assert errors[4] == "License already exists"
+    assert errors[5].startswith("license_number")
+    assert errors[6].startswith("role")
+
+
+
+def test_import_players_ndjson_in_chunks(client, auth_admin, db_session, monkeypatch):
+    from app.core.config import settings
+    from app.models.models import Player
+
+    monkeypatch.setattr(settings, "import_chunk_size", 2)
+    content = "\n".join(
+        f'{{"first_name": "P{i}", "last_name": "N", "company": "ACME", "license_number": "L3000{i:02d}", '
+        f'"email": "n{i}@test.com", "password": "Secret123!", "role": "JOUEUR"}}'
+        for i in range(5)
+    ) + "\nnot json\n"
+    response = client.post(
+        "/api/v1/admin/players/import",
+        files={"file": ("players.ndjson", content, "application/x-ndjson")},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 5
+    assert data["errors"][0]["row"] == 6
+    assert db_session.query(Player).filter(Player.license_number.like("L3000%")).count() == 5
+
+
+
+def test_import_players_csv_field_too_large(client, auth_admin, db_session):
+    import csv
+
+    # Champ au-delà de csv.field_size_limit() : une erreur de ligne, pas une 500
+    content = IMPORT_HEADER + (
+        "Alice,Martin,ACME,L200001,alice@test.com,Secret123!,JOUEUR,,\n"
+        f"Bob,Durand,ACME,L200002,bob@test.com,Secret456!,JOUEUR,,{'x' * (csv.field_size_limit() + 1)}\n"
+    )
+    response = client.post(
+        "/api/v1/admin/players/import",
+        files={"file": ("players.csv", content, "text/csv")},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 1
+    assert data["failed"] == 1
+    assert data["errors"][0]["row"] == 2
+    assert data["errors"][0]["message"].startswith("Invalid CSV: field larger than field limit")
+
+
+
+def test_import_players_ndjson_non_string_email(client, auth_admin):
+    content = '{"email": 123, "first_name": "B"}\n'
+    response = client.post(
+        "/api/v1/admin/players/import?format=ndjson",
+        files={"file": ("players.ndjson", content, "application/x-ndjson")},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 0
+    assert data["errors"][0]["row"] == 1
+    assert data["errors"][0]["email"] is None
+
+
+
+def test_import_players_forbidden(client, auth_user):
+    response = client.post(
+        "/api/v1/admin/players/import",
+        files={"file": ("players.csv", IMPORT_HEADER, "text/csv")},
+    )
+
+    assert response.status_code == 403
+
+
+
+def test_batch_reset_password_by_company(client, auth_admin, db_session, players):
+    from app.core.security import verify_password
+
+    response = client.post("/api/v1/admin/accounts/batch/reset-password", json={"company": "ACME"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 12
+    account = data["accounts"][0]
+    user = db_session.get(User, account["user_id"])
+    db_session.refresh(user)
+    assert verify_password(account["temporary_password"], user.password_hash)
+    assert user.must_change_password is True
+    assert user.token_version == 1
+
+
+
+def test_batch_reset_password_download(client, auth_admin, db_session, players):
+    ids = [player.user_id for player in players[:3]]
+
+    response = client.post(
+        "/api/v1/admin/accounts/batch/reset-password?download=true",
+        json={"user_ids": ids},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.strip().splitlines()
+    assert lines[0] == "user_id,email,temporary_password"
+    assert [int(line.split(",")[0]) for line in lines[1:]] == sorted(ids)
+
+
+
+def test_batch_reset_password_failed_chunk(client, auth_admin, db_session, players, monkeypatch):
+    from app.core import account_batch
+    from app.core.config import settings
+    from app.core.security import get_password_hash, verify_password
+
+    monkeypatch.setattr(settings, "admin_batch_chunk_size", 2)
+    ids = sorted(player.user_id for player in players[:5])
+    calls = []
+
+    def failing_hash(password):
+        # Le deuxième lot (3e et 4e hachages) échoue
+        calls.append(password)
+        if len(calls) in (3, 4):
+            raise RuntimeError("hashing failed")
+        return get_password_hash(password)
+
+    monkeypatch.setattr(account_batch, "get_password_hash", failing_hash)
+    response = client.post("/api/v1/admin/accounts/batch/reset-password", json={"user_ids": ids})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["failed_user_ids"] == ids[2:4]
+    assert [account["user_id"] for account in data["accounts"]] == ids[:2] + ids[4:]
+    db_session.expire_all()
+    for account in data["accounts"]:
+        assert verify_password(account["temporary_password"], db_session.get(User, account["user_id"]).password_hash)
+    assert [db_session.get(User, user_id).token_version for user_id in ids[2:4]] == [0, 0]
+
+
+
+def test_batch_deactivate_and_reactivate(client, auth_admin, db_session, players, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "admin_batch_chunk_size", 2)
+    ids = [player.user_id for player in players[:5]]
+
+    response = client.post("/api/v1/admin/accounts/batch/deactivate", json={"user_ids": ids})
+    assert response.status_code == 200
+    assert response.json() == {"count": 5, "user_ids": sorted(ids)}
+    db_session.expire_all()
+    assert all(not db_session.get(User, user_id).is_active for user_id in ids)
+    assert db_session.get(User, ids[0]).token_version == 1
+
+    # Déjà désactivés : rien ne change
+    response = client.post("/api/v1/admin/accounts/batch/deactivate", json={"user_ids": ids})
+    assert response.json()["count"] == 0
+
+    response = client.post("/api/v1/admin/accounts/batch/reactivate", json={"user_ids": ids, "role": "JOUEUR"})
+    assert response.json()["count"] == 5
+    db_session.expire_all()
+    assert all(db_session.get(User, user_id).is_active for user_id in ids)
+
+
+
+def test_batch_deactivate_inactive_since(client, auth_admin, db_session, players):
+    from datetime import datetime
+
+    players[0].user.last_login_at = datetime(2020, 1, 1)
+    players[1].user.last_login_at = datetime(2099, 1, 1)
+    db_session.commit()
+
+    response = client.post(
+        "/api/v1/admin/accounts/batch/deactivate",
+        json={"company": "ACME", "inactive_since": "2021-01-01T00:00:00"},
+    )
+
+    assert response.json()["user_ids"] == [players[0].user_id]
+
+
+
+def test_batch_never_selects_the_admin(client, auth_admin, test_admin):
+    response = client.post("/api/v1/admin/accounts/batch/deactivate", json={"role": "ADMINISTRATEUR"})
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 0
+
+
+
+def test_batch_requires_a_criterion(client, auth_admin):
+    response = client.post("/api/v1/admin/accounts/batch/deactivate", json={})
+
+    assert response.status_code == 422
+
+
+
+def test_batch_forbidden(client, auth_user):
+    response = client.post("/api/v1/admin/accounts/batch/deactivate", json={"company": "ACME"})
+
+    assert response.status_code == 403
@@ -33,6 +33,19 @@ def test_login_success_admin(client, test_admin):
     assert data["user"]["email"] == "admin@example.com"
     assert data["user"]["role"] == "ADMINISTRATEUR"
 
+def test_login_records_last_login(client, db_session, test_user):
+    """Test la date de dernière connexion (sélection des comptes inactifs)"""
+    assert test_user.last_login_at is None
+
+    response = client.post("/api/v1/auth/login", json={
+        "email": "test@example.com",
+        "password": "ValidP@ssw0rd123"
+    })
+
+    assert response.status_code == status.HTTP_200_OK
+    db_session.refresh(test_user)
+    assert test_user.last_login_at is not None
+
 def test_login_invalid_email(client, test_user):
     """Test connexion avec email invalide"""
     response = client.post("/api/v1/auth/login", json={
@@ -178,4 +191,176 @@ def test_invalid_token(client):
     headers = {"Authorization": "Bearer invalid_token"}
     response = client.post("/api/v1/auth/logout", headers=headers)
     
-    assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_token_verification_uses_principal_cache(client, test_user):
+    """Test que le deuxième appel authentifié ne relit pas l'utilisateur"""
+    from app.core.cache import principal_cache
+
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": "test@example.com",
+        "password": "ValidP@ssw0rd123"
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    client.post("/api/v1/auth/logout", headers=headers)
+    client.post("/api/v1/auth/logout", headers=headers)
+
+    stats = principal_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+def test_change_password_invalidates_principal_cache(client, test_user):
+    """Test que le changement de mot de passe vide le cache de l'utilisateur"""
+    from app.core.cache import principal_cache
+
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": "test@example.com",
+        "password": "ValidP@ssw0rd123"
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    client.post("/api/v1/auth/change-password", headers=headers, json={
+        "current_password": "ValidP@ssw0rd123",
+        "new_password": "NewP@ssw0rd123!",
+        "confirm_password": "NewP@ssw0rd123!"
+    })
+
+    assert principal_cache.stats()["size"] == 0
+
+def test_logout_revokes_token(client, test_user):
+    """Test qu'un token n'est plus accepté après la déconnexion"""
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": "test@example.com",
+        "password": "ValidP@ssw0rd123"
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == status.HTTP_200_OK
+
+    response = client.post("/api/v1/auth/logout", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert "révoqué" in response.json()["detail"]
+
+def test_change_password_revokes_previous_tokens(client, test_user):
+    """Test que le changement de mot de passe révoque les anciens tokens"""
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": "test@example.com",
+        "password": "ValidP@ssw0rd123"
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    client.post("/api/v1/auth/change-password", headers=headers, json={
+        "current_password": "ValidP@ssw0rd123",
+        "new_password": "NewP@ssw0rd123!",
+        "confirm_password": "NewP@ssw0rd123!"
+    })
+
+    response = client.post("/api/v1/auth/logout", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_stateless_mode_trusts_token_claims(client, db_session, test_user, monkeypatch):
+    """Test qu'en mode stateless l'autorisation ne lit pas la table users"""
+    from sqlalchemy import event
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "auth_mode", "stateless")
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": "test@example.com",
+        "password": "ValidP@ssw0rd123"
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        response = client.get("/api/v1/teams", headers=headers)
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not any("FROM users" in statement for statement in statements)
+
+def test_stateful_mode_reads_principal(client, test_user, monkeypatch):
+    """Test qu'en mode stateful l'autorisation relit l'utilisateur et son joueur"""
+    from app.core.cache import principal_cache
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "auth_mode", "stateful")
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": "test@example.com",
+        "password": "ValidP@ssw0rd123"
+    })
+    token = login_response.json()["access_token"]
+
+    response = client.get("/api/v1/profile/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == status.HTTP_200_OK
+    principal = principal_cache.get(token)
+    assert principal.id == test_user.id
+    assert principal.player_id == test_user.player.id
+
+def login_tokens(client):
+    """Connecte l'utilisateur de test et retourne la réponse"""
+    return client.post("/api/v1/auth/login", json={
+        "email": "test@example.com",
+        "password": "ValidP@ssw0rd123"
+    }).json()
+
+def test_refresh_token_rotation(client, test_user):
+    """Test de la rotation du refresh token"""
+    tokens = login_tokens(client)
+    assert tokens["refresh_token"]
+
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["refresh_token"] != tokens["refresh_token"]
+    assert data["user"]["email"] == "test@example.com"
+
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == status.HTTP_200_OK
+
+def test_refresh_token_reuse_revokes_family(client, test_user):
+    """Test que la réutilisation d'un refresh token révoque toute la famille"""
+    tokens = login_tokens(client)
+    rotated = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+
+    reused = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reused.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_refresh_token_invalid(client, test_user):
+    """Test avec un refresh token inconnu"""
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": "unknown"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_logout_revokes_refresh_token(client, test_user):
+    """Test que la déconnexion révoque le refresh token fourni"""
+    tokens = login_tokens(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    client.post("/api/v1/auth/logout", headers=headers, json={"refresh_token": tokens["refresh_token"]})
+
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_login_rehashes_outdated_hash(client, db_session, test_user):
+    """Test du re-hachage transparent d'un hash obsolète à la connexion"""
+    from app.core.security import build_password_context, needs_rehash
+
+    test_user.password_hash = build_password_context(schemes=["bcrypt"], bcrypt_rounds=4).hash("ValidP@ssw0rd123")
+    db_session.commit()
+
+    response = client.post("/api/v1/auth/login", json={
+        "email": "test@example.com",
+        "password": "ValidP@ssw0rd123"
+    })
+
+    assert response.status_code == status.HTTP_200_OK
+    db_session.refresh(test_user)
+    assert needs_rehash(test_user.password_hash) is False
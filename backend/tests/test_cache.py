@@ -0,0 +1,56 @@
+import time
+
+from app.core.cache import Principal, PrincipalCache
+
+
+def make_principal(user_id=1):
+    return Principal(id=user_id, role="JOUEUR", is_active=True, player_id=10)
+
+
+
+def test_cache_hit_and_miss():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+
+    assert cache.get("token") is None
+    cache.set("token", make_principal())
+    assert cache.get("token") == make_principal()
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    cache.set("a", make_principal(1))
+    cache.set("b", make_principal(2))
+    cache.get("a")
+    cache.set("c", make_principal(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+
+def test_cache_ttl_capped_by_token_exp():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.set("token", make_principal(), token_exp=time.time() - 1)
+
+    assert cache.get("token") is None
+
+
+
+def test_cache_invalidate_user():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.set("a", make_principal(1))
+    cache.set("b", make_principal(1))
+    cache.set("c", make_principal(2))
+
+    cache.invalidate_user(1)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
@@ -0,0 +1,89 @@
+import pytest
+from app.database import to_async_url
+
+
+def test_to_async_url_sqlite():
+    assert to_async_url("sqlite:///./padel_corpo.db") == "sqlite+aiosqlite:///./padel_corpo.db"
+
+
+
+def test_to_async_url_postgresql():
+    url = to_async_url("postgresql+psycopg2://padel:secret@db:5432/padel")
+
+    assert url == "postgresql+asyncpg://padel:secret@db:5432/padel"
+
+
+
+def test_to_async_url_unknown_driver():
+    with pytest.raises(ValueError):
+        to_async_url("mysql://padel@db/padel")
+
+
+
+def test_to_read_only_url_sqlite():
+    from app.database import to_read_only_url
+
+    url = to_read_only_url("sqlite+aiosqlite:///./padel_corpo.db")
+
+    assert url == "sqlite+aiosqlite:///file%3A./padel_corpo.db?mode=ro&uri=true"
+
+
+
+def test_to_read_only_url_server_unchanged():
+    from app.database import to_read_only_url
+
+    assert to_read_only_url("postgresql+asyncpg://padel@replica/padel") == "postgresql+asyncpg://padel@replica/padel"
+    assert to_read_only_url("sqlite+aiosqlite://") == "sqlite+aiosqlite://"
+
+
+
+def test_read_engine_options_postgresql():
+    from app.database import read_engine_options
+
+    options = read_engine_options("postgresql+asyncpg://padel@replica/padel")
+
+    assert options["connect_args"] == {"server_settings": {"default_transaction_read_only": "on"}}
+
+
+
+def test_engine_options_sqlite():
+    from app.database import engine_options
+
+    assert engine_options("sqlite:///./padel_corpo.db") == {"connect_args": {"check_same_thread": False}}
+    assert engine_options("sqlite+aiosqlite:///./padel_corpo.db") == {}
+
+
+
+def test_engine_options_postgresql():
+    from app.core.config import settings
+    from app.database import engine_options
+
+    options = engine_options("postgresql+asyncpg://padel@db/padel")
+
+    assert options["pool_size"] == settings.db_pool_size
+    assert options["max_overflow"] == settings.db_max_overflow
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == settings.db_pool_recycle
+
+
+
+@pytest.mark.parametrize("license_number, valid", [
+    ("L123456", True),
+    ("L000000", True),
+    ("l123456", False),
+    ("L12345", False),
+    ("L1234567", False),
+    ("L12a456", False),
+    ("X123456", False),
+])
+def test_license_constraint(db_session, license_number, valid):
+    from sqlalchemy.exc import IntegrityError
+    from app.models.models import Player
+
+    db_session.add(Player(first_name="A", last_name="B", company="C", license_number=license_number))
+
+    if valid:
+        db_session.commit()
+    else:
+        with pytest.raises(IntegrityError):
+            db_session.commit()
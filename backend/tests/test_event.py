@@ -32,6 +32,21 @@ def test_list_events_ok(client, auth_user):
 
 
 
+def test_list_events_mine(client, auth_user, event, teams):
+    from app.main import app
+    from app.api.deps import get_current_user
+    from app.core.cache import Principal
+
+    res = client.get("/api/v1/events?mine=true&all=true")
+    assert res.json()["total"] == 0
+
+    app.dependency_overrides[get_current_user] = lambda: Principal.from_user(teams[0].player1.user)
+    res = client.get("/api/v1/events?mine=true")
+    assert res.status_code == 200
+    assert [e["id"] for e in res.json()["events"]] == [event.id]
+
+
+
 def test_list_events_unauthorized(client, auth_none):
     res = client.get("/api/v1/events")
     assert res.status_code == 401
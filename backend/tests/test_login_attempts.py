@@ -0,0 +1,201 @@
+import time
+from datetime import datetime
+import pytest
+from app.core.login_attempts import AttemptState, DatabaseAttemptBackend, LoginAttemptTracker, MemoryAttemptBackend
+from app.models.models import LoginAttempt
+from tests.conftest import TestingSessionLocal
+
+
+def make_tracker(backend=None):
+    return LoginAttemptTracker(backend or MemoryAttemptBackend(), max_attempts=3, window_minutes=30, lockout_minutes=30)
+
+
+
+def attempts(db_session, email):
+    db_session.expire_all()
+    row = db_session.query(LoginAttempt).filter(LoginAttempt.email == email).first()
+    return row.attempts_count if row is not None else None
+
+
+
+def test_tracker_locks_after_max_attempts():
+    tracker = make_tracker()
+
+    for _ in range(2):
+        assert tracker.record_failure("a@test.com").locked_until is None
+    assert tracker.record_failure("a@test.com").locked_until is not None
+    assert tracker.locked_until("a@test.com") is not None
+
+
+
+def test_tracker_success_resets():
+    tracker = make_tracker()
+    tracker.record_failure("a@test.com")
+    tracker.record_success("a@test.com")
+
+    assert tracker.backend.get("a@test.com") is None
+
+
+
+def test_tracker_success_without_failure_writes_nothing(db_session):
+    tracker = make_tracker()
+    tracker.record_success("a@test.com")
+
+    assert tracker.persist(db_session) == 0
+
+
+
+def test_tracker_persist_and_restore(db_session):
+    tracker = make_tracker()
+    for _ in range(3):
+        tracker.record_failure("a@test.com")
+    tracker.record_failure("b@test.com")
+
+    assert tracker.persist(db_session) == 2
+    row = db_session.query(LoginAttempt).filter(LoginAttempt.email == "a@test.com").first()
+    assert row.attempts_count == 3
+    assert row.locked_until is not None
+
+    restarted = make_tracker()
+    assert restarted.restore(db_session) == 2
+    assert restarted.locked_until("a@test.com") is not None
+    assert restarted.locked_until("b@test.com") is None
+
+
+
+def test_tracker_persist_deletes_reset_rows(db_session):
+    tracker = make_tracker()
+    tracker.record_failure("a@test.com")
+    tracker.persist(db_session)
+
+    tracker.record_success("a@test.com")
+    tracker.persist(db_session)
+
+    assert db_session.query(LoginAttempt).count() == 0
+
+
+
+def test_tracker_persist_prunes_expired_states(db_session):
+    tracker = make_tracker()
+    tracker.record_failure("old@test.com")
+    tracker.record_failure("new@test.com")
+    assert tracker.persist(db_session) == 2
+
+    # Fenêtre passée pour old, sans verrouillage : oublié et sa ligne supprimée
+    tracker.backend.restore("old@test.com", AttemptState([0.0], None))
+    db_session.query(LoginAttempt).filter(LoginAttempt.email == "old@test.com").update({"last_attempt": datetime(2000, 1, 1)})
+    db_session.commit()
+    assert tracker.persist(db_session) == 0
+    assert tracker.backend.get("old@test.com") is None
+    assert tracker.backend.get("new@test.com") is not None
+    assert [row.email for row in db_session.query(LoginAttempt).all()] == ["new@test.com"]
+
+
+
+def test_memory_backend_is_bounded():
+    backend = MemoryAttemptBackend(max_entries=10)
+    for _ in range(3):
+        backend.record_failure("locked@test.com", 1.0, 1800, 3, 1800)
+
+    # Emails essayés en masse : la carte ne dépasse pas sa taille
+    for i in range(50):
+        backend.record_failure(f"spray{i}@test.com", 2.0 + i, 1800, 3, 1800)
+        assert len(backend._states) <= 10
+
+    assert backend.get("locked@test.com").is_locked(60.0)
+    assert backend.get("spray49@test.com") is not None
+    assert backend.get("spray0@test.com") is None
+    # Les échecs des emails oubliés sont tout de même écrits au prochain persist
+    assert backend.drain_dirty()["spray0@test.com"].failures == [2.0]
+
+
+
+def test_tracker_restore_deletes_stale_rows(db_session):
+    db_session.add(LoginAttempt(email="old@test.com", attempts_count=2, last_attempt=datetime(2000, 1, 1), locked_until=None))
+    db_session.commit()
+
+    assert make_tracker().restore(db_session) == 0
+    assert db_session.query(LoginAttempt).count() == 0
+
+
+
+def test_tracker_persist_adds_failures_of_each_worker(db_session):
+    workers = [make_tracker(), make_tracker()]
+    workers[0].record_failure("a@test.com")
+    workers[1].record_failure("a@test.com")
+    workers[1].record_failure("a@test.com")
+
+    # Chaque worker ajoute ses échecs au compteur au lieu de l'écraser
+    for tracker in workers:
+        assert tracker.persist(db_session) == 1
+    assert attempts(db_session, "a@test.com") == 3
+    db_session.expire_all()
+    assert db_session.query(LoginAttempt).one().locked_until is not None
+
+
+
+def test_tracker_reset_keeps_later_failures_of_other_workers(db_session):
+    first, second = make_tracker(), make_tracker()
+    first.record_failure("a@test.com")
+    first.record_success("a@test.com")
+
+    time.sleep(0.01)
+    second.record_failure("a@test.com")
+    second.persist(db_session)
+
+    # Le succès de first précède l'échec écrit par second : la ligne reste
+    first.persist(db_session)
+    assert attempts(db_session, "a@test.com") == 1
+
+
+
+def test_tracker_persist_failure_requeues_changes(db_session, monkeypatch):
+    tracker = make_tracker()
+    tracker.record_failure("a@test.com")
+    tracker.record_failure("b@test.com")
+
+    def broken_commit():
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(db_session, "commit", broken_commit)
+    with pytest.raises(RuntimeError):
+        tracker.persist(db_session)
+    monkeypatch.undo()
+
+    # Rien n'est perdu : les échecs reviennent avec ceux enregistrés entre-temps
+    tracker.record_failure("a@test.com")
+    assert tracker.persist(db_session) == 2
+    assert attempts(db_session, "a@test.com") == 2
+    assert attempts(db_session, "b@test.com") == 1
+
+
+
+def test_database_backend_is_shared(db_session):
+    workers = [make_tracker(DatabaseAttemptBackend(TestingSessionLocal)) for _ in range(2)]
+
+    assert workers[0].record_failure("a@test.com").locked_until is None
+    assert len(workers[1].record_failure("a@test.com").failures) == 2
+    # Le troisième échec, sur n'importe quel worker, verrouille l'email pour tous
+    assert workers[0].record_failure("a@test.com").locked_until is not None
+    assert workers[1].locked_until("a@test.com") is not None
+    assert attempts(db_session, "a@test.com") == 3
+
+    workers[1].record_success("a@test.com")
+    assert workers[0].locked_until("a@test.com") is None
+    assert attempts(db_session, "a@test.com") is None
+
+
+
+def test_database_backend_restarts_count_after_window(db_session):
+    tracker = make_tracker(DatabaseAttemptBackend(TestingSessionLocal))
+    db_session.add(LoginAttempt(email="a@test.com", attempts_count=2, last_attempt=datetime(2000, 1, 1), locked_until=None))
+    db_session.commit()
+
+    assert len(tracker.record_failure("a@test.com").failures) == 1
+    assert tracker.locked_until("a@test.com") is None
+
+    # Rien à écrire, les lignes expirées sont supprimées par persist
+    db_session.query(LoginAttempt).update({"last_attempt": datetime(2000, 1, 1)})
+    db_session.commit()
+    assert tracker.persist(db_session) == 0
+    assert attempts(db_session, "a@test.com") is None
@@ -3,13 +3,53 @@ from app.schemas.match import MatchStatus
 
 
 def test_list_matches_ok(client, auth_user, event):
-    response = client.get("/api/v1/matches")
+    response = client.get("/api/v1/matches?all=true")
     assert response.status_code == 200
     assert response.json()["total"] == 1
     assert response.json()["matches"][0]["status"] == "A_VENIR"
 
 
 
+def test_list_matches_constant_queries(client, auth_user, event, teams, db_session, assert_max_queries):
+    from app.models.models import Event, Match, Pool
+
+    pool = Pool(name="Poule A")
+    for team in teams:
+        team.pool = pool
+    db_session.commit()
+    count_one = assert_max_queries(client.get("/api/v1/matches"), 1)
+
+    for i in range(30):
+        db_session.add(Match(
+            court_number=1 + i % 10,
+            team1_id=teams[i % 6].id,
+            team2_id=teams[(i + 1) % 6].id,
+            event=Event(event_date=event.event_date, event_time=event.event_time),
+        ))
+    db_session.commit()
+    response = client.get("/api/v1/matches?all=true")
+
+    assert response.json()["total"] == 31
+    assert response.json()["matches"][0]["team1"]["pool"]["name"] == "Poule A"
+    assert assert_max_queries(response, 1) == count_one
+    assert assert_max_queries(client.get("/api/v1/matches?upcoming=true&status=A_VENIR"), 1) == count_one
+
+
+
+def test_list_matches_my_matches(client, auth_user, event, teams):
+    from app.main import app
+    from app.api.deps import get_current_user
+    from app.core.cache import Principal
+
+    app.dependency_overrides[get_current_user] = lambda: Principal.from_user(teams[1].player2.user)
+    response = client.get("/api/v1/matches?my_matches=true&all=true")
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+    assert response.json()["matches"][0]["team2"]["player2"]["id"] == teams[1].player2_id
+
+
+
 def test_list_matches_unauthorized(client, auth_none):
     response = client.get("/api/v1/matches")
     assert response.status_code == 401
@@ -0,0 +1,163 @@
+import logging
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from app.core.migrations import check_schema, current_revision, head_revision, upgrade
+from app.models.models import Base
+
+
+def test_upgrade_matches_models(tmp_path):
+    url = f"sqlite:///{tmp_path / 'new.db'}"
+
+    previous = upgrade(url)
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"compare_type": True})
+        assert compare_metadata(context, Base.metadata) == []
+        assert current_revision(connection) == head_revision()
+    assert previous is None
+    engine.dispose()
+
+
+
+def test_upgrade_stamps_legacy_database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO pools (name) VALUES ('Poule A')"))
+
+    upgrade(url)
+
+    with engine.connect() as connection:
+        assert current_revision(connection) == head_revision()
+        assert connection.execute(text("SELECT name FROM pools")).scalar() == "Poule A"
+    engine.dispose()
+
+
+
+def test_upgrade_adds_columns_missing_from_legacy_database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    upgrade(url, "0001")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+
+    upgrade(url)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("users")}
+    assert {"token_version", "last_login_at"} <= columns
+    engine.dispose()
+
+
+
+def test_upgrade_rejects_unknown_legacy_schema(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY)"))
+
+    with pytest.raises(RuntimeError, match="users.email"):
+        upgrade(url)
+    engine.dispose()
+
+
+
+def test_check_schema_requires_migrate(tmp_path):
+    url = f"sqlite:///{tmp_path / 'empty.db'}"
+    engine = create_engine(url)
+
+    with pytest.raises(RuntimeError, match="python manage.py migrate"):
+        check_schema(engine)
+
+    upgrade(url)
+    assert check_schema(engine) is True
+    assert set(inspect(engine).get_table_names()) >= {"users", "matches", "alembic_version"}
+    engine.dispose()
+
+
+
+def test_check_schema_warns_on_older_revision(tmp_path, caplog):
+    url = f"sqlite:///{tmp_path / 'old.db'}"
+    upgrade(url, "0001")
+    engine = create_engine(url)
+
+    with caplog.at_level(logging.WARNING, logger="uvicorn.error"):
+        assert check_schema(engine) is False
+    assert "Database at revision 0001" in caplog.text
+    engine.dispose()
+
+
+
+def test_company_standings_filled_from_finished_matches(tmp_path):
+    url = f"sqlite:///{tmp_path / 'standings.db'}"
+    upgrade(url, "0002")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        for i in range(4):
+            connection.execute(text(
+                f"INSERT INTO users (id, email, password_hash, role, is_active) VALUES ({i + 1}, 'u{i}@test.com', 'x', 'JOUEUR', 1)"
+            ))
+            connection.execute(text(
+                f"INSERT INTO players (id, first_name, last_name, company, license_number, user_id) "
+                f"VALUES ({i + 1}, 'P{i}', 'Test', 'ACME', 'L{100000 + i}', {i + 1})"
+            ))
+        connection.execute(text("INSERT INTO teams (id, company, player1_id, player2_id) VALUES (1, 'A', 1, 2), (2, 'B', 3, 4)"))
+        connection.execute(text("INSERT INTO events (id, event_date, event_time) VALUES (1, '2026-01-01', '18:00:00')"))
+        connection.execute(text(
+            "INSERT INTO matches (id, court_number, status, score_team1, score_team2, event_id, team1_id, team2_id) "
+            "VALUES (1, 1, 'TERMINE', 2, 1, 1, 1, 2), (2, 2, 'TERMINE', NULL, 1, 1, 2, 1), (3, 3, 'A_VENIR', NULL, NULL, 1, 1, 2)"
+        ))
+
+    upgrade(url)
+
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT company, matches_played, wins, losses, points, sets_won, sets_lost, first_seen "
+            "FROM company_standings ORDER BY company"
+        )).all()
+    assert [tuple(row) for row in rows] == [("A", 2, 2, 0, 6, 3, 1, 2), ("B", 2, 0, 2, 0, 1, 3, 3)]
+    engine.dispose()
+
+
+
+def test_match_participants_filled_from_matches(tmp_path):
+    from sqlalchemy.orm import Session
+    from app.core.participants import rebuild_participants
+
+    url = f"sqlite:///{tmp_path / 'participants.db'}"
+    upgrade(url, "0004")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        for i in range(5):
+            connection.execute(text(
+                f"INSERT INTO users (id, email, password_hash, role, is_active) VALUES ({i + 1}, 'u{i}@test.com', 'x', 'JOUEUR', 1)"
+            ))
+            connection.execute(text(
+                f"INSERT INTO players (id, first_name, last_name, company, license_number, user_id) "
+                f"VALUES ({i + 1}, 'P{i}', 'Test', 'ACME', 'L{100000 + i}', {i + 1})"
+            ))
+        # Le joueur 1 est dans les équipes 1 et 3
+        connection.execute(text("INSERT INTO teams (id, company, player1_id, player2_id) VALUES (1, 'A', 1, 2), (2, 'B', 3, 4), (3, 'C', 5, 1)"))
+        connection.execute(text("INSERT INTO events (id, event_date, event_time) VALUES (1, '2026-01-01', '18:00:00')"))
+        connection.execute(text(
+            "INSERT INTO matches (id, court_number, status, event_id, team1_id, team2_id) "
+            "VALUES (1, 1, 'A_VENIR', 1, 1, 2), (2, 2, 'TERMINE', 1, 1, 3)"
+        ))
+
+    upgrade(url)
+
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT match_id, player_id, team_id, side FROM match_participants ORDER BY match_id, player_id"
+        )).all()
+    assert [tuple(row) for row in rows] == [
+        (1, 1, 1, 1), (1, 2, 1, 1), (1, 3, 2, 2), (1, 4, 2, 2),
+        (2, 1, 1, 1), (2, 2, 1, 1), (2, 5, 3, 2),
+    ]
+    # Mêmes lignes que la reconstruction depuis les modèles
+    with Session(engine) as db:
+        assert rebuild_participants(db, apply=False) == []
+    engine.dispose()
@@ -0,0 +1,106 @@
+from datetime import date, time
+from app.core.participants import rebuild_participants
+from app.models.models import Event, Match, Team
+
+
+def walk(client, url, key, limit):
+    """Parcourt toutes les pages d'une liste, retourne les ids et le nombre de pages"""
+    ids, pages, after = [], 0, None
+    while True:
+        separator = "&" if "?" in url else "?"
+        response = client.get(f"{url}{separator}limit={limit}" + (f"&after={after}" if after is not None else ""))
+        assert response.status_code == 200
+        data = response.json()
+        ids += [item["id"] for item in data[key]]
+        pages += 1
+        after = data["next_after"]
+        if after is None:
+            return ids, pages
+
+
+
+def test_pages_cover_the_list_once(client, auth_user, players, teams):
+    ids, pages = walk(client, "/api/v1/players", "players", 5)
+    # Les 12 joueurs et celui de l'utilisateur connecté, dans l'ordre des ids
+    assert ids == sorted(ids)
+    assert len(ids) == len(set(ids)) == 13
+    assert pages == 3
+
+    ids, pages = walk(client, "/api/v1/teams", "teams", 2)
+    assert ids == [team.id for team in teams]
+    assert pages == 3
+
+
+
+def test_page_is_one_query_and_total_one_more(client, auth_user, event, teams, db_session, assert_max_queries):
+    for i in range(10):
+        db_session.add(Match(
+            court_number=1 + i % 10, team1_id=teams[i % 6].id, team2_id=teams[(i + 1) % 6].id, event=event,
+        ))
+    db_session.commit()
+
+    response = client.get("/api/v1/matches?limit=4")
+    assert assert_max_queries(response, 1) == 1
+    assert len(response.json()["matches"]) == 4
+    assert response.json()["total"] is None
+
+    response = client.get(f"/api/v1/matches?limit=4&after={response.json()['next_after']}&with_total=true")
+    assert assert_max_queries(response, 2) == 2
+    assert response.json()["total"] == 11
+    assert len(response.json()["matches"]) == 4
+
+
+
+def test_new_rows_do_not_shift_pages(client, auth_user, teams, db_session):
+    first = client.get("/api/v1/teams?limit=3").json()
+
+    # Insertion pendant la lecture : la page suivante reprend après le dernier id reçu
+    db_session.add(Team(company="Nouvelle", player1_id=teams[0].player1_id, player2_id=teams[1].player1_id))
+    db_session.commit()
+    second = client.get(f"/api/v1/teams?limit=3&after={first['next_after']}").json()
+
+    assert [t["company"] for t in first["teams"]] == ["Team 0", "Team 1", "Team 2"]
+    assert [t["company"] for t in second["teams"]] == ["Team 3", "Team 4", "Team 5"]
+    assert second["next_after"] is not None
+
+
+
+def test_events_mine_paginated(client, auth_user, teams, db_session):
+    from app.main import app
+    from app.api.deps import get_current_user
+    from app.core.cache import Principal
+
+    # Deux matchs du joueur dans le même évènement : l'évènement n'est compté qu'une fois
+    for i in range(3):
+        event = Event(event_date=date.today(), event_time=time(18, i))
+        event.matches = [
+            Match(court_number=1, team1_id=teams[0].id, team2_id=teams[1].id),
+            Match(court_number=2, team1_id=teams[2].id, team2_id=teams[0].id),
+        ]
+        db_session.add(event)
+    db_session.commit()
+    rebuild_participants(db_session)
+
+    app.dependency_overrides[get_current_user] = lambda: Principal.from_user(teams[0].player1.user)
+    response = client.get("/api/v1/events?mine=true&limit=2&with_total=true")
+    assert response.json()["total"] == 3
+    assert len(response.json()["events"]) == 2
+
+    ids, pages = walk(client, "/api/v1/events?mine=true", "events", 2)
+    assert len(ids) == len(set(ids)) == 3
+    assert pages == 2
+
+
+
+def test_unpaginated_shape(client, auth_user, teams, assert_max_queries):
+    response = client.get("/api/v1/teams?all=true&limit=2")
+    assert assert_max_queries(response, 1) == 1
+    assert response.json()["total"] == 6
+    assert len(response.json()["teams"]) == 6
+    assert response.json()["next_after"] is None
+
+
+
+def test_limit_bounds(client, auth_user):
+    assert client.get("/api/v1/players?limit=0").status_code == 422
+    assert client.get("/api/v1/players?limit=201").status_code == 422
@@ -0,0 +1,113 @@
+from datetime import date
+from sqlalchemy import select
+from app.core.cache import Principal
+from app.core.participants import rebuild_participants
+from app.models.models import MatchParticipant
+
+
+def create_match(client, team1, team2, court=1):
+    response = client.post("/api/v1/matches", json={
+        "court_number": court,
+        "status": "A_VENIR",
+        "team1_id": team1.id,
+        "team2_id": team2.id,
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+
+def participants(db_session, match_id):
+    db_session.expire_all()
+    rows = db_session.execute(
+        select(MatchParticipant.player_id, MatchParticipant.team_id, MatchParticipant.side)
+        .where(MatchParticipant.match_id == match_id)
+        .order_by(MatchParticipant.side, MatchParticipant.player_id)
+    )
+    return [tuple(row) for row in rows]
+
+
+
+def test_match_writes_maintain_participants(client, auth_admin, db_session, teams):
+    match_id = create_match(client, teams[0], teams[1])
+    assert participants(db_session, match_id) == [
+        (teams[0].player1_id, teams[0].id, 1), (teams[0].player2_id, teams[0].id, 1),
+        (teams[1].player1_id, teams[1].id, 2), (teams[1].player2_id, teams[1].id, 2),
+    ]
+
+    response = client.put(f"/api/v1/matches/{match_id}", json={
+        "court_number": 2, "status": "A_VENIR", "team1_id": teams[2].id, "team2_id": teams[0].id,
+    })
+    assert response.status_code == 200
+    assert participants(db_session, match_id) == [
+        (teams[2].player1_id, teams[2].id, 1), (teams[2].player2_id, teams[2].id, 1),
+        (teams[0].player1_id, teams[0].id, 2), (teams[0].player2_id, teams[0].id, 2),
+    ]
+
+    assert client.delete(f"/api/v1/matches/{match_id}").status_code == 204
+    assert participants(db_session, match_id) == []
+    assert rebuild_participants(db_session, apply=False) == []
+
+
+
+def test_event_writes_maintain_participants(client, auth_admin, db_session, teams):
+    response = client.post("/api/v1/events", json={
+        "event_date": date.today().isoformat(),
+        "event_time": "18:30",
+        "matches": [
+            {"court_number": 1, "team1_id": teams[0].id, "team2_id": teams[1].id, "status": "A_VENIR"},
+            {"court_number": 2, "team1_id": teams[2].id, "team2_id": teams[3].id, "status": "A_VENIR"},
+        ],
+    })
+    assert response.status_code == 201
+    event_id = response.json()["id"]
+    assert rebuild_participants(db_session, apply=False) == []
+
+    response = client.put(f"/api/v1/events/{event_id}", json={
+        "event_date": date.today().isoformat(),
+        "event_time": "18:30",
+        "matches": [{"court_number": 1, "team1_id": teams[4].id, "team2_id": teams[5].id, "status": "A_VENIR"}],
+    })
+    assert response.status_code == 200
+    db_session.expire_all()
+    assert {row.team_id for row in db_session.scalars(select(MatchParticipant))} == {teams[4].id, teams[5].id}
+    assert rebuild_participants(db_session, apply=False) == []
+
+    assert client.delete(f"/api/v1/events/{event_id}").status_code == 204
+    assert db_session.scalars(select(MatchParticipant)).all() == []
+
+
+
+def test_my_matches_read_participants(client, auth_admin, db_session, teams, assert_max_queries):
+    from app.main import app
+    from app.api.deps import get_current_user
+
+    mine = [create_match(client, teams[0], teams[1]), create_match(client, teams[2], teams[0], court=2)]
+    create_match(client, teams[3], teams[4], court=3)
+
+    app.dependency_overrides[get_current_user] = lambda: Principal.from_user(teams[0].player2.user)
+    response = client.get("/api/v1/matches?my_matches=true&with_total=true")
+    assert response.status_code == 200
+    assert [match["id"] for match in response.json()["matches"]] == mine
+    assert response.json()["total"] == 2
+
+    response = client.get("/api/v1/events?mine=true&view=compact")
+    assert response.status_code == 200
+    assert_max_queries(response, 1)
+    assert len(response.json()["events"]) == 2
+
+
+
+def test_rebuild_participants_repairs_drift(client, auth_admin, db_session, teams):
+    match_id = create_match(client, teams[0], teams[1])
+    other = create_match(client, teams[2], teams[3], court=2)
+
+    # Écart simulé : une ligne perdue, une ligne en trop
+    db_session.execute(MatchParticipant.__table__.delete().where(MatchParticipant.match_id == match_id))
+    db_session.add(MatchParticipant(match_id=other, player_id=teams[5].player1_id, team_id=teams[5].id, side=2))
+    db_session.commit()
+
+    assert rebuild_participants(db_session) == [match_id, other]
+    assert rebuild_participants(db_session, apply=False) == []
+    assert len(participants(db_session, match_id)) == 4
+    assert len(participants(db_session, other)) == 4
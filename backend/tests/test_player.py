@@ -240,6 +240,42 @@ def test_update_player_duplicate_email_and_license(client, auth_admin):
 
 
 
+def test_update_player_failed_commit_keeps_tokens(client, db_session, test_user, test_admin):
+    from app.main import app
+    from app.api.deps import get_current_admin
+    from app.core.cache import Principal
+    from app.models.models import Player
+
+    login = client.post("/api/v1/auth/login", json={"email": "test@example.com", "password": "ValidP@ssw0rd123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    principal = Principal.from_user(test_admin)
+    app.dependency_overrides[get_current_admin] = lambda: principal
+    payload = {
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "company": "ACME",
+        "license_number": "L654321",
+        "email": "jane@test.com",
+        "password": "ValidP@ssw0rd123",
+        "role": "JOUEUR"
+    }
+    assert client.post("/api/v1/players", json=payload).status_code == 201
+    player = db_session.query(Player).filter(Player.user_id == test_user.id).first()
+
+    # Email déjà pris : le commit échoue, la révocation n'est pas appliquée
+    response = client.put(f"/api/v1/players/{player.id}", json={**payload, "license_number": "L654322"})
+    assert response.status_code == 400
+    assert client.get("/api/v1/players", headers=headers).status_code == 200
+
+    # Modification validée : les tokens d'avant sont révoqués
+    response = client.put(f"/api/v1/players/{player.id}", json={**payload, "license_number": "L654322", "email": "john@test.com"})
+    assert response.status_code == 200
+    assert client.get("/api/v1/players", headers=headers).status_code == 401
+    app.dependency_overrides.pop(get_current_admin, None)
+
+
+
 def test_update_player_not_found(client, auth_admin):
     payload = {
         "first_name": "Jane",
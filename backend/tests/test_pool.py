@@ -13,6 +13,41 @@ def test_create_pool_not_authenticated(client, teams, auth_none):
 
 
 
+def test_list_pools_constant_queries(client, auth_user, pool_in_db, db_session, assert_max_queries):
+    from app.models.models import Pool
+
+    response = client.get("/api/v1/pools")
+    assert response.status_code == 200
+    assert response.json()["pools"][0]["teams_count"] == 6
+    count_one = assert_max_queries(response, 2)
+
+    db_session.add_all([Pool(name=f"Vide {i}") for i in range(5)])
+    db_session.commit()
+    response = client.get("/api/v1/pools")
+
+    assert response.json()["total"] == 6
+    assert [pool["teams_count"] for pool in response.json()["pools"]] == [6, 0, 0, 0, 0, 0]
+    assert assert_max_queries(response, 2) == count_one
+
+
+
+def test_get_pool_ok(client, auth_user, pool_in_db, assert_max_queries):
+    response = client.get(f"/api/v1/pools/{pool_in_db.id}")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Pool DB"
+    assert response.json()["teams_count"] == 6
+    assert response.json()["teams"] == [f"Team {i}" for i in range(6)]
+    assert_max_queries(response, 2)
+
+
+
+def test_get_pool_not_found(client, auth_user):
+    response = client.get("/api/v1/pools/99999")
+    assert response.status_code == 404
+
+
+
 def test_create_pool_ok(client, auth_admin, teams):
     payload = {
         "name": "Pool A",
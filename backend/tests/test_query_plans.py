@@ -0,0 +1,64 @@
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy import and_, select
+
+from app.core.standings import first_appearance
+from app.models.loaders import MATCH_OPTIONS
+from app.models.models import Event, Match, Player, Team, User
+from app.models.statements import EVENT_IDS_BY_USER_ID, MATCH_IDS_BY_USER_ID, MY_RESULTS, PRINCIPAL_BY_USER_ID, RANKINGS, TEAMS
+
+
+def query_plan(db_session, statement) -> list:
+    """Détail de chaque étape du plan SQLite (EXPLAIN QUERY PLAN) d'une requête"""
+    bind = db_session.get_bind()
+    sql = statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    return [row[3] for row in db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+
+def full_scans(plan: list) -> list:
+    """Étapes qui parcourent une table entière (un SCAN par index ou d'une sous-requête reste permis)"""
+    return [
+        step for step in plan
+        if step.startswith("SCAN ") and "USING" not in step and "subquery" not in step and "CONSTANT ROW" not in step
+    ]
+
+
+# Requêtes chaudes : aucune ne doit lire une table entière
+HOT_QUERIES = {
+    "matches of events": select(Match).where(Match.event_id.in_([1, 2])),
+    "matches by status": select(Match).options(*MATCH_OPTIONS).where(Match.status == "TERMINE", Match.id > 10).order_by(Match.id).limit(51),
+    "upcoming matches": select(Match).join(Event).where(Event.event_date.between(date.today(), date.today() + timedelta(days=30))),
+    "event by date": select(Event).where(and_(Event.event_date == date.today(), Event.event_time == time(18, 0))),
+    "teams by company": TEAMS.where(Team.company == "ACME"),
+    "players by company": select(User).join(Player, Player.user_id == User.id).where(Player.company == "ACME"),
+    "my matches": select(Match).where(Match.id.in_(MATCH_IDS_BY_USER_ID)).order_by(Match.id).limit(51).params(user_id=1),
+    "my events": select(Event).where(Event.id.in_(EVENT_IDS_BY_USER_ID)).order_by(Event.id).limit(51).params(user_id=1),
+    "my results": MY_RESULTS.params(user_id=1),
+    "principal": PRINCIPAL_BY_USER_ID.params(user_id=1),
+    "rankings": RANKINGS,
+    "first appearance": select(first_appearance("ACME")),
+}
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_indexes(db_session, name):
+    plan = query_plan(db_session, HOT_QUERIES[name])
+    assert full_scans(plan) == [], plan
+
+
+
+@pytest.mark.parametrize("name", ["matches by status", "rankings"])
+def test_ordered_pages_without_sort(db_session, name):
+    # L'index donne l'ordre : pas de tri de toutes les lignes pour une page
+    plan = query_plan(db_session, HOT_QUERIES[name])
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+
+@pytest.mark.parametrize("name", ["my matches", "my events", "my results"])
+def test_player_queries_read_participants(db_session, name):
+    # Les matchs d'un joueur : un intervalle de l'index (player_id, match_id), sans OR sur les équipes
+    plan = query_plan(db_session, HOT_QUERIES[name])
+    assert any("ix_match_participants_player_match (player_id=?)" in step for step in plan), plan
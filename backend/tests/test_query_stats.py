@@ -0,0 +1,72 @@
+import logging
+from sqlalchemy import select
+from app.core.query_stats import RequestQueries, query_metrics, track_queries
+
+
+def test_track_queries_counts_statements(db_session, players):
+    from app.models.models import Player
+
+    ids = [player.id for player in players[:3]]
+    with track_queries() as queries:
+        for player_id in ids:
+            db_session.scalars(select(Player).where(Player.id == player_id)).one()
+
+    assert queries.count == 3
+    assert queries.duration > 0
+    assert queries.repeated(threshold=3)[0][1] == 3
+
+
+
+def test_track_queries_outside_block(db_session, players):
+    from app.models.models import Player
+
+    with track_queries() as queries:
+        pass
+    db_session.scalars(select(Player)).all()
+
+    assert queries.count == 0
+
+
+
+def test_response_headers(client, auth_user, event):
+    response = client.get("/api/v1/matches")
+
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Queries"]) > 0
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+
+def test_list_matches_max_queries(client, auth_user, event, assert_max_queries):
+    response = client.get("/api/v1/matches")
+
+    assert response.status_code == 200
+    assert_max_queries(response, 1)
+
+
+
+def test_n_plus_one_warning(caplog):
+    queries = RequestQueries()
+    queries.record("SELECT * FROM teams", 0.001)
+    for _ in range(6):
+        queries.record("SELECT * FROM players WHERE players.id = ?", 0.001)
+
+    with caplog.at_level(logging.WARNING, logger="uvicorn.error"):
+        query_metrics.record("GET /api/v1/teams", queries)
+
+    assert "Possible N+1 on GET /api/v1/teams: 6 x SELECT * FROM players" in caplog.text
+    assert "FROM teams" not in caplog.text
+    assert query_metrics.stats()["n_plus_one"] == 1
+    query_metrics.clear()
+
+
+
+def test_metrics_per_route(client, auth_admin, event):
+    client.get("/api/v1/matches")
+    client.get(f"/api/v1/matches/{event.matches[0].id}")
+
+    response = client.get("/api/v1/admin/metrics")
+
+    routes = response.json()["queries"]["routes"]
+    assert routes["GET /api/v1/matches"]["requests"] == 1
+    assert routes["GET /api/v1/matches/{match_id}"]["max_queries"] > 0
@@ -1,6 +1,8 @@
 import pytest
 from datetime import date, time
 
+from app.core.participants import rebuild_participants
+from app.core.standings import rebuild_standings
 from app.models.models import Match, Event, Player, Team, User
 from app.schemas.match import MatchStatus
 
@@ -90,6 +92,8 @@ def test_my_results_ok(client, auth_user, db_session, test_user):
     )
     db_session.add(match)
     db_session.commit()
+    # Match inséré sans passer par l'API : participants recopiés
+    rebuild_participants(db_session)
 
     response = client.get("/api/v1/results/my-results")
     assert response.status_code == 200
@@ -120,6 +124,52 @@ def test_my_results_player_not_found(client, auth_user, db_session):
 
 
 
+def test_my_results_single_query(client, auth_user, db_session, test_user, teams, assert_max_queries):
+    player = db_session.query(Player).filter(Player.user_id == test_user.id).first()
+    my_team = Team(company="UserTeam", player1_id=teams[0].player1_id, player2_id=player.id)
+    db_session.add(my_team)
+    db_session.commit()
+    event = create_event(db_session)
+
+    # Le joueur côté équipe 1 puis côté équipe 2
+    for i, (team1, team2, score1, score2) in enumerate([
+        (my_team, teams[1], 2, 0),
+        (teams[2], my_team, 2, 1),
+        (my_team, teams[3], 1, 1),
+        (teams[4], my_team, 0, 2),
+    ]):
+        db_session.add(Match(
+            court_number=i + 1, team1_id=team1.id, team2_id=team2.id, event_id=event.id,
+            status="TERMINE", score_team1=score1, score_team2=score2
+        ))
+    # Match à venir : pas dans les résultats
+    db_session.add(Match(court_number=1, team1_id=my_team.id, team2_id=teams[1].id, event_id=event.id, status="A_VENIR"))
+    db_session.commit()
+    rebuild_participants(db_session)
+
+    response = client.get("/api/v1/results/my-results")
+    assert response.status_code == 200
+    assert_max_queries(response, 1)
+
+    data = response.json()
+    assert [r["result"] for r in data["results"]] == ["VICTOIRE", "DEFAITE", "NUL", "VICTOIRE"]
+    assert [r["score"] for r in data["results"]] == ["2-0", "1-2", "1-1", "2-0"]
+    assert data["results"][1]["opponents"] == {"company": "Team 2", "players": ["P4 Test", "P5 Test"]}
+    assert data["statistics"] == {"total_matches": 4, "wins": 2, "losses": 1, "win_rate": 50.0}
+
+
+
+def test_my_results_no_match(client, auth_user, assert_max_queries):
+    response = client.get("/api/v1/results/my-results")
+    assert response.status_code == 200
+    assert_max_queries(response, 2)
+    assert response.json() == {
+        "results": [],
+        "statistics": {"total_matches": 0, "wins": 0, "losses": 0, "win_rate": 0},
+    }
+
+
+
 def test_rankings_ok(client, auth_user, db_session, teams):
     event = create_event(db_session)
 
@@ -143,6 +193,8 @@ def test_rankings_ok(client, auth_user, db_session, teams):
     )
     db_session.add_all([m1, m2])
     db_session.commit()
+    # Matchs insérés sans passer par l'API : classement recalculé
+    rebuild_standings(db_session)
 
     response = client.get("/api/v1/results/rankings")
     assert response.status_code == 200
@@ -154,6 +206,39 @@ def test_rankings_ok(client, auth_user, db_session, teams):
 
 
 
+def test_rankings_ties_and_missing_scores(client, auth_user, db_session, teams, assert_max_queries):
+    event = create_event(db_session)
+    for i, (team1, team2, score1, score2) in enumerate([
+        (teams[2], teams[3], 1, 1),
+        (teams[4], teams[5], 2, 0),
+        (teams[0], teams[1], None, None),
+        (teams[1], teams[0], 2, 1),
+    ]):
+        db_session.add(Match(
+            court_number=i + 1, team1_id=team1.id, team2_id=team2.id, event_id=event.id,
+            status="TERMINE", score_team1=score1, score_team2=score2
+        ))
+    db_session.add(Match(court_number=5, team1_id=teams[5].id, team2_id=teams[4].id, event_id=event.id, status="A_VENIR"))
+    db_session.commit()
+    rebuild_standings(db_session)
+
+    response = client.get("/api/v1/results/rankings")
+    assert response.status_code == 200
+    assert_max_queries(response, 1)
+
+    # À égalité de points : ordre de première apparition dans les matchs
+    data = response.json()["rankings"]
+    assert [(r["position"], r["company"], r["points"]) for r in data] == [
+        (1, "Team 4", 3), (2, "Team 1", 3), (3, "Team 2", 0), (4, "Team 3", 0), (5, "Team 5", 0), (6, "Team 0", 0),
+    ]
+    assert data[1] == {
+        "position": 2, "company": "Team 1", "matches_played": 2, "wins": 1, "losses": 0,
+        "points": 3, "sets_won": 2, "sets_lost": 1,
+    }
+    assert data[5]["losses"] == 1 and data[5]["sets_lost"] == 2
+
+
+
 def test_rankings_unauthorized(client, auth_none):
     response = client.get("/api/v1/results/rankings")
     assert response.status_code == 401
@@ -49,4 +49,95 @@ def test_jwt_invalid_token():
     invalid_token = "invalid.token.here"
     decoded = decode_token(invalid_token)
     
-    assert decoded is None
\ No newline at end of file
+    assert decoded is None
+
+def test_password_hashing_async():
+    """Test du hachage dans le pool dédié"""
+    import asyncio
+    from app.core.security import get_password_hash_async, verify_password_async
+
+    async def scenario():
+        hashed = await get_password_hash_async("TestP@ssw0rd123")
+        return (
+            await verify_password_async("TestP@ssw0rd123", hashed),
+            await verify_password_async("WrongPassword", hashed),
+        )
+
+    assert asyncio.run(scenario()) == (True, False)
+
+def test_password_hasher_stats():
+    """Test des métriques du pool de hachage"""
+    from app.core.hashing import PasswordHasher
+
+    hasher = PasswordHasher(max_workers=2)
+    futures = [hasher.submit(sum, [i, i]) for i in range(5)]
+
+    assert [f.result() for f in futures] == [0, 2, 4, 6, 8]
+    stats = hasher.stats()
+    assert stats["completed"] == 5
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+
+def test_needs_rehash_when_cost_changes():
+    """Test de la détection d'un hash obsolète"""
+    from app.core.security import build_password_context, needs_rehash
+
+    weak_hash = build_password_context(schemes=["bcrypt"], bcrypt_rounds=4).hash("TestP@ssw0rd123")
+
+    assert needs_rehash(weak_hash) is True
+    assert needs_rehash(get_password_hash("TestP@ssw0rd123")) is False
+
+def test_argon2_hash_verified_by_mixed_context():
+    """Test de la vérification d'un hash argon2id par un contexte bcrypt + argon2"""
+    from app.core.security import build_password_context
+
+    argon2 = build_password_context(schemes=["argon2id"], argon2_memory_cost=1024, argon2_time_cost=1, argon2_parallelism=1)
+    hashed = argon2.hash("TestP@ssw0rd123")
+    mixed = build_password_context(schemes=["bcrypt", "argon2"])
+
+    assert hashed.startswith("$argon2id$")
+    assert mixed.verify("TestP@ssw0rd123", hashed) is True
+    assert mixed.needs_update(hashed) is True
+
+def test_calibration_suggestion():
+    """Test du choix des paramètres de hachage"""
+    from app.core.calibration import Measure, suggest
+
+    measures = [
+        Measure("bcrypt", {"bcrypt_rounds": 10}, 60.0),
+        Measure("bcrypt", {"bcrypt_rounds": 11}, 120.0),
+        Measure("bcrypt", {"bcrypt_rounds": 12}, 240.0),
+    ]
+
+    assert suggest(measures, 150.0).params == {"bcrypt_rounds": 11}
+    assert suggest(measures, 10.0).params == {"bcrypt_rounds": 10}
+
+@pytest.mark.parametrize("issuer", ["jose", "pyjwt"])
+@pytest.mark.parametrize("verifier", ["jose", "pyjwt"])
+def test_jwt_backends_interoperable(issuer, verifier):
+    """Test que les backends JWT produisent et lisent les mêmes claims"""
+    from datetime import datetime, timedelta, timezone
+    from app.core.security import get_jwt_backend
+
+    claims = {
+        "sub": "123",
+        "role": "JOUEUR",
+        "player_id": 7,
+        "ver": 2,
+        "jti": "abc",
+        "exp": int((datetime.now(timezone.utc) + timedelta(minutes=5)).timestamp()),
+    }
+    token = get_jwt_backend(issuer).encode(claims)
+
+    assert get_jwt_backend(verifier).decode(token) == claims
+
+@pytest.mark.parametrize("name", ["jose", "pyjwt"])
+def test_jwt_backend_rejects_expired_token(name):
+    """Test du refus d'un token expiré par chaque backend"""
+    from app.core.security import TokenError, get_jwt_backend
+
+    backend = get_jwt_backend(name)
+    token = backend.encode({"sub": "123", "exp": 1})
+
+    with pytest.raises(TokenError):
+        backend.decode(token)
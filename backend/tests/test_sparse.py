@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@contextmanager
+def captured_sql():
+    """Texte des requêtes SQL émises pendant le bloc, toutes bases confondues"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture)
+
+
+
+def test_matches_compact_view(client, auth_user, event, teams, assert_max_queries):
+    with captured_sql() as statements:
+        response = client.get("/api/v1/matches?view=compact")
+    assert response.status_code == 200
+    assert_max_queries(response, 1)
+
+    match = response.json()["matches"][0]
+    assert match == {
+        "id": event.matches[0].id,
+        "court_number": 1,
+        "status": "A_VENIR",
+        "event_date": event.event_date.isoformat(),
+        "event_time": "18:30:00",
+        "team1_id": teams[0].id,
+        "team2_id": teams[1].id,
+    }
+    # Ni équipes, ni joueurs, ni poules dans la requête
+    sql = statements[-1].lower()
+    assert "teams" not in sql and "players" not in sql and "pools" not in sql
+
+    full = client.get("/api/v1/matches")
+    assert len(response.content) * 3 < len(full.content)
+
+
+
+def test_matches_fields(client, auth_user, event, teams):
+    response = client.get("/api/v1/matches?fields=court_number,score_team1,court_number")
+    assert response.status_code == 200
+    assert response.json()["matches"] == [{"id": event.matches[0].id, "court_number": 1, "score_team1": None}]
+    assert response.json()["next_after"] is None
+
+    # Filtres et pagination s'appliquent de la même façon
+    response = client.get("/api/v1/matches?fields=team2_id&status=TERMINE&with_total=true")
+    assert response.json() == {"matches": [], "total": 0, "next_after": None}
+
+
+
+def test_unknown_field(client, auth_user):
+    response = client.get("/api/v1/matches?fields=id,team1")
+    assert response.status_code == 400
+    assert "team1" in response.json()["detail"]
+
+
+
+def test_teams_players_events_compact(client, auth_user, pool_in_db, event):
+    teams = client.get("/api/v1/teams?view=compact&limit=2").json()
+    assert teams["teams"][0] == {"id": pool_in_db.teams[0].id, "company": "Team 0", "pool_id": pool_in_db.id}
+    assert teams["next_after"] == pool_in_db.teams[1].id
+
+    players = client.get("/api/v1/players?fields=last_name&all=true").json()
+    assert all(set(player) == {"id", "last_name"} for player in players["players"])
+    assert players["total"] == len(players["players"])
+
+    events = client.get("/api/v1/events?view=compact").json()
+    assert events["events"] == [{"id": event.id, "event_date": event.event_date.isoformat(), "event_time": "18:30:00"}]
+
+
+
+def test_full_response_unchanged(client, auth_user, event):
+    response = client.get("/api/v1/matches?view=full")
+    match = response.json()["matches"][0]
+    assert {"team1", "team2", "event", "score_team1"} <= set(match)
+    assert match["team1"]["player1"]["id"] == event.matches[0].team1.player1_id
+    assert response.json()["total"] is None
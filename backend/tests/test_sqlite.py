@@ -0,0 +1,79 @@
+import logging
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.core.sqlite import SQLITE_PROFILES, configure_sqlite, effective_pragmas, log_sqlite_profile, resolve_pragmas
+
+
+def test_resolve_pragmas_overrides():
+    pragmas = resolve_pragmas("prod", "cache_size=-32000, mmap_size=0")
+
+    assert pragmas["cache_size"] == -32000
+    assert pragmas["mmap_size"] == 0
+    assert pragmas["journal_mode"] == "WAL"
+    assert SQLITE_PROFILES["prod"]["cache_size"] == -64000
+
+
+
+def test_resolve_pragmas_unknown_profile():
+    with pytest.raises(ValueError):
+        resolve_pragmas("fast")
+
+
+
+@pytest.mark.parametrize("override", ["page_size=4096", "cache_size=1;DROP TABLE users", "synchronous="])
+def test_resolve_pragmas_invalid_override(override):
+    with pytest.raises(ValueError):
+        resolve_pragmas("dev", override)
+
+
+
+def test_configure_sqlite_applies_on_connect(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'prod.db'}")
+    configure_sqlite(engine, "prod")
+
+    pragmas = effective_pragmas(engine)
+
+    assert pragmas["journal_mode"] == "wal"
+    assert pragmas["synchronous"] == 1  # NORMAL
+    assert pragmas["foreign_keys"] == 1
+    assert pragmas["busy_timeout"] == 5000
+    assert pragmas["cache_size"] == -64000
+    assert pragmas["temp_store"] == 2  # MEMORY
+    engine.dispose()
+
+
+
+def test_configure_sqlite_read_only(tmp_path):
+    from app.database import to_read_only_url
+
+    url = f"sqlite:///{tmp_path / 'read.db'}"
+    writer = create_engine(url)
+    configure_sqlite(writer, "prod")
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE scores (value INTEGER)"))
+        connection.execute(text("INSERT INTO scores VALUES (1)"))
+
+    reader = create_engine(to_read_only_url(url))
+    pragmas = configure_sqlite(reader, "prod", read_only=True)
+
+    assert "journal_mode" not in pragmas
+    with reader.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM scores")).scalar() == 1
+        assert connection.exec_driver_sql("PRAGMA query_only").scalar() == 1
+        with pytest.raises(OperationalError):
+            connection.execute(text("INSERT INTO scores VALUES (2)"))
+    reader.dispose()
+    writer.dispose()
+
+
+
+def test_log_sqlite_profile(tmp_path, caplog):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dev.db'}")
+    configure_sqlite(engine, "dev")
+
+    with caplog.at_level(logging.INFO, logger="uvicorn.error"):
+        log_sqlite_profile(engine, "dev")
+
+    assert "SQLite profile dev: journal_mode=wal, synchronous=1" in caplog.text
+    engine.dispose()
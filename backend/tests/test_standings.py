@@ -0,0 +1,118 @@
+from datetime import date
+from app.core.standings import contributions, rebuild_standings
+from app.models.models import CompanyStanding, Match
+
+
+def create_match(client, team1, team2, score1=None, score2=None, status="TERMINE", court=1):
+    response = client.post("/api/v1/matches", json={
+        "court_number": court,
+        "status": status,
+        "team1_id": team1.id,
+        "team2_id": team2.id,
+        "score_team1": score1,
+        "score_team2": score2,
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+
+def update_match(client, match_id, team1, team2, score1=None, score2=None, status="TERMINE", court=1):
+    response = client.put(f"/api/v1/matches/{match_id}", json={
+        "court_number": court,
+        "status": status,
+        "team1_id": team1.id,
+        "team2_id": team2.id,
+        "score_team1": score1,
+        "score_team2": score2,
+    })
+    assert response.status_code == 200
+
+
+
+def rankings(client):
+    response = client.get("/api/v1/results/rankings")
+    assert response.status_code == 200
+    return response.json()["rankings"]
+
+
+
+def test_contributions_rules():
+    assert contributions(5, "A_VENIR", 2, 0, "A", "B") == []
+
+    first, second = contributions(5, "TERMINE", 2, None, "A", "B")
+    assert (first.company, first.first_seen, first.counters) == ("A", 10, (1, 1, 0, 3, 2, 0))
+    assert (second.company, second.first_seen, second.counters) == ("B", 11, (1, 0, 1, 0, 0, 2))
+
+
+
+def test_create_match_updates_standings(client, auth_admin, teams):
+    create_match(client, teams[0], teams[1], 2, 1)
+    create_match(client, teams[2], teams[1], 0, 2, court=2)
+    create_match(client, teams[3], teams[4], status="A_VENIR", court=3)
+
+    # Égalité de points : Team 0 apparaît la première (équipe 1 du premier match)
+    assert rankings(client) == [
+        {"position": 1, "company": "Team 0", "matches_played": 1, "wins": 1, "losses": 0,
+         "points": 3, "sets_won": 2, "sets_lost": 1},
+        {"position": 2, "company": "Team 1", "matches_played": 2, "wins": 1, "losses": 1,
+         "points": 3, "sets_won": 3, "sets_lost": 2},
+        {"position": 3, "company": "Team 2", "matches_played": 1, "wins": 0, "losses": 1,
+         "points": 0, "sets_won": 0, "sets_lost": 2},
+    ]
+
+
+
+def test_update_match_moves_standings(client, auth_admin, db_session, teams):
+    first = create_match(client, teams[0], teams[1], 2, 1)
+    second = create_match(client, teams[1], teams[2], 1, 1, court=2)
+    upcoming = create_match(client, teams[3], teams[4], status="A_VENIR", court=3)
+
+    # Nouveau score, équipes échangées, match sorti puis entré dans TERMINE
+    update_match(client, first, teams[1], teams[0], 0, 2)
+    update_match(client, second, teams[1], teams[2], 1, 1, status="ANNULE", court=2)
+    update_match(client, upcoming, teams[3], teams[4], 3, 0, court=3)
+    update_match(client, upcoming, teams[3], teams[4], 3, 0, court=4)
+
+    assert [(r["company"], r["matches_played"], r["points"]) for r in rankings(client)] == [
+        ("Team 0", 1, 3), ("Team 3", 1, 3), ("Team 1", 1, 0), ("Team 4", 1, 0),
+    ]
+    # La table tenue à jour est celle recalculée depuis les matchs
+    assert rebuild_standings(db_session, apply=False) == []
+
+
+
+def test_update_event_removes_finished_matches(client, auth_admin, db_session, teams):
+    match_id = create_match(client, teams[0], teams[1], 2, 0)
+    event_id = db_session.get(Match, match_id).event_id
+
+    response = client.put(f"/api/v1/events/{event_id}", json={
+        "event_date": date.today().isoformat(),
+        "event_time": "18:30",
+        "matches": [{"court_number": 1, "team1_id": teams[0].id, "team2_id": teams[1].id, "status": "A_VENIR"}],
+    })
+    assert response.status_code == 200
+
+    assert rankings(client) == []
+    assert rebuild_standings(db_session, apply=False) == []
+
+
+
+def test_rebuild_standings_repairs_drift(client, auth_admin, db_session, teams):
+    create_match(client, teams[0], teams[1], 2, 1)
+    create_match(client, teams[2], teams[3], 1, 0, court=2)
+    before = rankings(client)
+
+    db_session.query(CompanyStanding).filter(CompanyStanding.company == "Team 0").update({"wins": 7})
+    db_session.query(CompanyStanding).filter(CompanyStanding.company == "Team 3").delete()
+    db_session.add(CompanyStanding(company="Ghost", matches_played=1, first_seen=0))
+    db_session.commit()
+
+    differences = rebuild_standings(db_session)
+    assert [(d.company, d.live is None, d.expected is None) for d in differences] == [
+        ("Ghost", False, True), ("Team 0", False, False), ("Team 3", True, False),
+    ]
+    assert differences[1].live["wins"] == 7 and differences[1].expected["wins"] == 1
+
+    assert rebuild_standings(db_session, apply=False) == []
+    assert rankings(client) == before
@@ -8,17 +8,52 @@ def test_list_teams_ok(client, auth_user, teams):
 
 
 
+def test_list_teams_constant_queries(client, auth_user, pool_in_db, players, db_session, assert_max_queries):
+    from app.models.models import Team
+
+    count_one = assert_max_queries(client.get("/api/v1/teams"), 1)
+
+    for i in range(20):
+        db_session.add(Team(company=f"Extra {i}", player1_id=players[i % 12].id, player2_id=players[(i + 1) % 12].id))
+    db_session.commit()
+    res = client.get("/api/v1/teams?all=true")
+
+    assert res.json()["total"] == 26
+    assert res.json()["teams"][0]["pool"]["name"] == "Pool DB"
+    assert res.json()["teams"][-1]["pool"] is None
+    assert assert_max_queries(res, 1) == count_one
+
+
+
+def test_list_teams_by_pool(client, auth_user, pool_in_db, db_session):
+    from app.models.models import Team
+
+    db_session.add(Team(company="Hors poule", player1_id=pool_in_db.teams[0].player1_id, player2_id=pool_in_db.teams[1].player1_id))
+    db_session.commit()
+
+    res = client.get(f"/api/v1/teams?pool_id={pool_in_db.id}&all=true")
+    assert res.status_code == status.HTTP_200_OK
+    assert res.json()["total"] == len(pool_in_db.teams)
+    assert all(team["pool"]["id"] == pool_in_db.id for team in res.json()["teams"])
+
+    res = client.get(f"/api/v1/teams?pool_id={pool_in_db.id}&company=Team 0")
+    assert [team["company"] for team in res.json()["teams"]] == ["Team 0"]
+
+
+
 def test_list_teams_unauthorized(client, auth_none):
     res = client.get("/api/v1/teams")
     assert res.status_code == status.HTTP_401_UNAUTHORIZED
 
 
 
-def test_get_team_ok(client, auth_user, teams):
+def test_get_team_ok(client, auth_user, teams, assert_max_queries):
     team = teams[0]
     res = client.get(f"/api/v1/teams/{team.id}")
     assert res.status_code == status.HTTP_200_OK
     assert res.json()["id"] == team.id
+    assert res.json()["player1"]["id"] == team.player1_id
+    assert_max_queries(res, 1)
 
 
 def test_get_team_not_found(client, auth_admin):
@@ -21,12 +21,53 @@ api.interceptors.request.use(
   }
 );
 
-// Intercepteur pour gérer les erreurs 401
+// Un seul rafraîchissement à la fois, partagé par les requêtes en échec
+let refreshing: Promise<string> | null = null;
+
+function refreshAccessToken(): Promise<string> {
+  if (!refreshing) {
+    const refreshToken = localStorage.getItem("refresh_token");
+    refreshing = api
+      .post("/auth/refresh", { refresh_token: refreshToken })
+      .then((response) => {
+        localStorage.setItem("token", response.data.access_token);
+        localStorage.setItem("refresh_token", response.data.refresh_token);
+        return response.data.access_token as string;
+      })
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+}
+
+// Intercepteur pour gérer les erreurs 401 : le token d'accès est court,
+// on le renouvelle une fois avec le refresh token avant d'abandonner
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const config = error.config;
+    const canRefresh =
+      error.response?.status === 401 &&
+      config &&
+      !config._retried &&
+      !config.url?.startsWith("/auth/") &&
+      localStorage.getItem("refresh_token");
+
+    if (canRefresh) {
+      config._retried = true;
+      try {
+        const token = await refreshAccessToken();
+        config.headers.Authorization = `Bearer ${token}`;
+        return api(config);
+      } catch {
+        // Le refresh token est invalide : on se déconnecte ci-dessous
+      }
+    }
+
     if (error.response?.status === 401) {
       localStorage.removeItem("token");
+      localStorage.removeItem("refresh_token");
       localStorage.removeItem("user");
     }
     return Promise.reject(error);
@@ -37,7 +78,13 @@ export const authAPI = {
   login: (email: string, password: string) =>
     api.post("/auth/login", { email, password }),
 
-  logout: () => api.post("/auth/logout"),
+  logout: () => {
+    const refreshToken = localStorage.getItem("refresh_token");
+    return api.post(
+      "/auth/logout",
+      refreshToken ? { refresh_token: refreshToken } : undefined,
+    );
+  },
 
   changePassword: (
     currentPassword: string,
@@ -97,7 +97,8 @@ export const eventsService = {
       params: {
         start_date: start_date,
         end_date: end_date,
-        mine: mine
+        mine: mine,
+        all: true
       }
     });
   },
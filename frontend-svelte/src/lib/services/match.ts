@@ -122,7 +122,7 @@ export const matchesService = {
     my_matches?: boolean;
   }) {
     return api.get<{ matches: MatchOutput[]; total: number }>('/matches', {
-      params
+      params: { ...params, all: true }
     });
   },
 
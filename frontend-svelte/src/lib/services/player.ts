@@ -117,7 +117,9 @@ export const playersService = {
    * @return Return all the players.
    */
   getAllPlayers() {
-    return api.get<{ players: PlayerOutput[]; total: number }>("/players");
+    return api.get<{ players: PlayerOutput[]; total: number }>("/players", {
+      params: { all: true }
+    });
   },
 
 
@@ -111,7 +111,8 @@ export const teamsService = {
     return api.get<{ teams: TeamOutput[]; total: number }>('/teams', {
       params: {
         pool_id: poolId,
-        company: company
+        company: company,
+        all: true
       }
     });
   },
@@ -29,7 +29,7 @@ function createAuthStore() {
 
   const { subscribe, set, update } = writable<AuthState>(initialState)
 
-  function setAuth(authToken: string, userData: User) {
+  function setAuth(authToken: string, userData: User, refreshToken?: string) {
     update(() => ({
       user: userData,
       token: authToken,
@@ -41,11 +41,15 @@ function createAuthStore() {
 
     localStorage.setItem('token', authToken)
     localStorage.setItem('user', JSON.stringify(userData))
+    if (refreshToken) {
+      localStorage.setItem('refresh_token', refreshToken)
+    }
   }
 
   function clearAuth() {
     set(initialState)
     localStorage.removeItem('token')
+    localStorage.removeItem('refresh_token')
     localStorage.removeItem('user')
   }
 
@@ -71,9 +75,9 @@ function createAuthStore() {
 
     try {
       const response = await authAPI.login(email, password)
-      const { access_token, user: userData } = response.data
+      const { access_token, refresh_token, user: userData } = response.data
 
-      setAuth(access_token, userData)
+      setAuth(access_token, userData, refresh_token)
       return { success: true }
     } catch (err: any) {
       const errorData = err.response?.data?.detail